@@ -3,6 +3,17 @@ from flask_cors import CORS
 from main.config.config import Config
 from main.extension import db, bcrypt, migrate
 from main.config.routes import register_routes  # Import route registration function
+from main.config.commands import register_commands  # Import CLI command registration function
+from main.common.password_hasher import password_hasher
+from main.common.jwt_utils import token_cache
+from main.common.product_search import product_search
+from main.common.reservation_service import reservation_sweeper
+from main.common.stock_shards import shard_registry, stock_shard_rebalancer
+from main.common.sales_timeseries import sales_series_cache
+from main.common.dashboard_summary import dashboard_summary
+from main.common.notification_hub import notification_hub
+from main.common.notification_writer import notification_writer
+from main.v1.customer.invoice.invoice_worker import invoice_worker
 
 
 def create_app():
@@ -15,9 +26,23 @@ def create_app():
     # Initialize extensions
     db.init_app(app)
     bcrypt.init_app(app)
+    password_hasher.init_app(app)
+    token_cache.max_size = app.config["JWT_CACHE_SIZE"]
     migrate.init_app(app, db, compare_type=True)
+    invoice_worker.init_app(app)
+    product_search.init_app(app)
+    reservation_sweeper.init_app(app)
+    shard_registry.init_app(app)
+    stock_shard_rebalancer.init_app(app)
+    sales_series_cache.init_app(app)
+    dashboard_summary.init_app(app)
+    notification_hub.init_app(app)
+    notification_writer.init_app(app)
 
     # Register all routes
     register_routes(app)
 
+    # Register CLI commands
+    register_commands(app)
+
     return app
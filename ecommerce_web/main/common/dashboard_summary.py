@@ -0,0 +1,72 @@
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import func
+from main.database.models import User, Product, ProviderOrderCounter
+from main.common.snapshot_cache import SnapshotCache
+from main.common.stock_shards import stock_levels
+from main.extension import db
+
+
+def user_totals():
+    """Users per role and account_status from one grouped query."""
+    rows = db.session.query(User.role, User.account_status, func.count(User.id)) \
+        .group_by(User.role, User.account_status).all()
+    by_role, by_status = {}, {}
+    for role, account_status, count in rows:
+        by_role[role] = by_role.get(role, 0) + count
+        by_status[account_status] = by_status.get(account_status, 0) + count
+    return {
+        "all": sum(by_role.values()),
+        "by_role": by_role,
+        "by_account_status": by_status,
+        "by_role_and_account_status": [{"role": role, "account_status": account_status, "count": count}
+                                       for role, account_status, count in sorted(rows)]
+    }
+
+
+def order_totals():
+    """Orders per status, summed from the provider order counters instead of counting the order table."""
+    by_status = {status: int(count) for status, count in
+                 db.session.query(ProviderOrderCounter.status, func.sum(ProviderOrderCounter.order_count))
+                 .group_by(ProviderOrderCounter.status) if count}
+    return {"all": sum(by_status.values()), "by_status": by_status}
+
+
+def low_stock_products(threshold, limit):
+    """Active products with at most `threshold` units, lowest first.
+
+    Unsharded products are counted and listed from the (is_deleted, stock_shards, quantity)
+    index; the few sharded ones keep little on the base row, so their totals are summed apart.
+    """
+    low = (Product.is_deleted == False, Product.stock_shards == 0, Product.quantity <= threshold)  # noqa: E712
+    count = db.session.query(func.count(Product.id)).filter(*low).scalar()
+    rows = db.session.query(Product.id, Product.name, Product.provider_id, Product.quantity).filter(*low) \
+        .order_by(Product.quantity, Product.id).limit(limit).all()
+
+    sharded = db.session.query(Product.id, Product.name, Product.provider_id) \
+        .filter(Product.is_deleted == False, Product.stock_shards > 0).all()  # noqa: E712
+    levels = stock_levels([product_id for product_id, _, _ in sharded])
+    sharded_low = [(product_id, name, provider_id, levels.get(product_id, 0))
+                   for product_id, name, provider_id in sharded if levels.get(product_id, 0) <= threshold]
+
+    products = sorted(list(rows) + sharded_low, key=lambda row: (row[3], row[0]))[:limit]
+    return {
+        "threshold": threshold,
+        "count": count + len(sharded_low),
+        "products": [{"id": product_id, "name": name, "provider_id": provider_id, "stock": stock}
+                     for product_id, name, provider_id, stock in products]
+    }
+
+
+def compute_dashboard_summary():
+    config = current_app.config
+    return {
+        "users": user_totals(),
+        "orders": order_totals(),
+        "low_stock": low_stock_products(config.get("LOW_STOCK_THRESHOLD", 5), config.get("LOW_STOCK_LIMIT", 20)),
+        "generated_at": datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+dashboard_summary = SnapshotCache("dashboard_summary", compute_dashboard_summary,
+                                  ttl_key="DASHBOARD_SUMMARY_TTL", default_ttl=15)
@@ -0,0 +1,71 @@
+import csv
+import io
+import json
+from datetime import datetime
+from flask import Response, stream_with_context
+from main.extension import db
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_BATCH_SIZE = 1000  # Rows fetched per server-side cursor round trip and flushed per chunk
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    return value
+
+
+def _iter_rows(stmt, batch_size):
+    """Yield lists of row tuples straight from a server-side cursor."""
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def _ndjson_chunks(stmt, columns, batch_size):
+    for rows in _iter_rows(stmt, batch_size):
+        yield "".join(
+            json.dumps(dict(zip(columns, map(_format_value, row))), separators=(",", ":")) + "\n"
+            for row in rows
+        )
+
+
+def _csv_chunks(stmt, columns, batch_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    yield buffer.getvalue()  # Send the header immediately so the first byte goes out before the query runs
+
+    for rows in _iter_rows(stmt, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_format_value(v) for v in row] for row in rows)
+        yield buffer.getvalue()
+
+
+def stream_export(stmt, columns, export_format, filename, batch_size=EXPORT_BATCH_SIZE):
+    """Stream the rows of a column select as NDJSON or CSV using chunked transfer encoding.
+
+    Rows are pulled in batches from a server-side cursor, so memory stays flat regardless
+    of table size. `columns` names the selected columns in order.
+    """
+    if export_format == "csv":
+        chunks = _csv_chunks(stmt, columns, batch_size)
+    else:
+        chunks = _ndjson_chunks(stmt, columns, batch_size)
+
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}.{export_format}",
+            "X-Accel-Buffering": "no",  # Keep reverse proxies from buffering the whole export
+        },
+    )
@@ -1,8 +1,72 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 import jwt
 from datetime import datetime, timedelta
 from flask import current_app, request
 
 
+class TokenCache:
+    """Bounded LRU cache of verified token claims, keyed by a hash of the secret and token.
+
+    Entries are dropped once their `exp` passes, so an expired token always falls through
+    to jwt.decode and gets the usual "Token has expired" response.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token, secret):
+        return hashlib.sha256(f"{secret}.{token}".encode("utf-8")).digest()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                claims, expires_at = entry
+                if time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return claims
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, claims):
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return  # Never cache tokens without an expiry
+        with self._lock:
+            self._entries[key] = (claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+token_cache = TokenCache()
+
+
 # Generate JWT token (access or refresh)
 def generate_token(identity, role, expires_in=3600):
     """Generate a JWT token with identity, role, and expiration time."""
@@ -18,9 +82,19 @@ def generate_token(identity, role, expires_in=3600):
 
 # Decode JWT token
 def decode_token(token):
-    """Decode a JWT token and handle expiration or invalid token errors."""
+    """Decode a JWT token and handle expiration or invalid token errors.
+
+    Verified claims are served from token_cache until the token expires.
+    """
+    secret = current_app.config['SECRET_KEY']
+    cache_key = TokenCache.key(token, secret)
+    payload = token_cache.get(cache_key)
+    if payload is not None:
+        return payload
+
     try:
-        payload = jwt.decode(token, current_app.config['SECRET_KEY'], algorithms=['HS256'])
+        payload = jwt.decode(token, secret, algorithms=['HS256'])
+        token_cache.put(cache_key, payload)
         return payload
     except jwt.ExpiredSignatureError:
         return {"code": 401, "message": "Token has expired. Please refresh.", "status": 0}, 401
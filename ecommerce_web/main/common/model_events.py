@@ -0,0 +1,106 @@
+from collections import namedtuple
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from main.database.models import Product, Order, Notification
+
+# Snapshot of a committed Product change; removed is True for soft and hard deletes
+ProductChange = namedtuple("ProductChange", "product_id name description removed")
+# Snapshot of a committed Order change; kind is "placed", "updated" (status/quantity) or "deleted".
+# previous_status is the status before an update (None for placed and deleted orders)
+OrderChange = namedtuple("OrderChange", "order_id product_id provider_id kind status previous_status")
+# A Notification row committed through the ORM
+NotificationChange = namedtuple("NotificationChange", "notification_id provider_id")
+
+_product_listeners = []
+_order_listeners = []
+_notification_listeners = []
+
+WATCHED_PRODUCT_FIELDS = ("name", "description", "is_deleted")
+WATCHED_ORDER_FIELDS = ("status", "quantity", "product_id")
+
+
+def on_product_commit(listener):
+    """Register listener(changes) to be called with ProductChange tuples after each commit."""
+    _product_listeners.append(listener)
+    return listener
+
+
+def on_order_commit(listener):
+    """Register listener(changes) to be called with OrderChange tuples after each commit."""
+    _order_listeners.append(listener)
+    return listener
+
+
+def on_notification_commit(listener):
+    """Register listener(changes) to be called with NotificationChange tuples after each commit."""
+    _notification_listeners.append(listener)
+    return listener
+
+
+def publish_product_changes(changes):
+    """Notify product listeners of changes made outside the ORM (e.g. Core bulk inserts)."""
+    for listener in _product_listeners:
+        listener(changes)
+
+
+# Collect changes at flush time (when ids and history are known) ...
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    products = session.info.setdefault("product_changes", [])
+    orders = []  # (order_id, product_id, kind, status, previous_status)
+
+    for obj in session.new:
+        if isinstance(obj, Product):
+            products.append(ProductChange(obj.id, obj.name, obj.description, bool(obj.is_deleted)))
+        elif isinstance(obj, Order):
+            orders.append((obj.id, obj.product_id, "placed", obj.status, None))
+        elif isinstance(obj, Notification):
+            session.info.setdefault("notification_changes", []).append(NotificationChange(obj.id, obj.provider_id))
+    for obj in session.dirty:
+        if isinstance(obj, Product):
+            state = inspect(obj)
+            if any(state.attrs[key].history.has_changes() for key in WATCHED_PRODUCT_FIELDS):
+                products.append(ProductChange(obj.id, obj.name, obj.description, bool(obj.is_deleted)))
+        elif isinstance(obj, Order):
+            state = inspect(obj)
+            if any(state.attrs[key].history.has_changes() for key in WATCHED_ORDER_FIELDS):
+                previous = state.attrs["status"].history.deleted
+                orders.append((obj.id, obj.product_id, "updated", obj.status, previous[0] if previous else obj.status))
+    for obj in session.deleted:
+        if isinstance(obj, Product):
+            products.append(ProductChange(obj.id, None, None, True))
+        elif isinstance(obj, Order):
+            orders.append((obj.id, obj.product_id, "deleted", obj.status, None))
+
+    if orders:
+        # One lookup per flush so listeners can tell whose sales changed
+        providers = dict(session.connection().execute(
+            select(Product.id, Product.provider_id).where(Product.id.in_({order[1] for order in orders}))
+        ).all())
+        session.info.setdefault("order_changes", []).extend(
+            OrderChange(order_id, product_id, providers.get(product_id), kind, status, previous_status)
+            for order_id, product_id, kind, status, previous_status in orders
+        )
+
+
+# ... and hand them to listeners only once the transaction has committed
+@event.listens_for(Session, "after_commit")
+def _dispatch_changes(session):
+    products = session.info.pop("product_changes", None)
+    orders = session.info.pop("order_changes", None)
+    notifications = session.info.pop("notification_changes", None)
+    if products:
+        publish_product_changes(products)
+    if orders:
+        for listener in _order_listeners:
+            listener(orders)
+    if notifications:
+        for listener in _notification_listeners:
+            listener(notifications)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session):
+    session.info.pop("product_changes", None)
+    session.info.pop("order_changes", None)
+    session.info.pop("notification_changes", None)
@@ -0,0 +1,159 @@
+import logging
+import queue
+import threading
+from sqlalchemy import func
+from main.database.models import Notification
+from main.common.model_events import on_notification_commit
+from main.extension import db
+
+logger = logging.getLogger(__name__)
+
+POLL_OVERLAP = 50  # Ids re-read below the last one seen, so rows committed out of id order are not skipped
+
+
+def notification_data(notification):
+    return {
+        "id": notification.id,
+        "message": notification.message,
+        "created_at": notification.created_at.strftime("%Y-%m-%d %H:%M:%S") if notification.created_at else None
+    }
+
+
+def notifications_since(provider_id, since_id, limit):
+    """A provider's notifications with id > since_id, oldest first, from the (provider_id, id) index."""
+    return Notification.query.filter(Notification.provider_id == provider_id, Notification.id > since_id) \
+        .order_by(Notification.id).limit(limit).all()
+
+
+def latest_notifications(provider_id, limit):
+    """A provider's newest `limit` notifications, returned oldest first, from the (provider_id, id) index."""
+    rows = Notification.query.filter(Notification.provider_id == provider_id) \
+        .order_by(Notification.id.desc()).limit(limit).all()
+    return rows[::-1]
+
+
+class Subscription:
+    """One open stream: a bounded queue of notification dicts for a single provider."""
+
+    def __init__(self, provider_id, queue_size):
+        self.provider_id = provider_id
+        self.queue = queue.Queue(queue_size)
+        self.lagging = False  # Set when the queue overflowed; the stream then re-reads from the database
+
+    def offer(self, item):
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.lagging = True
+
+
+class NotificationHub:
+    """Fans new Notification rows out to the streams open in this process.
+
+    A single poller thread reads the rows past the last id it dispatched (one indexed query
+    per interval, however many providers are connected) and is woken at once by notification
+    commits made in this process. It only polls while someone is subscribed. A slow stream
+    never blocks the hub: its queue overflows, it is marked lagging and catches up by cursor.
+    """
+
+    def __init__(self, poll_interval=2, queue_size=256):
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        self.app = None
+        self.thread = None
+        self._subscribers = {}  # provider_id -> set of Subscription
+        self._last_id = None
+        self._floor = 0  # The end when the hub went live; older rows belong to the streams' own catch-up
+        self._recent = set()  # Ids dispatched within the overlap window
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def init_app(self, app):
+        self.app = app
+        self.poll_interval = app.config.get("NOTIFICATION_POLL_INTERVAL", self.poll_interval)
+        self.queue_size = app.config.get("NOTIFICATION_STREAM_QUEUE", self.queue_size)
+        app.extensions["notification_hub"] = self
+
+    def subscribe(self, provider_id):
+        """Register a stream. Anything committed from now on reaches its queue (or marks it lagging)."""
+        subscription = Subscription(int(provider_id), self.queue_size)
+        with self._lock:
+            if self._last_id is None:
+                # Start from the current end; streams read older rows themselves
+                self._last_id = self._floor = db.session.query(func.max(Notification.id)).scalar() or 0
+            self._subscribers.setdefault(subscription.provider_id, set()).add(subscription)
+        self._ensure_started()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.provider_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.provider_id]
+            if not self._subscribers:
+                self._last_id = None  # Idle: the next subscriber starts from the then-current end
+                self._recent.clear()
+
+    def wake(self):
+        """Poll now instead of at the next interval, e.g. right after notifications were inserted."""
+        self._wake.set()
+
+    def connected(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def poll(self):
+        """Dispatch rows committed since the last poll to the subscribed providers. Returns rows dispatched."""
+        with self._lock:
+            if self._last_id is None:
+                return 0
+            low = self._last_id - POLL_OVERLAP
+        rows = Notification.query.filter(Notification.id > low).order_by(Notification.id).all()
+
+        dispatched = 0
+        with self._lock:
+            if self._last_id is None:
+                return 0
+            for notification in rows:
+                if notification.id in self._recent or notification.id <= self._floor:
+                    continue
+                self._recent.add(notification.id)
+                dispatched += 1
+                item = notification_data(notification)
+                for subscription in self._subscribers.get(notification.provider_id, ()):
+                    subscription.offer(item)
+            if rows:
+                self._last_id = max(self._last_id, rows[-1].id)
+            self._recent = {notification_id for notification_id in self._recent
+                            if notification_id > self._last_id - POLL_OVERLAP}
+        return dispatched
+
+    def _ensure_started(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self._lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self._loop, name="notification-hub", daemon=True)
+            self.thread.start()
+
+    def _loop(self):
+        while True:
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if not self.connected():
+                continue
+            with self.app.app_context():
+                try:
+                    self.poll()
+                except Exception:
+                    db.session.rollback()
+                    logger.exception("notification hub poll failed")
+                finally:
+                    db.session.remove()
+
+
+notification_hub = NotificationHub()
+on_notification_commit(lambda changes: notification_hub.wake())
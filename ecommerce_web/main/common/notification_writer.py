@@ -0,0 +1,164 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from sqlalchemy import insert
+from main.database.models import Notification
+from main.common.model_events import on_order_commit
+from main.common.notification_hub import notification_hub
+from main.extension import db
+
+logger = logging.getLogger(__name__)
+
+MAX_LISTED_ORDERS = 10  # Order ids spelled out in a coalesced message
+MESSAGE_LENGTH = 255  # Notification.message column size
+
+# kind -> (message for one order, message for several)
+ORDER_EVENT_MESSAGES = {
+    "placed": ("New order #{ids} for product #{product_id}.", "{count} new orders: #{ids}."),
+    "cancelled": ("Order #{ids} for product #{product_id} was cancelled.", "{count} orders were cancelled: #{ids}."),
+    "deleted": ("Order #{ids} for product #{product_id} was deleted.", "{count} orders were deleted: #{ids}."),
+}
+
+
+def order_event(change):
+    """The notification kind an OrderChange calls for, or None (e.g. a status change other than a cancel)."""
+    if change.provider_id is None:
+        return None
+    if change.kind == "updated":
+        cancelled = change.status == "Cancelled" and change.previous_status != "Cancelled"
+        return "cancelled" if cancelled else None
+    return change.kind
+
+
+def coalesce_order_events(events):
+    """Fold (provider_id, kind, order_id, product_id) events into one notification row per provider and kind."""
+    grouped = {}
+    for provider_id, kind, order_id, product_id in events:
+        grouped.setdefault((provider_id, kind), []).append((order_id, product_id))
+
+    rows = []
+    for (provider_id, kind), orders in grouped.items():
+        one, several = ORDER_EVENT_MESSAGES[kind]
+        if len(orders) == 1:
+            message = one.format(ids=orders[0][0], product_id=orders[0][1])
+        else:
+            ids = ", #".join(str(order_id) for order_id, _ in orders[:MAX_LISTED_ORDERS])
+            if len(orders) > MAX_LISTED_ORDERS:
+                ids += f" and {len(orders) - MAX_LISTED_ORDERS} more"
+            message = several.format(count=len(orders), ids=ids)
+        rows.append({"provider_id": provider_id, "message": message[:MESSAGE_LENGTH]})
+    return rows
+
+
+class NotificationWriter:
+    """Write-behind queue for provider notifications raised by order commits.
+
+    The commit hook only puts events on an in-memory queue, so placing or cancelling an
+    order never waits on a notification insert. A background thread drains the queue every
+    `flush_interval` seconds (or as soon as `batch_size` events are waiting), coalesces them
+    per provider and kind, and bulk-inserts the rows in one transaction. Events still queued
+    when the process dies are lost; when the queue is full new events are dropped and logged
+    rather than blocking the request.
+    """
+
+    def __init__(self, flush_interval=0.5, batch_size=500, max_queue=10000):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.app = None
+        self.thread = None
+        self.written = 0
+        self.dropped = 0
+        self._queue = queue.Queue(max_queue)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # One drain at a time (worker thread or flush())
+
+    def init_app(self, app):
+        self.app = app
+        self.flush_interval = app.config.get("NOTIFICATION_FLUSH_INTERVAL", self.flush_interval)
+        self.batch_size = app.config.get("NOTIFICATION_BATCH_SIZE", self.batch_size)
+        self._queue = queue.Queue(app.config.get("NOTIFICATION_QUEUE_SIZE", self._queue.maxsize))
+        app.extensions["notification_writer"] = self
+
+    def enqueue(self, events):
+        """Queue (provider_id, kind, order_id, product_id) events without blocking."""
+        if self.app is None:
+            return
+        self._ensure_started()
+        for event in events:
+            try:
+                self._queue.put_nowait(event)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+                logger.warning("Notification queue full, dropped %s event for order %s", event[1], event[2])
+
+    def flush(self):
+        """Write everything queued so far. Returns the number of notification rows inserted."""
+        with self._flush_lock:
+            events = []
+            while True:
+                try:
+                    events.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            return self._write(events)
+
+    def stats(self):
+        with self._lock:
+            return {"queued": self._queue.qsize(), "written": self.written, "dropped": self.dropped}
+
+    # Order commit hook
+    def apply_order_changes(self, changes):
+        events = [(change.provider_id, kind, change.order_id, change.product_id)
+                  for change in changes for kind in [order_event(change)] if kind]
+        if events:
+            self.enqueue(events)
+
+    def _write(self, events):
+        if not events:
+            return 0
+        rows = coalesce_order_events(events)
+        with self.app.app_context():
+            try:
+                db.session.execute(insert(Notification.__table__), rows)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception("Could not write %s notification(s)", len(rows))
+                return 0
+            finally:
+                db.session.remove()
+        with self._lock:
+            self.written += len(rows)
+        notification_hub.wake()  # Core inserts skip the ORM commit hook the hub listens to
+        return len(rows)
+
+    def _ensure_started(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self._lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            if self.thread is None:
+                atexit.register(self.flush)  # Best effort for whatever is still queued at shutdown
+            self.thread = threading.Thread(target=self._loop, name="notification-writer", daemon=True)
+            self.thread.start()
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()  # Sleep until there is something to write
+            deadline = time.monotonic() + self.flush_interval
+            with self._flush_lock:
+                events = [first]
+                while len(events) < self.batch_size:
+                    try:
+                        events.append(self._queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                    except queue.Empty:
+                        break
+                self._write(events)
+
+
+notification_writer = NotificationWriter()
+on_order_commit(notification_writer.apply_order_changes)
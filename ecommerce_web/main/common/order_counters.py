@@ -0,0 +1,151 @@
+import random
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy import event, inspect, select, func, delete
+from sqlalchemy.orm import Session
+from main.database.models import Order, Product, ProviderOrderCounter, SalesRollupDaily
+from main.common.sql_utils import upsert_add
+from main.extension import db
+
+COUNTER_SLOTS = 8  # Rows per counter key; writers pick one at random
+DEFAULT_STATUS = "Pending"
+
+# What one order contributes to the aggregates
+Contribution = namedtuple("Contribution", "product_id status day quantity unit_price")
+
+
+def _committed(state, key):
+    """Value of an attribute as of the last flush (before pending changes)."""
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(state.object, key)
+
+
+def _contribution(order, value):
+    created_at = value("created_at")
+    return Contribution(value("product_id"), value("status") or DEFAULT_STATUS,
+                        created_at.date() if created_at else None, value("quantity") or 1, value("unit_price"))
+
+
+# Load the previous values on assignment, so a change of an expired order still knows what to take back
+@event.listens_for(Order.status, "set", active_history=True)
+@event.listens_for(Order.product_id, "set", active_history=True)
+@event.listens_for(Order.quantity, "set", active_history=True)
+def _keep_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+# Counters and rollups change in the same transaction as the orders they aggregate
+# (computed before the flush, while deleted orders can still be read)
+@event.listens_for(Session, "before_flush")
+def _aggregate_order_changes(session, flush_context, instances):
+    new_orders = [obj for obj in session.new if isinstance(obj, Order)]
+    changes = []  # (sign, Contribution)
+    for obj in session.deleted:
+        if isinstance(obj, Order):
+            state = inspect(obj)
+            changes.append((-1, _contribution(obj, lambda key: _committed(state, key))))
+    for obj in session.dirty:
+        if isinstance(obj, Order) and session.is_modified(obj):
+            state = inspect(obj)
+            before = _contribution(obj, lambda key: _committed(state, key))
+            after = _contribution(obj, lambda key: getattr(obj, key))
+            if before != after:
+                changes += [(-1, before), (1, after)]
+    if not new_orders and not changes:
+        return
+
+    connection = session.connection()
+    product_ids = {order.product_id for order in new_orders} | {c.product_id for _, c in changes}
+    products = {product_id: (provider_id, price) for product_id, provider_id, price in connection.execute(
+        select(Product.id, Product.provider_id, Product.price).where(Product.id.in_(product_ids))
+    )}
+
+    # Snapshot price and timestamp on new orders, so rollups can be rebuilt to the same numbers later
+    for order in new_orders:
+        if order.created_at is None:
+            order.created_at = datetime.utcnow()
+        if order.unit_price is None and order.product_id in products:
+            order.unit_price = products[order.product_id][1]
+        changes.append((1, _contribution(order, lambda key: getattr(order, key))))
+
+    counters = Counter()
+    rollups = {}
+    for sign, c in changes:
+        if c.product_id not in products:
+            continue
+        provider_id, price = products[c.product_id]
+        counters[(provider_id, c.status)] += sign
+        if c.day is not None:
+            key = (c.day, c.product_id, c.status, provider_id)
+            orders, units, revenue = rollups.get(key, (0, 0, 0.0))
+            unit_price = c.unit_price if c.unit_price is not None else price
+            rollups[key] = (orders + sign, units + sign * c.quantity, revenue + sign * c.quantity * unit_price)
+
+    counter_rows = [{"provider_id": provider_id, "status": status, "slot": random.randrange(COUNTER_SLOTS),
+                     "order_count": change} for (provider_id, status), change in sorted(counters.items()) if change]
+    if counter_rows:
+        connection.execute(upsert_add(ProviderOrderCounter.__table__, ["provider_id", "status", "slot"],
+                                      ["order_count"], connection), counter_rows)
+
+    rollup_rows = [{"day": day, "product_id": product_id, "status": status, "slot": random.randrange(COUNTER_SLOTS),
+                    "provider_id": provider_id, "order_count": orders, "units": units, "revenue": revenue}
+                   for (day, product_id, status, provider_id), (orders, units, revenue) in sorted(rollups.items())
+                   if orders or units or revenue]
+    if rollup_rows:
+        connection.execute(upsert_add(SalesRollupDaily.__table__, ["day", "product_id", "status", "slot"],
+                                      ["order_count", "units", "revenue"], connection), rollup_rows)
+
+
+def provider_order_totals(provider_id):
+    """Order totals for a provider, overall and per status, summed from its counter slots."""
+    by_status = {status: int(count) for status, count in
+                 db.session.query(ProviderOrderCounter.status, func.sum(ProviderOrderCounter.order_count))
+                 .filter(ProviderOrderCounter.provider_id == provider_id)
+                 .group_by(ProviderOrderCounter.status) if count}
+    return {"all": sum(by_status.values()), "by_status": by_status}
+
+
+def recount_provider_orders():
+    """Rebuild every provider counter from the order table (repairs drift from raw SQL edits). Returns rows written."""
+    status = func.coalesce(Order.status, DEFAULT_STATUS)
+    counts = db.session.query(Product.provider_id, status, func.count(Order.id)) \
+        .join(Product, Product.id == Order.product_id).group_by(Product.provider_id, status).all()
+    db.session.execute(delete(ProviderOrderCounter))
+    db.session.add_all([ProviderOrderCounter(provider_id=provider_id, status=order_status, slot=0, order_count=count)
+                        for provider_id, order_status, count in counts])
+    db.session.commit()
+    return len(counts)
+
+
+def _rollup_totals(day):
+    row = db.session.query(func.coalesce(func.sum(SalesRollupDaily.order_count), 0),
+                           func.coalesce(func.sum(SalesRollupDaily.revenue), 0)) \
+        .filter(SalesRollupDaily.day == day).one()
+    return int(row[0]), round(float(row[1]), 2)
+
+
+def rebuild_sales_day(day):
+    """Recompute one day's rollup rows from the order table. Returns (before, after) (orders, revenue) totals.
+
+    Reads only that day's orders through the created_at index. Meant for closed days:
+    orders placed on `day` while it runs may be counted twice or not at all.
+    """
+    before = _rollup_totals(day)
+    start = datetime(day.year, day.month, day.day)
+    status = func.coalesce(Order.status, DEFAULT_STATUS)
+    rows = db.session.query(Order.product_id, status, Product.provider_id, func.count(Order.id),
+                            func.sum(Order.quantity),
+                            func.sum(Order.quantity * func.coalesce(Order.unit_price, Product.price))) \
+        .join(Product, Product.id == Order.product_id) \
+        .filter(Order.created_at >= start, Order.created_at < start + timedelta(days=1)) \
+        .group_by(Order.product_id, status, Product.provider_id).all()
+
+    db.session.execute(delete(SalesRollupDaily).where(SalesRollupDaily.day == day))
+    db.session.add_all([SalesRollupDaily(day=day, product_id=product_id, status=order_status, slot=0,
+                                         provider_id=provider_id, order_count=count, units=int(units or 0),
+                                         revenue=float(revenue or 0))
+                        for product_id, order_status, provider_id, count, units, revenue in rows])
+    db.session.commit()
+    return before, _rollup_totals(day)
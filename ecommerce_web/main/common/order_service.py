@@ -0,0 +1,205 @@
+from datetime import datetime
+from sqlalchemy import update, case
+from main.database.models import Order, Product, Checkout
+from main.common.stock_shards import shard_registry, take_from_shard, take_across_shards, stock_levels
+from main.common.pagination import parse_datetime_arg
+from main.extension import db
+
+
+class OrderPlacementError(Exception):
+    """Raised when an order cannot be placed; carries the HTTP status code to return."""
+
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.message = message
+        self.code = code
+
+
+def order_filters(args):
+    """Build SQL filter conditions for order listings from query args. Raises ValueError on bad input."""
+    conditions = []
+
+    if args.get("status"):
+        conditions.append(Order.status == args["status"])
+    try:
+        if args.get("customer_id"):
+            conditions.append(Order.customer_id == int(args["customer_id"]))
+        if args.get("product_id"):
+            conditions.append(Order.product_id == int(args["product_id"]))
+    except ValueError:
+        raise ValueError("Customer ID and Product ID must be integers.")
+
+    try:
+        date_from = parse_datetime_arg(args.get("date_from"))
+        date_to = parse_datetime_arg(args.get("date_to"))
+    except ValueError:
+        raise ValueError("Dates must be formatted as YYYY-MM-DD or YYYY-MM-DD HH:MM:SS.")
+    if date_from:
+        conditions.append(Order.created_at >= date_from)
+    if date_to:
+        conditions.append(Order.created_at <= date_to)
+
+    return conditions
+
+
+def decrement_stock(product_id, quantity=1):
+    """Atomically take `quantity` units of a product with a single conditional UPDATE.
+
+    Returns True if the stock was decremented. The check and the write happen in one
+    statement, so concurrent checkouts can never drive the quantity below zero and no
+    explicit row lock is held beyond the UPDATE itself.
+
+    Products flagged for sharded stock are decremented on one of their shard rows instead,
+    falling back to the base row and finally to a locked walk over all rows.
+    """
+    sharded = shard_registry.shard_count(product_id) > 0
+    if sharded and take_from_shard(product_id, quantity):
+        return True
+
+    result = db.session.execute(
+        update(Product)
+        .where(Product.id == product_id, Product.is_deleted == False, Product.quantity >= quantity)  # noqa: E712
+        .values(quantity=Product.quantity - quantity)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 1:
+        return True
+
+    # The base row is short: the product may hold its stock in shards (or was sharded since we last looked)
+    if shard_registry.refresh(product_id):
+        return (not sharded and take_from_shard(product_id, quantity)) or take_across_shards(product_id, quantity)
+    return False
+
+
+def decrement_stock_many(quantities):
+    """Atomically take stock for several products ({product_id: quantity}) in one UPDATE.
+
+    Returns True only if every product had enough stock; otherwise some rows may have been
+    decremented and the caller must roll back. Rows are matched by primary key in ascending
+    id order, so concurrent multi-product checkouts lock products in the same order and
+    cannot deadlock each other. Sharded products are taken one by one afterwards, also in
+    id order, through decrement_stock.
+    """
+    sharded = sorted(product_id for product_id in quantities if shard_registry.shard_count(product_id))
+    product_ids = sorted(product_id for product_id in quantities if product_id not in sharded)
+    if product_ids:
+        needed = case({product_id: quantities[product_id] for product_id in product_ids}, value=Product.id)
+        result = db.session.execute(
+            update(Product)
+            .where(Product.id.in_(product_ids), Product.is_deleted == False, Product.quantity >= needed)  # noqa: E712
+            .values(quantity=Product.quantity - needed)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(product_ids):
+            for product_id in product_ids:
+                shard_registry.refresh(product_id)  # So a retry routes newly sharded products correctly
+            return False
+    return all(decrement_stock(product_id, quantities[product_id]) for product_id in sharded)
+
+
+def restore_stock(product_id, quantity=1):
+    """Atomically return `quantity` units to a non-deleted product (e.g. when an order is removed)."""
+    db.session.execute(
+        update(Product)
+        .where(Product.id == product_id, Product.is_deleted == False)  # noqa: E712
+        .values(quantity=Product.quantity + quantity)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def restore_stock_many(quantities):
+    """Return stock to several non-deleted products ({product_id: quantity}) in one UPDATE."""
+    product_ids = sorted(quantities)
+    returned = case({product_id: quantities[product_id] for product_id in product_ids}, value=Product.id)
+    db.session.execute(
+        update(Product)
+        .where(Product.id.in_(product_ids), Product.is_deleted == False)  # noqa: E712
+        .values(quantity=Product.quantity + returned)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def place_order(customer_id, product_id, status="Pending", quantity=1, commit=True):
+    """Decrement stock and create an order in one transaction. Raises OrderPlacementError.
+
+    With commit=False the order is only flushed (so it has an id) and the caller owns the
+    transaction, which lets it add related rows that must commit atomically with the order.
+    """
+    if not decrement_stock(product_id, quantity):
+        db.session.rollback()
+        # Only reached on failure: tell "missing" apart from "sold out" for the error message
+        if not Product.query.filter_by(id=product_id, is_deleted=False).first():
+            raise OrderPlacementError("Product not found or unavailable.", 404)
+        raise OrderPlacementError("Product out of stock.", 400)
+
+    new_order = Order(
+        customer_id=customer_id,
+        product_id=product_id,
+        status=status,
+        quantity=quantity,
+        created_at=datetime.utcnow()
+    )
+    db.session.add(new_order)
+    if commit:
+        db.session.commit()
+    else:
+        db.session.flush()
+    return new_order
+
+
+def merge_quantities(items):
+    """Turn [(product_id, quantity)] into {product_id: total quantity}."""
+    quantities = {}
+    for product_id, quantity in items:
+        quantities[product_id] = quantities.get(product_id, 0) + quantity
+    return quantities
+
+
+def take_stock(quantities):
+    """Decrement stock for every product or none. Raises OrderPlacementError naming the first short product."""
+    if decrement_stock_many(quantities):
+        return
+    db.session.rollback()
+    # Only reached on failure: find the first line that could not be filled
+    active = [product_id for (product_id,) in db.session.query(Product.id)
+              .filter(Product.id.in_(quantities), Product.is_deleted == False)]  # noqa: E712
+    available = stock_levels(active)
+    for product_id in sorted(quantities):
+        if product_id not in available:
+            raise OrderPlacementError(f"Product {product_id} not found or unavailable.", 404)
+        if available[product_id] < quantities[product_id]:
+            raise OrderPlacementError(f"Product {product_id} out of stock.", 400)
+    raise OrderPlacementError("Stock changed during checkout. Please retry.", 409)
+
+
+def place_checkout(customer_id, items, status="Pending", commit=True):
+    """Take stock for every cart line and create a checkout with one order per product.
+
+    `items` is a list of (product_id, quantity); repeated products are merged. Either all
+    lines are placed or none are. Raises OrderPlacementError naming the first product that
+    is missing or short of stock. With commit=False the checkout and its lines are only
+    flushed, as in place_order.
+    """
+    quantities = merge_quantities(items)
+    take_stock(quantities)
+    return create_checkout(customer_id, quantities, status=status, commit=commit)
+
+
+def create_checkout(customer_id, quantities, status="Pending", commit=True):
+    """Create a checkout with one order line per product ({product_id: quantity}).
+
+    Stock must already have been taken (by place_checkout or a confirmed reservation).
+    """
+    created_at = datetime.utcnow()
+    checkout = Checkout(customer_id=customer_id, created_at=created_at)
+    checkout.lines = [
+        Order(customer_id=customer_id, product_id=product_id, status=status,
+              quantity=quantities[product_id], created_at=created_at)
+        for product_id in sorted(quantities)
+    ]
+    db.session.add(checkout)
+    if commit:
+        db.session.commit()
+    else:
+        db.session.flush()
+    return checkout
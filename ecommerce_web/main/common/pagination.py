@@ -0,0 +1,90 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+
+# Encode keyset position as an opaque cursor
+def encode_cursor(*values):
+    """Encode the sort key of the last row of a page into an opaque cursor string."""
+    parts = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(parts, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+# Decode an opaque cursor back into its key values
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor. Raises ValueError on malformed input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        parts = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid cursor.")
+    if not isinstance(parts, list):
+        raise ValueError("Invalid cursor.")
+    return parts
+
+
+# Read the page size from query args
+def parse_limit(value, default=DEFAULT_PAGE_LIMIT, maximum=MAX_PAGE_LIMIT):
+    """Parse a page limit, clamping it to [1, maximum]. Raises ValueError if not an integer."""
+    if value is None or value == "":
+        return default
+    limit = int(str(value).strip())
+    if limit < 1:
+        raise ValueError("Limit must be a positive integer.")
+    return min(limit, maximum)
+
+
+# Parse a date or datetime query argument
+def parse_datetime_arg(value):
+    """Parse 'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' (or ISO 8601). Returns None for empty values."""
+    if not value:
+        return None
+    value = str(value).strip()
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return datetime.fromisoformat(value)
+
+
+# Build the "after this row" predicate for a keyset over several columns
+def keyset_filter(columns, values, descending=False):
+    """Return a filter selecting rows strictly after `values` in (columns...) order.
+
+    Expands to (c1 > v1) OR (c1 = v1 AND c2 > v2) ..., which every backend can answer
+    with a range scan on an index over the same columns.
+    """
+    clauses = []
+    for i, (column, value) in enumerate(zip(columns, values)):
+        beyond = column < value if descending else column > value
+        clauses.append(and_(*[c == v for c, v in zip(columns[:i], values[:i])], beyond))
+    return or_(*clauses)
+
+
+# Build the "after this row" predicate for a descending (created_at, id) keyset
+def created_at_keyset_filter(model, cursor):
+    """Return a filter selecting rows strictly after the cursor in (created_at DESC, id DESC) order."""
+    parts = decode_cursor(cursor)
+    if len(parts) != 2:
+        raise ValueError("Invalid cursor.")
+    try:
+        created_at = datetime.fromisoformat(parts[0])
+        row_id = int(parts[1])
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor.")
+    return keyset_filter([model.created_at, model.id], [created_at, row_id], descending=True)
+
+
+# Slice a limit+1 result into a page and its next cursor
+def keyset_page(rows, limit, key):
+    """Given up to limit+1 rows, return (page_rows, next_cursor or None)."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(*key(page[-1]))
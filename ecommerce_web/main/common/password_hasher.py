@@ -0,0 +1,98 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.exceptions import ServiceUnavailable
+from main.extension import bcrypt
+
+
+class PasswordHasherBusy(ServiceUnavailable):
+    """Raised when too many password operations are already waiting for the hashing pool."""
+
+    description = "Authentication service is busy. Please retry shortly."
+
+
+class PasswordHasher:
+    """Runs bcrypt hashing and verification on a dedicated, bounded thread pool.
+
+    bcrypt releases the GIL, so capping the pool at a few threads bounds how much CPU a
+    login or registration storm can take from the rest of the app. Work beyond the queue
+    limit is rejected with 503 instead of piling up on request threads.
+    """
+
+    def __init__(self, app=None):
+        self.executor = None
+        self.workers = 0
+        self.rounds = 12
+        self.max_queue = 64
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "rejected": 0, "queued": 0, "active": 0,
+                       "wait_seconds": 0.0, "run_seconds": 0.0}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config.get("BCRYPT_LOG_ROUNDS", 12)
+        self.max_queue = app.config.get("BCRYPT_MAX_QUEUE", 64)
+        self.workers = app.config.get("BCRYPT_WORKERS", 4)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        app.extensions["password_hasher"] = self
+
+    def _run(self, fn, *args):
+        with self._lock:
+            if self._stats["queued"] >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise PasswordHasherBusy(retry_after=1)
+            self._stats["submitted"] += 1
+            self._stats["queued"] += 1
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._stats["queued"] -= 1
+                self._stats["active"] += 1
+                self._stats["wait_seconds"] += started_at - submitted_at
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._stats["active"] -= 1
+                    self._stats["completed"] += 1
+                    self._stats["run_seconds"] += time.perf_counter() - started_at
+
+        return self.executor.submit(task).result()
+
+    def hash(self, password):
+        """Hash a password with the configured work factor."""
+        return self._run(bcrypt.generate_password_hash, password, self.rounds).decode("utf-8")
+
+    def verify(self, password_hash, password):
+        """Check a password against a stored bcrypt hash."""
+        return self._run(bcrypt.check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the hash was made with a different work factor than the configured one."""
+        try:
+            return int(password_hash.split("$")[2]) != self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return True
+
+    def stats(self):
+        """Snapshot of pool usage and queueing metrics."""
+        with self._lock:
+            stats = dict(self._stats)
+        completed = stats.pop("completed")
+        wait_seconds = stats.pop("wait_seconds")
+        run_seconds = stats.pop("run_seconds")
+        stats.update({
+            "completed": completed,
+            "avg_wait_ms": round(wait_seconds * 1000 / completed, 2) if completed else 0.0,
+            "avg_run_ms": round(run_seconds * 1000 / completed, 2) if completed else 0.0,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "rounds": self.rounds
+        })
+        return stats
+
+
+password_hasher = PasswordHasher()
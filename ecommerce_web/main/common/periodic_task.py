@@ -0,0 +1,55 @@
+import logging
+import threading
+from main.extension import db
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Runs fn(app) every few seconds on a daemon thread, inside an app context.
+
+    The thread starts on the first ensure_started() call a process makes (typically from
+    the request that creates work for it), so CLI commands and idle workers never run it.
+    A truthy return value is logged; exceptions are logged and the loop carries on.
+    """
+
+    def __init__(self, name, fn, interval_key, default_interval):
+        self.name = name
+        self.fn = fn
+        self.interval_key = interval_key
+        self.interval = default_interval
+        self.app = None
+        self.thread = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def init_app(self, app):
+        self.app = app
+        self.interval = app.config.get(self.interval_key, self.interval)
+        app.extensions[self.name] = self
+
+    def ensure_started(self):
+        if self.thread is not None and self.thread.is_alive():
+            return
+        with self._lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self._stop.clear()
+            self.thread = threading.Thread(target=self._loop, name=self.name.replace("_", "-"), daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            with self.app.app_context():
+                try:
+                    result = self.fn(self.app)
+                    if result:
+                        logger.info("%s: %s", self.name, result)
+                except Exception:
+                    db.session.rollback()
+                    logger.exception("%s failed", self.name)
+                finally:
+                    db.session.remove()
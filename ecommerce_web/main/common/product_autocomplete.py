@@ -0,0 +1,154 @@
+import heapq
+import threading
+from bisect import bisect_left, insort
+from sqlalchemy import func
+from main.database.models import Product, Order
+from main.common.model_events import on_product_commit, on_order_commit
+from main.extension import db
+
+KEY_SEPARATOR = "\x00"  # Sorts before every printable character, so "ab" keys precede "abc" keys
+ID_WIDTH = 10
+RANK_CACHE_THRESHOLD = 2000  # Prefixes matching more names than this keep their ranking cached
+MAX_SUGGESTIONS = 20
+BUILD_BATCH_SIZE = 10000
+
+
+def normalize(name):
+    return " ".join(name.lower().split()) if name else ""
+
+
+class ProductAutocomplete:
+    """Prefix suggestions over active product names, ranked by sales count.
+
+    Names live in one sorted list of "normalized name\\0product id" keys. A prefix lookup is
+    two bisects plus a top-k over the matching slice. Broad prefixes match a large share of
+    the catalog, so their top-k is cached and dropped only when a product under that prefix
+    changes or sells. The index is built from one streaming query on first use and kept in
+    step with committed Product and Order changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._keys = []
+        self._names = {}  # product_id -> display name
+        self._sales = {}  # product_id -> order count
+        self._top_cache = {}  # broad prefix -> ranked product ids
+        self.ready = False
+
+    @staticmethod
+    def _key(product_id, name):
+        return f"{normalize(name)}{KEY_SEPARATOR}{product_id:0{ID_WIDTH}d}"
+
+    def _invalidate(self, name):
+        normalized = normalize(name)
+        if self._top_cache:
+            for length in range(1, len(normalized) + 1):
+                self._top_cache.pop(normalized[:length], None)
+
+    def rebuild(self, rows):
+        """Replace the index with (product_id, name, sales) rows."""
+        keys, names, sales = [], {}, {}
+        for product_id, name, sold in rows:
+            keys.append(self._key(product_id, name))
+            names[product_id] = name
+            sales[product_id] = sold or 0
+        keys.sort()
+        with self._lock:
+            self._keys, self._names, self._sales = keys, names, sales
+            self._top_cache = {}
+            self.ready = True
+
+    def upsert(self, product_id, name):
+        with self._lock:
+            self.remove(product_id)
+            insort(self._keys, self._key(product_id, name))
+            self._names[product_id] = name
+            self._sales.setdefault(product_id, 0)
+            self._invalidate(name)
+
+    def remove(self, product_id):
+        with self._lock:
+            name = self._names.pop(product_id, None)
+            if name is None:
+                return
+            key = self._key(product_id, name)
+            i = bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                del self._keys[i]
+            self._sales.pop(product_id, None)
+            self._invalidate(name)
+
+    def record_sales(self, product_id, delta):
+        with self._lock:
+            if product_id in self._names:
+                self._sales[product_id] = max(0, self._sales[product_id] + delta)
+                self._invalidate(self._names[product_id])
+
+    def _rank(self, prefix, limit):
+        ranked = self._top_cache.get(prefix)
+        if ranked is not None:
+            return ranked[:limit]
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\uffff", lo)
+        broad = hi - lo > RANK_CACHE_THRESHOLD
+        ids = (int(self._keys[i][-ID_WIDTH:]) for i in range(lo, hi))
+        ranked = heapq.nlargest(MAX_SUGGESTIONS if broad else limit, ids,
+                                key=lambda product_id: (self._sales[product_id], -product_id))
+        if broad:
+            self._top_cache[prefix] = ranked
+        return ranked[:limit]
+
+    def suggest(self, prefix, limit=10):
+        """Return [(product_id, name, sales)] for names starting with prefix, best sellers first."""
+        prefix = normalize(prefix)
+        limit = min(limit, MAX_SUGGESTIONS)
+        if not prefix:
+            return []
+        with self._lock:
+            ranked = self._rank(prefix, limit)
+            return [(product_id, self._names[product_id], self._sales[product_id]) for product_id in ranked]
+
+    def __len__(self):
+        return len(self._keys)
+
+    # Commit hooks
+    def apply_product_changes(self, changes):
+        if not self.ready:
+            return
+        for change in changes:
+            if change.removed:
+                self.remove(change.product_id)
+            else:
+                self.upsert(change.product_id, change.name)
+
+    def apply_order_changes(self, changes):
+        if not self.ready:
+            return
+        for change in changes:
+            if change.kind != "updated":
+                self.record_sales(change.product_id, 1 if change.kind == "placed" else -1)
+
+
+def iter_autocomplete_rows():
+    """Stream (id, name, sales) for active products in one query (sales joined from a grouped subquery)."""
+    sales = db.session.query(Order.product_id, func.count(Order.id).label("sales")) \
+        .group_by(Order.product_id).subquery()
+    stmt = db.select(Product.id, Product.name, sales.c.sales) \
+        .outerjoin(sales, sales.c.product_id == Product.id) \
+        .where(Product.is_deleted == False) \
+        .execution_options(yield_per=BUILD_BATCH_SIZE)
+    for row in db.session.execute(stmt):
+        yield tuple(row)
+
+
+product_autocomplete = ProductAutocomplete()
+on_product_commit(product_autocomplete.apply_product_changes)
+on_order_commit(product_autocomplete.apply_order_changes)
+_build_lock = threading.Lock()
+
+
+def ensure_autocomplete_ready():
+    if not product_autocomplete.ready:
+        with _build_lock:
+            if not product_autocomplete.ready:
+                product_autocomplete.rebuild(iter_autocomplete_rows())
@@ -0,0 +1,185 @@
+import heapq
+import math
+import re
+import threading
+from collections import defaultdict
+from sqlalchemy import text
+from main.database.models import Product
+from main.common.model_events import on_product_commit
+from main.extension import db
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+NAME_WEIGHT = 2  # A term in the name counts as much as two in the description
+REBUILD_BATCH_SIZE = 5000
+
+
+def tokenize(value):
+    return TOKEN_RE.findall(value.lower()) if value else []
+
+
+def iter_products(after_id=0):
+    """Stream (id, name, description) of non-deleted products with id > after_id."""
+    stmt = db.select(Product.id, Product.name, Product.description) \
+        .where(Product.is_deleted == False, Product.id > after_id) \
+        .order_by(Product.id).execution_options(yield_per=REBUILD_BATCH_SIZE)
+    for row in db.session.execute(stmt):
+        yield tuple(row)
+
+
+class InvertedIndexBackend:
+    """In-process inverted index with BM25 ranking, for local development and single-process deploys.
+
+    Each process keeps its own copy: it is built from one streaming query the first time it
+    is searched and kept current from Product commits in the same process.
+    """
+
+    name = "memory"
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = defaultdict(dict)  # token -> {product_id: weighted term frequency}
+        self._doc_tokens = {}  # product_id -> tokens, so a document can be removed
+        self._doc_lengths = {}
+        self._total_length = 0
+        self.ready = False
+
+    def _remove(self, product_id):
+        for token in self._doc_tokens.pop(product_id, ()):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(product_id, None)
+                if not postings:
+                    del self._postings[token]
+        self._total_length -= self._doc_lengths.pop(product_id, 0)
+
+    def _add(self, product_id, name, description):
+        frequencies = defaultdict(int)
+        for token in tokenize(name):
+            frequencies[token] += NAME_WEIGHT
+        for token in tokenize(description):
+            frequencies[token] += 1
+        if not frequencies:
+            return
+        for token, frequency in frequencies.items():
+            self._postings[token][product_id] = frequency
+        self._doc_tokens[product_id] = tuple(frequencies)
+        self._doc_lengths[product_id] = sum(frequencies.values())
+        self._total_length += self._doc_lengths[product_id]
+
+    def index(self, product_id, name, description):
+        with self._lock:
+            self._remove(product_id)
+            self._add(product_id, name, description)
+
+    def remove(self, product_id):
+        with self._lock:
+            self._remove(product_id)
+
+    def rebuild(self, rows):
+        """Replace the index contents with (id, name, description) rows."""
+        with self._lock:
+            self._postings = defaultdict(dict)
+            self._doc_tokens = {}
+            self._doc_lengths = {}
+            self._total_length = 0
+            for product_id, name, description in rows:
+                self._add(product_id, name, description)
+            self.ready = True
+
+    def search(self, query, limit, offset=0):
+        """Return [(product_id, score)] ranked by BM25 (any query term may match)."""
+        terms = set(tokenize(query))
+        with self._lock:
+            doc_count = len(self._doc_lengths)
+            if not doc_count or not terms:
+                return []
+            average_length = self._total_length / doc_count
+            scores = defaultdict(float)
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for product_id, frequency in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[product_id] / average_length)
+                    scores[product_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        ranked = heapq.nsmallest(offset + limit, scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(product_id, round(score, 4)) for product_id, score in ranked[offset:]]
+
+
+class MySQLFulltextBackend:
+    """Ranks with MySQL FULLTEXT (natural language mode) over product(name, description).
+
+    MySQL maintains the index itself, so change events need no work here.
+    """
+
+    name = "mysql"
+    ready = True
+
+    def index(self, product_id, name, description):
+        pass
+
+    def remove(self, product_id):
+        pass
+
+    def rebuild(self, rows):
+        for _ in rows:  # Drain the iterator; the database rebuilds its own index
+            pass
+        db.session.execute(text("OPTIMIZE TABLE product"))
+
+    def search(self, query, limit, offset=0):
+        match = text("MATCH (product.name, product.description) AGAINST (:query IN NATURAL LANGUAGE MODE)") \
+            .bindparams(query=query)
+        rows = db.session.query(Product.id, match.label("score")) \
+            .filter(match, Product.is_deleted == False) \
+            .order_by(text("score DESC"), Product.id) \
+            .limit(limit).offset(offset).all()
+        return [(product_id, round(float(score), 4)) for product_id, score in rows]
+
+
+class ProductSearch:
+    """Product full-text search with a pluggable backend, kept current from Product commits."""
+
+    def __init__(self, app=None):
+        self.backend = None
+        self._build_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        backend = app.config.get("SEARCH_BACKEND", "auto")
+        if backend == "auto":
+            backend = "mysql" if (app.config.get("SQLALCHEMY_DATABASE_URI") or "").startswith("mysql") else "memory"
+        self.backend = MySQLFulltextBackend() if backend == "mysql" else InvertedIndexBackend()
+        app.extensions["product_search"] = self
+
+    def rebuild(self):
+        """Rebuild the whole index from the product table with a single streaming query."""
+        with self._build_lock:
+            self.backend.rebuild(iter_products())
+
+    def ensure_ready(self):
+        if not self.backend.ready:
+            with self._build_lock:
+                if not self.backend.ready:
+                    self.backend.rebuild(iter_products())
+
+    def search(self, query, limit, offset=0):
+        self.ensure_ready()
+        return self.backend.search(query, limit, offset)
+
+    def apply_changes(self, changes):
+        if self.backend is None or not self.backend.ready:
+            return  # Not built yet: the first search will read the committed rows anyway
+        for product_id, name, description, removed in changes:
+            if removed:
+                self.backend.remove(product_id)
+            else:
+                self.backend.index(product_id, name, description)
+
+
+product_search = ProductSearch()
+on_product_commit(product_search.apply_changes)
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+from sqlalchemy import update, func
+from main.database.models import StockReservation
+from main.common.order_service import OrderPlacementError, merge_quantities, take_stock, restore_stock_many, \
+    create_checkout
+from main.common.periodic_task import PeriodicTask
+from main.extension import db
+
+
+def reserve_stock(customer_id, items, ttl_seconds):
+    """Hold stock for a customer for ttl_seconds. Returns the held StockReservation rows.
+
+    Held units are taken out of Product.quantity right away with the same single conditional
+    UPDATE as checkout, so Product.quantity stays the sellable stock and nothing has to add
+    up reservations to answer "how many can I buy". A product the customer already holds
+    is returned as is instead of taking stock again, so client retries stay off the product
+    row; release it first to change the quantity. Raises OrderPlacementError.
+    """
+    quantities = merge_quantities(items)
+    now = datetime.utcnow()
+    existing = StockReservation.query.filter(
+        StockReservation.customer_id == customer_id,
+        StockReservation.status == "held",
+        StockReservation.product_id.in_(quantities),
+        StockReservation.expires_at > now
+    ).all()
+    held = {reservation.product_id for reservation in existing}
+    to_take = {product_id: quantity for product_id, quantity in quantities.items() if product_id not in held}
+
+    created = []
+    if to_take:
+        take_stock(to_take)
+        expires_at = now + timedelta(seconds=ttl_seconds)
+        created = [StockReservation(customer_id=customer_id, product_id=product_id, quantity=quantity,
+                                    status="held", expires_at=expires_at, created_at=now)
+                   for product_id, quantity in sorted(to_take.items())]
+        db.session.add_all(created)
+        db.session.commit()
+    return sorted(existing + created, key=lambda reservation: reservation.product_id)
+
+
+def _lock_held(customer_id, reservation_ids):
+    """Load the customer's held reservations among the ids, locking them against the sweeper."""
+    return StockReservation.query.filter(
+        StockReservation.id.in_(reservation_ids),
+        StockReservation.customer_id == customer_id,
+        StockReservation.status == "held"
+    ).order_by(StockReservation.id).with_for_update().all()
+
+
+def confirm_reservations(customer_id, reservation_ids, commit=True):
+    """Turn held reservations into one checkout without touching stock again. Raises OrderPlacementError."""
+    reservation_ids = set(reservation_ids)
+    reservations = _lock_held(customer_id, reservation_ids)
+    now = datetime.utcnow()
+    if len(reservations) != len(reservation_ids) or any(r.expires_at <= now for r in reservations):
+        db.session.rollback()
+        raise OrderPlacementError("Reservation not found, expired or already used.", 409)
+
+    checkout = create_checkout(customer_id, merge_quantities((r.product_id, r.quantity) for r in reservations),
+                               commit=False)
+    for reservation in reservations:
+        reservation.status = "confirmed"
+        reservation.checkout_id = checkout.id
+    if commit:
+        db.session.commit()
+    else:
+        db.session.flush()
+    return checkout
+
+
+def release_reservations(customer_id, reservation_ids):
+    """Give held stock back early. Returns the ids that were released (others were not held)."""
+    reservations = _lock_held(customer_id, set(reservation_ids))
+    if reservations:
+        for reservation in reservations:
+            reservation.status = "released"
+        restore_stock_many(merge_quantities((r.product_id, r.quantity) for r in reservations))
+    db.session.commit()
+    return [reservation.id for reservation in reservations]
+
+
+def sweep_expired_reservations(batch_size=500, now=None):
+    """Expire held reservations past their TTL in batches, returning their stock. Returns the count.
+
+    Each batch is the oldest expired holds taken from the (status, expires_at) index with
+    SKIP LOCKED, so a checkout confirming one of them is never waited on, and commits on
+    its own to keep lock time short.
+    """
+    now = now or datetime.utcnow()
+    total = 0
+    while True:
+        rows = db.session.query(StockReservation.id, StockReservation.product_id, StockReservation.quantity) \
+            .filter(StockReservation.status == "held", StockReservation.expires_at <= now) \
+            .order_by(StockReservation.expires_at).limit(batch_size) \
+            .with_for_update(skip_locked=True).all()
+        if not rows:
+            break
+        result = db.session.execute(
+            update(StockReservation)
+            .where(StockReservation.id.in_([row.id for row in rows]), StockReservation.status == "held")
+            .values(status="expired")
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(rows):  # Only without row locks (SQLite): a row changed under us, retry
+            db.session.rollback()
+            continue
+        restore_stock_many(merge_quantities((row.product_id, row.quantity) for row in rows))
+        db.session.commit()
+        total += len(rows)
+        if len(rows) < batch_size:
+            break
+    return total
+
+
+def reserved_units(product_ids):
+    """Units currently held per product, read from the (product_id, status, quantity) index."""
+    if not product_ids:
+        return {}
+    return dict(db.session.query(StockReservation.product_id, func.sum(StockReservation.quantity))
+                .filter(StockReservation.product_id.in_(product_ids), StockReservation.status == "held")
+                .group_by(StockReservation.product_id).all())
+
+
+# Started by the first reservation request a process serves; `flask orders sweep-reservations` does the same from cron
+reservation_sweeper = PeriodicTask(
+    "reservation_sweeper",
+    lambda app: sweep_expired_reservations(app.config.get("RESERVATION_SWEEP_BATCH", 500)),
+    interval_key="RESERVATION_SWEEP_INTERVAL", default_interval=15
+)
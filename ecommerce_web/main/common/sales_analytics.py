@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from main.database.models import SalesRollupDaily
+from main.common.pagination import parse_datetime_arg
+from main.extension import db
+
+DEFAULT_RANGE_DAYS = 30
+MAX_RANGE_DAYS = 366
+EXCLUDED_STATUSES = ("Cancelled",)  # Left out of sales unless asked for by status
+
+# group_by name -> rollup column
+SALES_GROUPS = {
+    "day": SalesRollupDaily.day,
+    "provider": SalesRollupDaily.provider_id,
+    "product": SalesRollupDaily.product_id,
+}
+
+
+def parse_sales_range(args):
+    """Read date_from/date_to (inclusive days) from query args, defaulting to the last 30 days. Raises ValueError."""
+    try:
+        date_to = parse_datetime_arg(args.get("date_to"))
+        date_from = parse_datetime_arg(args.get("date_from"))
+    except ValueError:
+        raise ValueError("Dates must be formatted as YYYY-MM-DD.")
+    date_to = date_to.date() if date_to else datetime.utcnow().date()
+    date_from = date_from.date() if date_from else date_to - timedelta(days=DEFAULT_RANGE_DAYS - 1)
+    if date_from > date_to:
+        raise ValueError("date_from must not be after date_to.")
+    if (date_to - date_from).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"The date range may span at most {MAX_RANGE_DAYS} days.")
+    return date_from, date_to
+
+
+def sales_report(args, group_by, provider_id=None):
+    """Orders, units and revenue grouped by day, provider or product, read only from the daily rollups.
+
+    Optional query args: date_from, date_to, product_id, status (otherwise cancelled orders are
+    excluded). Raises ValueError on bad input.
+    """
+    if group_by not in SALES_GROUPS:
+        raise ValueError(f"group_by must be one of: {', '.join(SALES_GROUPS)}.")
+    date_from, date_to = parse_sales_range(args)
+
+    conditions = [SalesRollupDaily.day >= date_from, SalesRollupDaily.day <= date_to]
+    if provider_id is not None:
+        conditions.append(SalesRollupDaily.provider_id == int(provider_id))
+    try:
+        if args.get("provider_id") and provider_id is None:
+            conditions.append(SalesRollupDaily.provider_id == int(args["provider_id"]))
+        if args.get("product_id"):
+            conditions.append(SalesRollupDaily.product_id == int(args["product_id"]))
+    except ValueError:
+        raise ValueError("Provider ID and Product ID must be integers.")
+    if args.get("status"):
+        conditions.append(SalesRollupDaily.status == args["status"])
+    else:
+        conditions.append(SalesRollupDaily.status.notin_(EXCLUDED_STATUSES))
+
+    column = SALES_GROUPS[group_by]
+    rows = db.session.query(column, func.sum(SalesRollupDaily.order_count), func.sum(SalesRollupDaily.units),
+                            func.sum(SalesRollupDaily.revenue)) \
+        .filter(*conditions).group_by(column).order_by(column).all()
+
+    data = [{
+        group_by: key.isoformat() if group_by == "day" else key,
+        "orders": int(orders or 0),
+        "units": int(units or 0),
+        "revenue": round(float(revenue or 0), 2)
+    } for key, orders, units, revenue in rows if orders]
+    return {
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "group_by": group_by,
+        "rows": data,
+        "totals": {
+            "orders": sum(row["orders"] for row in data),
+            "units": sum(row["units"] for row in data),
+            "revenue": round(sum(row["revenue"] for row in data), 2)
+        }
+    }
@@ -0,0 +1,195 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+import numpy as np
+from sqlalchemy import select, func
+from main.database.models import Order, Product
+from main.common.model_events import on_order_commit
+from main.common.order_counters import DEFAULT_STATUS
+from main.common.sales_analytics import parse_sales_range, EXCLUDED_STATUSES
+from main.common.sql_utils import seconds_since
+from main.extension import db
+
+# granularity -> bucket width in seconds
+GRANULARITIES = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+DEFAULT_WINDOW = 7  # Buckets averaged by the moving average
+MAX_WINDOW = 90
+
+# Bucketed sales of one provider; orders/revenue leave out EXCLUDED_STATUSES, by_status counts every order
+SalesSeries = namedtuple("SalesSeries", "start step orders revenue statuses by_status")
+
+
+def series_start(date_from, granularity):
+    """First bucket boundary: midnight of date_from, moved back to Monday for weekly buckets."""
+    start = datetime(date_from.year, date_from.month, date_from.day)
+    if granularity == "week":
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def encode_statuses(values):
+    """Map status strings to int codes. Returns (sorted names, codes)."""
+    names = sorted(set(values))
+    index = {name: code for code, name in enumerate(names)}
+    return names, np.fromiter(map(index.__getitem__, values), dtype=np.int16, count=len(values))
+
+
+def fetch_sales_buckets(provider_id, start, end, step):
+    """A provider's orders in [start, end) as (bucket, status, orders, revenue) rows, grouped in one query.
+
+    The range scan uses the (product_id, created_at) order index and the query returns at most
+    buckets x statuses rows, so no per-order object is built in Python. Revenue uses the unit
+    price snapshotted at order time, falling back to the current price for older rows.
+    """
+    bucket = (seconds_since(Order.created_at, start) // step).label("bucket")
+    status = func.coalesce(Order.status, DEFAULT_STATUS).label("order_status")
+    stmt = select(bucket, status, func.count(Order.id),
+                  func.sum(Order.quantity * func.coalesce(Order.unit_price, Product.price))) \
+        .join(Product, Product.id == Order.product_id) \
+        .where(Product.provider_id == provider_id, Order.created_at >= start, Order.created_at < end) \
+        .group_by("bucket", "order_status")
+    return db.session.execute(stmt).all()
+
+
+def bucket_sales(rows, start, step, buckets):
+    """Scatter grouped (bucket, status, orders, revenue) rows into dense per-bucket arrays with bincount."""
+    if not rows:
+        return SalesSeries(start, step, np.zeros(buckets, dtype=np.int64), np.zeros(buckets), [],
+                           np.zeros((buckets, 0), dtype=np.int64))
+    bucket_ids, statuses, counts, revenue = zip(*rows)
+    names, codes = encode_statuses(statuses)
+    bucket_ids = np.array(bucket_ids, dtype=np.int64)
+    counts = np.array(counts, dtype=np.float64)
+    revenue = np.array(revenue, dtype=np.float64)
+
+    by_status = np.bincount(bucket_ids * len(names) + codes, weights=counts, minlength=buckets * len(names)) \
+        .astype(np.int64).reshape(buckets, len(names))
+    counted = ~np.isin(codes, [code for code, name in enumerate(names) if name in EXCLUDED_STATUSES])
+    orders = np.bincount(bucket_ids[counted], weights=counts[counted], minlength=buckets).astype(np.int64)
+    revenue = np.bincount(bucket_ids[counted], weights=revenue[counted], minlength=buckets)
+    return SalesSeries(start, step, orders, revenue, names, by_status)
+
+
+def moving_average(values, window):
+    """Trailing mean over `window` buckets (fewer at the start of the series)."""
+    sums = np.cumsum(values)
+    sums[window:] = sums[window:] - sums[:-window]
+    return sums / np.minimum(np.arange(1, len(values) + 1), window)
+
+
+class SalesSeriesCache:
+    """Bounded LRU cache of bucketed SalesSeries keyed by (provider_id, date_from, date_to, granularity).
+
+    A commit that places, updates or deletes a provider's orders drops that provider's entries
+    in this process. A per-provider generation keeps a series computed before such a commit
+    from being stored after it, and the TTL bounds staleness from orders taken by other processes.
+    """
+
+    def __init__(self, max_size=256, ttl_seconds=60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.max_size = app.config.get("SALES_SERIES_CACHE_SIZE", self.max_size)
+        self.ttl_seconds = app.config.get("SALES_SERIES_CACHE_TTL", self.ttl_seconds)
+        self.clear()
+
+    def generation(self, provider_id):
+        with self._lock:
+            return self._generations.get(provider_id, 0)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                series, stored_at = entry
+                if time.monotonic() - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    return series
+                del self._entries[key]
+            return None
+
+    def put(self, key, series, generation):
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                return  # The provider's orders changed while this series was computed
+            self._entries[key] = (series, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, provider_ids):
+        with self._lock:
+            for provider_id in provider_ids:
+                self._generations[provider_id] = self._generations.get(provider_id, 0) + 1
+            for key in [key for key in self._entries if key[0] in provider_ids]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # Commit hook
+    def apply_order_changes(self, changes):
+        self.invalidate({change.provider_id for change in changes if change.provider_id is not None})
+
+
+sales_series_cache = SalesSeriesCache()
+on_order_commit(sales_series_cache.apply_order_changes)
+
+
+def provider_sales_series(provider_id, date_from, date_to, granularity):
+    """Bucketed sales for a provider over whole days date_from..date_to, from the cache or one fetch."""
+    key = (provider_id, date_from, date_to, granularity)
+    series = sales_series_cache.get(key)
+    if series is None:
+        generation = sales_series_cache.generation(provider_id)
+        start = series_start(date_from, granularity)
+        end = datetime(date_to.year, date_to.month, date_to.day) + timedelta(days=1)
+        step = GRANULARITIES[granularity]
+        buckets = -(-int((end - start).total_seconds()) // step)
+        series = bucket_sales(fetch_sales_buckets(provider_id, start, end, step), start, step, buckets)
+        sales_series_cache.put(key, series, generation)
+    return series
+
+
+def sales_timeseries(provider_id, args):
+    """Chart-ready sales series for a provider. Raises ValueError on bad input.
+
+    Query args: granularity (hour, day or week), window (buckets in the moving average),
+    date_from and date_to. Every list is aligned with `buckets`.
+    """
+    granularity = args.get("granularity", "day")
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}.")
+    try:
+        window = int(args.get("window", DEFAULT_WINDOW))
+    except ValueError:
+        raise ValueError("window must be an integer.")
+    if not 1 <= window <= MAX_WINDOW:
+        raise ValueError(f"window must be between 1 and {MAX_WINDOW}.")
+    date_from, date_to = parse_sales_range(args)
+
+    series = provider_sales_series(int(provider_id), date_from, date_to, granularity)
+    label = "%Y-%m-%d %H:%M:%S" if granularity == "hour" else "%Y-%m-%d"
+    return {
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "granularity": granularity,
+        "window": window,
+        "buckets": [(series.start + timedelta(seconds=i * series.step)).strftime(label)
+                    for i in range(len(series.orders))],
+        "orders": series.orders.tolist(),
+        "revenue": np.round(series.revenue, 2).tolist(),
+        "revenue_moving_average": np.round(moving_average(series.revenue, window), 2).tolist(),
+        "cumulative_revenue": np.round(np.cumsum(series.revenue), 2).tolist(),
+        "by_status": {name: series.by_status[:, i].tolist() for i, name in enumerate(series.statuses)},
+        "totals": {
+            "orders": int(series.orders.sum()),
+            "revenue": round(float(series.revenue.sum()), 2)
+        }
+    }
@@ -0,0 +1,72 @@
+import threading
+import time
+
+
+class SnapshotCache:
+    """Holds one computed value for `ttl_seconds`, refreshed by a single caller at a time.
+
+    When the snapshot goes stale, the first caller recomputes it while concurrent callers
+    keep getting the stale copy instead of piling onto the database; only when there is no
+    snapshot yet do they wait, and then they share the one result.
+    """
+
+    def __init__(self, name, compute, ttl_key, default_ttl):
+        self.name = name
+        self.compute = compute
+        self.ttl_key = ttl_key
+        self.ttl_seconds = default_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self._snapshot = None  # (value, computed_at)
+        self._refresh_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.ttl_seconds = app.config.get(self.ttl_key, self.ttl_seconds)
+        app.extensions[self.name] = self
+        self.clear()
+
+    def _fresh(self, snapshot):
+        return snapshot is not None and time.monotonic() - snapshot[1] < self.ttl_seconds
+
+    def _count(self, attribute):
+        with self._stats_lock:
+            setattr(self, attribute, getattr(self, attribute) + 1)
+
+    def get(self):
+        snapshot = self._snapshot
+        if self._fresh(snapshot):
+            self._count("hits")
+            return snapshot[0]
+        if snapshot is not None and not self._refresh_lock.acquire(blocking=False):
+            self._count("stale_hits")  # Another caller is already refreshing
+            return snapshot[0]
+        if snapshot is None:
+            self._refresh_lock.acquire()
+
+        try:
+            snapshot = self._snapshot
+            if self._fresh(snapshot):  # Refreshed while we waited for the lock
+                self._count("hits")
+                return snapshot[0]
+            value = self.compute()
+            self._snapshot = (value, time.monotonic())
+            self._count("refreshes")
+            return value
+        finally:
+            self._refresh_lock.release()
+
+    def clear(self):
+        self._snapshot = None
+
+    def stats(self):
+        with self._stats_lock:
+            snapshot = self._snapshot
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "age_seconds": round(time.monotonic() - snapshot[1], 3) if snapshot else None,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "refreshes": self.refreshes
+            }
@@ -0,0 +1,53 @@
+from datetime import datetime
+from sqlalchemy import insert, func, cast, extract, literal_column, Integer
+from main.extension import db
+
+
+def _dialect(connection=None):
+    return (connection or db.session.get_bind()).dialect.name
+
+
+def insert_ignore(table, connection=None):
+    """INSERT that skips rows hitting a unique key instead of failing the statement."""
+    dialect = _dialect(connection)
+    if dialect == "mysql":
+        return insert(table).prefix_with("IGNORE")
+    if dialect == "sqlite":
+        return insert(table).prefix_with("OR IGNORE")
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(table).on_conflict_do_nothing()
+    raise NotImplementedError(f"insert_ignore is not supported on {dialect}")
+
+
+def upsert_add(table, key_columns, add_columns, connection=None):
+    """INSERT that, on a duplicate key, adds the new values of add_columns to the existing row.
+
+    Execute it with a list of row dicts to apply many counter deltas in one round trip.
+    """
+    dialect = _dialect(connection)
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(table)
+        return stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in add_columns})
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(table)
+        return stmt.on_conflict_do_update(index_elements=list(key_columns),
+                                          set_={c: table.c[c] + stmt.excluded[c] for c in add_columns})
+    raise NotImplementedError(f"upsert_add is not supported on {dialect}")
+
+
+def seconds_since(column, start, connection=None):
+    """Integer SQL expression for the whole seconds from the naive datetime `start` to a DATETIME column."""
+    dialect = _dialect(connection)
+    if dialect == "mysql":
+        return func.timestampdiff(literal_column("SECOND"), start, column, type_=Integer)
+    if dialect == "sqlite":
+        return cast(func.strftime("%s", column), Integer) - int((start - datetime(1970, 1, 1)).total_seconds())
+    if dialect == "postgresql":
+        return cast(func.floor(extract("epoch", column - start)), Integer)
+    raise NotImplementedError(f"seconds_since is not supported on {dialect}")
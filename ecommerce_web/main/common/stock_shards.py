@@ -0,0 +1,207 @@
+import random
+import threading
+import time
+from sqlalchemy import update, select, func, case, and_, or_, exists
+from main.database.models import Product, ProductStockShard
+from main.common.periodic_task import PeriodicTask
+from main.extension import db
+
+SHARD_PICK_ATTEMPTS = 3  # Random shards tried before falling back to the base row
+
+
+class ShardRegistry:
+    """Per-process map of sharded product ids to their shard count.
+
+    Reloaded from the product table every `refresh_seconds` (one indexed read of the few
+    flagged products), so the order path can tell a sharded product apart without reading,
+    let alone locking, its hot Product row. A stale entry only costs a fallback: both stock
+    paths end on the base row, and a failed base decrement refreshes the entry.
+    """
+
+    def __init__(self, refresh_seconds=30):
+        self.refresh_seconds = refresh_seconds
+        self._counts = {}
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.refresh_seconds = app.config.get("STOCK_SHARD_REFRESH", self.refresh_seconds)
+        self._loaded_at = None
+
+    def _reload(self):
+        counts = dict(db.session.query(Product.id, Product.stock_shards)
+                      .filter(Product.stock_shards > 0, Product.is_deleted == False))  # noqa: E712
+        with self._lock:
+            self._counts = counts
+            self._loaded_at = time.monotonic()
+
+    def shard_count(self, product_id):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+            self._reload()
+        return self._counts.get(product_id, 0)
+
+    def refresh(self, product_id):
+        """Re-read one product's shard count, e.g. after its base row came up short."""
+        shards = db.session.query(Product.stock_shards).filter(
+            Product.id == product_id, Product.is_deleted == False).scalar() or 0  # noqa: E712
+        with self._lock:
+            if shards:
+                self._counts[product_id] = shards
+            else:
+                self._counts.pop(product_id, None)
+        return shards
+
+    def sharded_ids(self):
+        with self._lock:
+            return list(self._counts)
+
+
+shard_registry = ShardRegistry()
+
+
+def take_from_shard(product_id, quantity):
+    """Decrement one randomly chosen shard that still has `quantity` units. Returns True on success.
+
+    Candidates come from a plain (non-locking) read; the conditional UPDATE then touches a
+    single shard row, so concurrent orders spread their row locks over the shards.
+    """
+    stock_shard_rebalancer.ensure_started()
+    for _ in range(SHARD_PICK_ATTEMPTS):
+        candidates = [shard for (shard,) in db.session.query(ProductStockShard.shard)
+                      .join(Product, Product.id == ProductStockShard.product_id)
+                      .filter(ProductStockShard.product_id == product_id, ProductStockShard.quantity >= quantity,
+                              Product.is_deleted == False)]  # noqa: E712
+        if not candidates:
+            return False
+        result = db.session.execute(
+            update(ProductStockShard)
+            .where(ProductStockShard.product_id == product_id,
+                   ProductStockShard.shard == random.choice(candidates),
+                   ProductStockShard.quantity >= quantity)
+            .values(quantity=ProductStockShard.quantity - quantity)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            return True
+    return False
+
+
+def take_across_shards(product_id, quantity):
+    """Slow path when no single row holds enough: lock the base row and every shard and take greedily."""
+    product = db.session.query(Product).filter(Product.id == product_id, Product.is_deleted == False) \
+        .with_for_update().first()  # noqa: E712
+    if not product:
+        return False
+    shards = ProductStockShard.query.filter_by(product_id=product_id) \
+        .order_by(ProductStockShard.shard).with_for_update().all()
+    if product.quantity + sum(shard.quantity for shard in shards) < quantity:
+        return False
+
+    remaining = quantity
+    for row in [product] + shards:
+        taken = min(row.quantity, remaining)
+        row.quantity -= taken
+        remaining -= taken
+        if not remaining:
+            break
+    db.session.flush()
+    return True
+
+
+def rebalance_product(product_id):
+    """Spread a sharded product's whole stock (base row included) evenly over its shards. Returns True if moved."""
+    product = db.session.query(Product).filter_by(id=product_id).with_for_update().first()
+    shards = ProductStockShard.query.filter_by(product_id=product_id) \
+        .order_by(ProductStockShard.shard).with_for_update().all()
+    if not product or not shards:
+        db.session.rollback()
+        return False
+
+    quantities = [shard.quantity for shard in shards]
+    total = product.quantity + sum(quantities)
+    even, extra = divmod(total, len(shards))
+    target = [even + 1 if i < extra else even for i in range(len(shards))]
+    if product.quantity == 0 and max(quantities) - min(quantities) <= 1:
+        db.session.rollback()  # Already balanced: release the locks without writing
+        return False
+
+    product.quantity = 0
+    for shard, quantity in zip(shards, target):
+        shard.quantity = quantity
+    db.session.commit()
+    return True
+
+
+def rebalance_stock_shards():
+    """Rebalance every sharded product, one short transaction each. Returns the number rebalanced."""
+    product_ids = [product_id for (product_id,) in db.session.query(Product.id)
+                   .filter(Product.stock_shards > 0, Product.is_deleted == False)]  # noqa: E712
+    return sum(1 for product_id in product_ids if rebalance_product(product_id))
+
+
+def configure_stock_shards(product_id, shards):
+    """Split a product's stock over `shards` sub-rows, or fold it back into Product.quantity with 0."""
+    product = db.session.query(Product).filter_by(id=product_id, is_deleted=False).with_for_update().first()
+    if not product:
+        raise ValueError("Product not found.")
+
+    existing = ProductStockShard.query.filter_by(product_id=product_id).with_for_update().all()
+    product.quantity += sum(shard.quantity for shard in existing)
+    for shard in existing:
+        db.session.delete(shard)
+    db.session.flush()
+    db.session.add_all([ProductStockShard(product_id=product_id, shard=i, quantity=0) for i in range(shards)])
+    product.stock_shards = shards
+    db.session.commit()
+
+    shard_registry.refresh(product_id)
+    if shards:
+        rebalance_product(product_id)
+
+
+def clear_shards(product_id):
+    """Zero a product's shards, e.g. before a provider overwrites its total stock on the base row."""
+    db.session.execute(
+        update(ProductStockShard)
+        .where(ProductStockShard.product_id == product_id)
+        .values(quantity=0)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def stock_levels(product_ids):
+    """Total stock per product (base row plus shards) with one grouped query."""
+    if not product_ids:
+        return {}
+    rows = db.session.query(Product.id, Product.quantity + func.coalesce(func.sum(ProductStockShard.quantity), 0)) \
+        .outerjoin(ProductStockShard, ProductStockShard.product_id == Product.id) \
+        .filter(Product.id.in_(product_ids)).group_by(Product.id, Product.quantity).all()
+    return {product_id: int(quantity) for product_id, quantity in rows}
+
+
+def total_stock():
+    """SQL expression for a product's total stock; the shards are only summed for sharded products."""
+    shard_sum = select(func.coalesce(func.sum(ProductStockShard.quantity), 0)) \
+        .where(ProductStockShard.product_id == Product.id).scalar_subquery()
+    return case((Product.stock_shards > 0, Product.quantity + shard_sum), else_=Product.quantity)
+
+
+def in_stock_ids(products):
+    """Ids of the given Product rows that have stock; only sharded ones need a query."""
+    sharded = [product.id for product in products if product.stock_shards and product.quantity <= 0]
+    levels = stock_levels(sharded)
+    return {product.id for product in products if product.quantity > 0 or levels.get(product.id, 0) > 0}
+
+
+def in_stock_filter():
+    """SQL filter for products with stock on the base row or on any shard."""
+    return or_(Product.quantity > 0, and_(
+        Product.stock_shards > 0,
+        exists().where(ProductStockShard.product_id == Product.id, ProductStockShard.quantity > 0)
+    ))
+
+
+stock_shard_rebalancer = PeriodicTask(
+    "stock_shard_rebalancer", lambda app: rebalance_stock_shards(),
+    interval_key="STOCK_SHARD_REBALANCE_INTERVAL", default_interval=30
+)
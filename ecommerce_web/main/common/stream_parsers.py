@@ -0,0 +1,74 @@
+import codecs
+import csv
+import io
+import json
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def iter_csv_rows(stream, encoding="utf-8"):
+    """Yield dicts from a CSV upload (header row required) without buffering the whole body."""
+    text = io.TextIOWrapper(stream, encoding=encoding, newline="")
+    try:
+        for row in csv.DictReader(text):
+            yield {k.strip() if isinstance(k, str) else k: v.strip() if isinstance(v, str) else v
+                   for k, v in row.items()}
+    finally:
+        text.detach()  # Leave the request stream open for the WSGI server
+
+
+def iter_json_array(stream, encoding="utf-8"):
+    """Yield the elements of a top-level JSON array, decoding incrementally from a byte stream.
+
+    Raises ValueError if the body is not a JSON array, including a missing, doubled or
+    trailing comma between elements.
+    """
+    decoder = json.JSONDecoder()
+    reader = codecs.getincrementaldecoder(encoding)()
+    buffer = ""
+    pos = 0
+    expect = "open"  # open -> first (element or "]") -> separator ("," or "]") -> element -> separator ...
+    eof = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n":
+            pos += 1
+
+        if pos < len(buffer):
+            char = buffer[pos]
+            if expect == "open":
+                if char != "[":
+                    raise ValueError("Request body must be a JSON array.")
+                expect = "first"
+                pos += 1
+                continue
+            if char == "]" and expect in ("first", "separator"):
+                return
+            if expect == "separator":
+                if char != ",":
+                    raise ValueError("Malformed JSON array: expected ',' or ']' after an element.")
+                expect = "element"
+                pos += 1
+                continue
+            if char in ",]":
+                raise ValueError("Malformed JSON array: expected an element.")
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError("Malformed JSON array.")
+                item = None  # Element is split across chunks; read more below
+            else:
+                # A number at the very end of the buffer may continue in the next chunk
+                if end < len(buffer) or eof or not isinstance(item, (int, float)):
+                    yield item
+                    pos = end
+                    expect = "separator"
+                    continue
+
+        if eof:
+            raise ValueError("Malformed JSON array.")
+        chunk = stream.read(READ_CHUNK_SIZE)
+        eof = not chunk
+        buffer = buffer[pos:] + reader.decode(chunk or b"", final=eof)
+        pos = 0
@@ -0,0 +1,466 @@
+import io
+import os
+import random
+import time
+from datetime import datetime
+from types import SimpleNamespace
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from main.common.pagination import parse_datetime_arg
+from main.common.jwt_utils import generate_token, decode_token, token_cache
+from main.v1.customer.invoice.invoice_backfill import backfill_invoices
+from main.v1.customer.invoice.invoice_generator import render_invoice_with_canvas, render_invoice
+
+invoices_cli = AppGroup("invoices", help="Invoice maintenance commands.")
+auth_cli = AppGroup("auth", help="Authentication maintenance commands.")
+catalog_cli = AppGroup("catalog", help="Product catalog commands.")
+search_cli = AppGroup("search", help="Product search index commands.")
+orders_cli = AppGroup("orders", help="Order and checkout commands.")
+analytics_cli = AppGroup("analytics", help="Sales rollup commands.")
+
+
+@invoices_cli.command("backfill")
+@click.option("--since", default=None, help="Only orders created on or after this date (YYYY-MM-DD).")
+@click.option("--batch-size", default=500, show_default=True, help="Orders fetched per joined query.")
+@click.option("--workers", default=None, type=int, help="Render processes (defaults to the CPU count).")
+@click.option("--checkpoint", "checkpoint_path", default=None,
+              help="Checkpoint file (defaults to invoice_backfill.json in the instance folder).")
+@click.option("--restart", is_flag=True, help="Ignore an existing checkpoint and start from the first order.")
+@click.option("--force", is_flag=True, help="Re-render invoices even if a cached copy is up to date.")
+def backfill_command(since, batch_size, workers, checkpoint_path, restart, force):
+    """Regenerate invoices for historical orders and checkouts in parallel, resuming an interrupted run."""
+    try:
+        since = parse_datetime_arg(since)
+    except ValueError:
+        raise click.BadParameter("Use YYYY-MM-DD or YYYY-MM-DD HH:MM:SS.", param_hint="--since")
+
+    if not checkpoint_path:
+        os.makedirs(current_app.instance_path, exist_ok=True)
+        checkpoint_path = os.path.join(current_app.instance_path, "invoice_backfill.json")
+    if restart and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    try:
+        checkpoint = backfill_invoices(since=since, batch_size=batch_size, workers=workers,
+                                       checkpoint_path=checkpoint_path, force=force, report=click.echo)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Done: {checkpoint['rendered']} rendered, {checkpoint['failed']} failed "
+               f"(last order {checkpoint['last_order_id']}, last checkout {checkpoint['last_checkout_id']}).")
+
+
+@invoices_cli.command("benchmark")
+@click.option("--count", default=2000, show_default=True, help="Invoices rendered per renderer.")
+def benchmark_command(count):
+    """Compare invoices/sec of the canvas renderer and the pre-built template renderer (in memory)."""
+    samples = [(
+        SimpleNamespace(id=i, customer_id=i % 997, status="Pending", created_at=datetime(2025, 1, 1), unit_price=None),
+        SimpleNamespace(id=i % 101, provider_id=i % 13, name=f"Product {i}", price=i * 1.25,
+                        description="Benchmark product description")
+    ) for i in range(1, count + 1)]
+
+    def run(render):
+        started = time.perf_counter()
+        for order, product in samples:
+            render(order, product)
+        return count / (time.perf_counter() - started)
+
+    canvas_rate = run(lambda order, product: render_invoice_with_canvas(order, product, io.BytesIO()))
+    template_rate = run(lambda order, product: render_invoice(order, product, buffer=io.BytesIO()))
+
+    click.echo(f"canvas:   {canvas_rate:,.0f} invoices/sec")
+    click.echo(f"template: {template_rate:,.0f} invoices/sec ({template_rate / canvas_rate:.1f}x)")
+
+
+@auth_cli.command("benchmark")
+@click.option("--requests", "request_count", default=50000, show_default=True, help="Token checks per run.")
+@click.option("--tokens", "token_count", default=100, show_default=True, help="Distinct tokens reused by clients.")
+def auth_benchmark_command(request_count, token_count):
+    """Measure per-request token verification overhead with and without the claims cache."""
+    tokens = [generate_token(identity=str(i), role="2") for i in range(token_count)]
+
+    def run():
+        started = time.perf_counter()
+        for i in range(request_count):
+            decode_token(tokens[i % token_count])
+        return (time.perf_counter() - started) * 1e6 / request_count
+
+    max_size = token_cache.max_size
+    token_cache.clear()
+    token_cache.max_size = 0  # Every lookup misses and runs jwt.decode
+    uncached = run()
+    token_cache.max_size = max_size
+    token_cache.clear()
+    cached = run()
+
+    click.echo(f"jwt.decode every request: {uncached:.2f} us/request")
+    click.echo(f"verified-claims cache:    {cached:.2f} us/request ({uncached / cached:.1f}x)")
+    click.echo(f"cache stats: {token_cache.stats()}")
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+@catalog_cli.command("benchmark")
+@click.option("--requests", "request_count", default=500, show_default=True, help="Catalog requests to time.")
+@click.option("--pages", default=3, show_default=True, help="Pages followed per request via next_cursor.")
+def catalog_benchmark_command(request_count, pages):
+    """Report p50/p95/p99 latency of the catalog endpoint over random filters, sorts and pages."""
+    from main.database.models import Product
+    from main.extension import db
+
+    provider_ids = [pid for (pid,) in db.session.query(Product.provider_id).distinct().limit(100)]
+    max_price = db.session.query(db.func.max(Product.price)).scalar() or 100
+    client = current_app.test_client()
+    latencies = []
+
+    for _ in range(request_count):
+        params = {"sort": random.choice(["price_asc", "price_desc", "newest"]), "limit": 50}
+        if provider_ids and random.random() < 0.5:
+            params["provider_id"] = random.choice(provider_ids)
+        if random.random() < 0.5:
+            params["min_price"] = round(random.uniform(0, max_price / 2), 2)
+            params["max_price"] = round(params["min_price"] + random.uniform(0, max_price / 2), 2)
+        if random.random() < 0.5:
+            params["in_stock"] = "true"
+
+        for _ in range(pages):
+            started = time.perf_counter()
+            response = client.get("/api/v1/customer/catalog/products", query_string=params)
+            latencies.append((time.perf_counter() - started) * 1000)
+            cursor = response.get_json().get("next_cursor")
+            if not cursor:
+                break
+            params["after"] = cursor
+
+    click.echo(f"{len(latencies)} requests: p50 {percentile(latencies, 50):.2f} ms, "
+               f"p95 {percentile(latencies, 95):.2f} ms, p99 {percentile(latencies, 99):.2f} ms")
+
+
+@search_cli.command("rebuild")
+def search_rebuild_command():
+    """Rebuild the product search index from the product table."""
+    from main.common.product_search import product_search
+
+    started = time.perf_counter()
+    product_search.rebuild()
+    click.echo(f"Rebuilt {product_search.backend.name} search index in {time.perf_counter() - started:.2f}s.")
+
+
+@catalog_cli.command("autocomplete-benchmark")
+@click.option("--products", "product_count", default=1000000, show_default=True, help="Synthetic catalog size.")
+@click.option("--lookups", default=20000, show_default=True, help="Prefix lookups to time.")
+def autocomplete_benchmark_command(product_count, lookups):
+    """Report memory use and lookup latency of the autocomplete index on a synthetic catalog."""
+    import gc
+    import tracemalloc
+    from main.common.product_autocomplete import ProductAutocomplete
+
+    words = ["red", "blue", "running", "shoe", "shirt", "cotton", "leather", "wallet", "phone", "case",
+             "wireless", "headphones", "steel", "bottle", "garden", "chair", "lamp", "desk", "kids", "toy"]
+    rng = random.Random(42)
+    rows = [(i, " ".join(rng.choice(words) for _ in range(rng.randint(2, 4))) + f" {i}", rng.randint(0, 5000))
+            for i in range(1, product_count + 1)]
+
+    gc.collect()
+    tracemalloc.start()
+    index = ProductAutocomplete()
+    started = time.perf_counter()
+    index.rebuild(iter(rows))
+    build_seconds = time.perf_counter() - started
+    gc.collect()
+    memory_mb = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+
+    prefixes = [rng.choice(words)[:rng.randint(1, 4)] + ("" if rng.random() < 0.5 else " " + rng.choice(words)[:2])
+                for _ in range(lookups)]
+    latencies = []
+    for prefix in prefixes:
+        started = time.perf_counter()
+        index.suggest(prefix, 10)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    click.echo(f"{product_count:,} products: index {memory_mb:,.1f} MiB, built in {build_seconds:.2f}s")
+    click.echo(f"{lookups:,} lookups: p50 {percentile(latencies, 50):.3f} ms, "
+               f"p99 {percentile(latencies, 99):.3f} ms, max {max(latencies):.3f} ms")
+
+
+@orders_cli.command("checkout-benchmark")
+@click.option("--customer-id", required=True, type=int, help="Customer placing the orders.")
+@click.option("--carts", default=200, show_default=True, help="Carts bought per mode.")
+@click.option("--items", "item_count", default=5, show_default=True, help="Distinct products per cart.")
+@click.option("--threads", default=8, show_default=True, help="Concurrent clients.")
+def checkout_benchmark_command(customer_id, carts, item_count, threads):
+    """Compare buying carts as one order per item against a single checkout per cart.
+
+    Places real orders and takes real stock: run it against a disposable database.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from main.database.models import Product
+    from main.extension import db
+
+    product_ids = [pid for (pid,) in db.session.query(Product.id)
+                   .filter(Product.is_deleted == False, Product.quantity >= carts * 2)  # noqa: E712
+                   .limit(item_count * 10)]
+    if len(product_ids) < item_count:
+        raise click.ClickException(f"Need at least {item_count} products with {carts * 2} units in stock.")
+    db.session.remove()
+
+    headers = {"Authorization": f"Bearer {generate_token(identity=str(customer_id), role='2')}"}
+    client = current_app.test_client()
+
+    def per_item(cart):
+        return all(client.post("/api/v1/customer/order", json={"product_id": pid}, headers=headers).status_code == 201
+                   for pid in cart)
+
+    def batched(cart):
+        items = [{"product_id": pid, "quantity": 1} for pid in cart]
+        return client.post("/api/v1/customer/checkout", json={"items": items}, headers=headers).status_code == 201
+
+    def run(buy):
+        latencies = []
+
+        def timed(cart):
+            started = time.perf_counter()
+            ok = buy(cart)
+            latencies.append((time.perf_counter() - started) * 1000)
+            return ok
+
+        cart_list = [random.sample(product_ids, item_count) for _ in range(carts)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            succeeded = sum(pool.map(timed, cart_list))
+        elapsed = time.perf_counter() - started
+        return succeeded, carts / elapsed, latencies
+
+    for label, buy in (("per-item orders", per_item), ("batched checkout", batched)):
+        succeeded, rate, latencies = run(buy)
+        click.echo(f"{label:17} {succeeded}/{carts} carts, {rate:,.1f} carts/sec, {rate * item_count:,.0f} items/sec, "
+                   f"p50 {percentile(latencies, 50):.1f} ms, p99 {percentile(latencies, 99):.1f} ms per cart")
+
+
+@orders_cli.command("sweep-reservations")
+@click.option("--batch-size", default=None, type=int, help="Reservations expired per transaction.")
+def sweep_reservations_command(batch_size):
+    """Expire stock reservations past their TTL and return their stock."""
+    from main.common.reservation_service import sweep_expired_reservations
+
+    expired = sweep_expired_reservations(batch_size or current_app.config["RESERVATION_SWEEP_BATCH"])
+    click.echo(f"Expired {expired} reservation(s).")
+
+
+@catalog_cli.command("shard-stock")
+@click.argument("product_id", type=int)
+@click.argument("shards", type=int)
+def shard_stock_command(product_id, shards):
+    """Split a hot product's stock over SHARDS counter rows (0 folds it back into one row)."""
+    from main.common.stock_shards import configure_stock_shards
+
+    try:
+        configure_stock_shards(product_id, shards)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"Product {product_id} now uses {shards or 'no'} stock shard(s).")
+
+
+@catalog_cli.command("rebalance-stock")
+def rebalance_stock_command():
+    """Spread the stock of every sharded product evenly over its shards."""
+    from main.common.stock_shards import rebalance_stock_shards
+
+    click.echo(f"Rebalanced {rebalance_stock_shards()} product(s).")
+
+
+@catalog_cli.command("stock-shard-benchmark")
+@click.option("--product-id", required=True, type=int, help="Product ordered by every client.")
+@click.option("--customer-id", required=True, type=int, help="Customer placing the orders.")
+@click.option("--shards", default=16, show_default=True, help="Shard count compared against a single row.")
+@click.option("--orders", "order_count", default=2000, show_default=True, help="Orders placed per mode.")
+@click.option("--threads", default=32, show_default=True, help="Concurrent clients.")
+def stock_shard_benchmark_command(product_id, customer_id, shards, order_count, threads):
+    """Measure orders/sec on one hot product with its stock in 1 row vs SHARDS rows.
+
+    Places real orders and rewrites the product's stock: run it against a disposable database.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from main.database.models import Product
+    from main.extension import db
+    from main.common.order_service import place_order, OrderPlacementError
+    from main.common.stock_shards import configure_stock_shards, clear_shards
+
+    app = current_app._get_current_object()
+    product = db.session.get(Product, product_id)
+    if not product:
+        raise click.ClickException("Product not found.")
+    original_shards = product.stock_shards
+
+    def set_stock(quantity, shard_count):
+        configure_stock_shards(product_id, 0)
+        clear_shards(product_id)
+        db.session.get(Product, product_id).quantity = quantity
+        db.session.commit()
+        configure_stock_shards(product_id, shard_count)
+
+    def worker(count):
+        placed = failed = 0
+        with app.app_context():
+            for _ in range(count):
+                try:
+                    place_order(customer_id=customer_id, product_id=product_id)
+                    placed += 1
+                except (OrderPlacementError, Exception):
+                    db.session.rollback()
+                    failed += 1
+            db.session.remove()
+        return placed, failed
+
+    for label, shard_count in (("1 row", 0), (f"{shards} shards", shards)):
+        set_stock(order_count, shard_count)
+        per_thread = [order_count // threads + (1 if i < order_count % threads else 0) for i in range(threads)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(worker, per_thread))
+        elapsed = time.perf_counter() - started
+        placed = sum(r[0] for r in results)
+        click.echo(f"{label:10} {placed / elapsed:,.0f} orders/sec ({placed} placed, "
+                   f"{sum(r[1] for r in results)} failed, {elapsed:.2f}s)")
+
+    configure_stock_shards(product_id, original_shards)
+
+
+@orders_cli.command("recount-providers")
+def recount_providers_command():
+    """Rebuild the per-provider order counters from the order table."""
+    from main.common.order_counters import recount_provider_orders
+
+    click.echo(f"Wrote {recount_provider_orders()} provider/status counter(s).")
+
+
+@analytics_cli.command("rebuild-days")
+@click.option("--date-from", required=True, help="First day to rebuild (YYYY-MM-DD).")
+@click.option("--date-to", default=None, help="Last day to rebuild (defaults to --date-from).")
+def rebuild_days_command(date_from, date_to):
+    """Recompute daily sales rollups from the order table, reporting days that had drifted."""
+    from datetime import timedelta
+    from main.common.order_counters import rebuild_sales_day
+
+    try:
+        first = parse_datetime_arg(date_from).date()
+        last = parse_datetime_arg(date_to).date() if date_to else first
+    except ValueError:
+        raise click.ClickException("Dates must be formatted as YYYY-MM-DD.")
+
+    day, drifted = first, 0
+    while day <= last:
+        before, after = rebuild_sales_day(day)
+        if before != after:
+            drifted += 1
+            click.echo(f"{day}: {before[0]} orders / {before[1]:.2f} -> {after[0]} orders / {after[1]:.2f}")
+        day += timedelta(days=1)
+    click.echo(f"Rebuilt {(last - first).days + 1} day(s), {drifted} had drifted.")
+
+
+@analytics_cli.command("timeseries-benchmark")
+@click.option("--provider-id", required=True, type=int, help="Provider the synthetic products belong to.")
+@click.option("--customer-id", required=True, type=int, help="Customer on the synthetic orders.")
+@click.option("--orders", "order_count", default=10000000, show_default=True, help="Synthetic orders inserted.")
+@click.option("--products", "product_count", default=50, show_default=True, help="Synthetic products ordered.")
+@click.option("--days", default=365, show_default=True, help="Days spanned by the orders (ending today).")
+@click.option("--granularity", default="hour", show_default=True, type=click.Choice(["hour", "day", "week"]))
+def timeseries_benchmark_command(provider_id, customer_id, order_count, product_count, days, granularity):
+    """Time the provider sales series over synthetic orders: row-by-row loop vs grouped fetch + NumPy vs cache.
+
+    Inserts the orders with Core (bypassing the rollup hooks) and deletes them, and the
+    synthetic products, at the end: run it against a disposable database.
+    """
+    import numpy as np
+    from datetime import timedelta
+    from sqlalchemy import select, delete, insert, func
+    from main.database.models import Order, Product
+    from main.extension import db
+    from main.common.sales_timeseries import GRANULARITIES, series_start, fetch_sales_buckets, bucket_sales, \
+        moving_average, provider_sales_series, sales_series_cache
+
+    rng = np.random.default_rng(0)
+    statuses = np.array(["Cancelled", "Delivered", "Pending", "Shipped"])
+    date_to = datetime.utcnow().date()
+    date_from = date_to - timedelta(days=days - 1)
+    start = series_start(date_from, granularity)
+    end = datetime(date_to.year, date_to.month, date_to.day) + timedelta(days=1)
+    step = GRANULARITIES[granularity]
+    buckets = -(-int((end - start).total_seconds()) // step)
+
+    products = [Product(name=f"Timeseries benchmark {i}", price=round(float(price), 2), quantity=0,
+                        provider_id=provider_id) for i, price in enumerate(rng.uniform(1, 500, product_count))]
+    db.session.add_all(products)
+    db.session.commit()
+    product_ids = np.array([product.id for product in products])
+    prices = {product.id: product.price for product in products}
+
+    started = time.perf_counter()
+    span = int((end - datetime(date_from.year, date_from.month, date_from.day)).total_seconds())
+    for offset in range(0, order_count, 50000):
+        size = min(50000, order_count - offset)
+        chosen = rng.choice(product_ids, size)
+        db.session.execute(insert(Order.__table__), [{
+            "customer_id": customer_id, "product_id": product_id, "quantity": quantity,
+            "unit_price": prices[product_id], "status": status, "created_at": end - timedelta(seconds=second + 1)
+        } for product_id, quantity, status, second in zip(
+            chosen.tolist(), rng.integers(1, 4, size).tolist(),
+            rng.choice(statuses, size, p=[0.05, 0.55, 0.25, 0.15]).tolist(), rng.integers(0, span, size).tolist())])
+        db.session.commit()
+    click.echo(f"Inserted {order_count:,} orders in {time.perf_counter() - started:.1f}s; "
+               f"{buckets:,} {granularity} buckets")
+
+    try:
+        # Every order through Python, as a per-row implementation would
+        started = time.perf_counter()
+        orders, revenue = [0] * buckets, [0.0] * buckets
+        stmt = select(Order.created_at, Order.quantity * func.coalesce(Order.unit_price, Product.price),
+                      Order.status).join(Product, Product.id == Order.product_id) \
+            .where(Product.provider_id == provider_id, Order.created_at >= start, Order.created_at < end) \
+            .execution_options(yield_per=50000)
+        for created_at, amount, status in db.session.execute(stmt):
+            if status != "Cancelled":
+                bucket = int((created_at - start).total_seconds()) // step
+                orders[bucket] += 1
+                revenue[bucket] += amount
+        moving_average(np.array(revenue), 7)
+        looped = time.perf_counter() - started
+
+        started = time.perf_counter()
+        series = bucket_sales(fetch_sales_buckets(provider_id, start, end, step), start, step, buckets)
+        moving_average(series.revenue, 7)
+        np.cumsum(series.revenue)
+        grouped = time.perf_counter() - started
+        if series.orders.tolist() != orders or not np.allclose(series.revenue, revenue):
+            raise click.ClickException("Grouped and row-by-row series disagree.")
+
+        sales_series_cache.clear()
+        provider_sales_series(provider_id, date_from, date_to, granularity)
+        started = time.perf_counter()
+        provider_sales_series(provider_id, date_from, date_to, granularity)
+        cached = time.perf_counter() - started
+    finally:
+        ids = product_ids.tolist()
+        db.session.execute(delete(Order).where(Order.product_id.in_(ids)).execution_options(synchronize_session=False))
+        db.session.execute(delete(Product).where(Product.id.in_(ids)).execution_options(synchronize_session=False))
+        db.session.commit()
+
+    click.echo(f"row by row        {looped:8.2f}s  ({order_count / looped:,.0f} orders/sec)")
+    click.echo(f"grouped + numpy   {grouped:8.2f}s  ({order_count / grouped:,.0f} orders/sec, "
+               f"{looped / grouped:.1f}x)")
+    click.echo(f"cache hit         {cached * 1000:8.3f} ms")
+
+
+def register_commands(app):
+    app.cli.add_command(invoices_cli)
+    app.cli.add_command(auth_cli)
+    app.cli.add_command(catalog_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(orders_cli)
+    app.cli.add_command(analytics_cli)
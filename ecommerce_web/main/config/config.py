@@ -8,3 +8,49 @@ class Config:
     JWT_SECRET_KEY = SECRET_KEY  # For JWT token handling
     SQLALCHEMY_DATABASE_URI = os.getenv("SQLALCHEMY_DATABASE_URI")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Background invoice generation
+    INVOICE_WORKER_THREADS = int(os.getenv("INVOICE_WORKER_THREADS", 2))
+    INVOICE_JOB_MAX_ATTEMPTS = int(os.getenv("INVOICE_JOB_MAX_ATTEMPTS", 3))
+    INVOICE_JOB_CLAIM_TIMEOUT = int(os.getenv("INVOICE_JOB_CLAIM_TIMEOUT", 300))  # Seconds before a stuck job is retried
+    INVOICE_JOB_RECOVERY_INTERVAL = int(os.getenv("INVOICE_JOB_RECOVERY_INTERVAL", 60))  # Seconds between stale-job scans
+
+    # Password hashing
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", 12))  # Existing hashes are upgraded on next login
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", 4))
+    BCRYPT_MAX_QUEUE = int(os.getenv("BCRYPT_MAX_QUEUE", 64))
+
+    # Verified JWT claims cache
+    JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", 10000))
+
+    # Product search backend: "mysql" (FULLTEXT), "memory" (in-process index) or "auto"
+    SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "auto")
+
+    # Stock reservations
+    RESERVATION_TTL = int(os.getenv("RESERVATION_TTL", 600))  # Seconds a reservation holds stock
+    RESERVATION_SWEEP_INTERVAL = int(os.getenv("RESERVATION_SWEEP_INTERVAL", 15))
+    RESERVATION_SWEEP_BATCH = int(os.getenv("RESERVATION_SWEEP_BATCH", 500))
+
+    # Sharded stock counters for hot products
+    STOCK_SHARD_REFRESH = int(os.getenv("STOCK_SHARD_REFRESH", 30))  # Seconds between reloads of the sharded set
+    STOCK_SHARD_REBALANCE_INTERVAL = int(os.getenv("STOCK_SHARD_REBALANCE_INTERVAL", 30))
+
+    # Provider sales time series (bucketed with NumPy)
+    SALES_SERIES_CACHE_SIZE = int(os.getenv("SALES_SERIES_CACHE_SIZE", 256))
+    SALES_SERIES_CACHE_TTL = int(os.getenv("SALES_SERIES_CACHE_TTL", 60))  # Seconds; bounds staleness across processes
+
+    # Admin dashboard summary snapshot
+    DASHBOARD_SUMMARY_TTL = int(os.getenv("DASHBOARD_SUMMARY_TTL", 15))  # Seconds a snapshot is served before refresh
+    LOW_STOCK_THRESHOLD = int(os.getenv("LOW_STOCK_THRESHOLD", 5))
+    LOW_STOCK_LIMIT = int(os.getenv("LOW_STOCK_LIMIT", 20))  # Low-stock products listed
+
+    # Provider notification streams (Server-Sent Events)
+    NOTIFICATION_POLL_INTERVAL = int(os.getenv("NOTIFICATION_POLL_INTERVAL", 2))  # Seconds between hub polls
+    NOTIFICATION_STREAM_QUEUE = int(os.getenv("NOTIFICATION_STREAM_QUEUE", 256))  # Buffered events per stream
+    NOTIFICATION_STREAM_HEARTBEAT = int(os.getenv("NOTIFICATION_STREAM_HEARTBEAT", 15))
+    NOTIFICATION_STREAM_MAX_SECONDS = int(os.getenv("NOTIFICATION_STREAM_MAX_SECONDS", 300))
+
+    # Order event notifications (write-behind)
+    NOTIFICATION_FLUSH_INTERVAL = float(os.getenv("NOTIFICATION_FLUSH_INTERVAL", 0.5))  # Seconds events are batched
+    NOTIFICATION_BATCH_SIZE = int(os.getenv("NOTIFICATION_BATCH_SIZE", 500))
+    NOTIFICATION_QUEUE_SIZE = int(os.getenv("NOTIFICATION_QUEUE_SIZE", 10000))  # Events beyond this are dropped
@@ -5,24 +5,31 @@ from main.v1.admin.auth.auth_resource import AdminRegistrationResource, AdminLog
 from main.v1.admin.auth.profile_resource import AdminProfileResource
 
 # Admin Dashboard Resources
-from main.v1.admin.dashboard.users.user_resource import UserListResource, UserResource
-from main.v1.admin.dashboard.order.order_resource import OrderListResource, OrderResource
+from main.v1.admin.dashboard.users.user_resource import UserListResource, UserResource, UserExportResource
+from main.v1.admin.dashboard.order.order_resource import OrderListResource, OrderResource, OrderExportResource
+from main.v1.admin.dashboard.metrics.metrics_resource import MetricsResource
+from main.v1.admin.dashboard.analytics.analytics_resource import SalesAnalyticsResource
+from main.v1.admin.dashboard.summary.summary_resource import DashboardSummaryResource
 
 # Customer Auth Resources
 from main.v1.customer.auth.auth_resource import CustomerRegistrationResource, CustomerLoginResource
 from main.v1.customer.auth.profile_resource import CustomerProfileResource
 
-# Customer Order, Wishlist & Invoice Resources
+# Customer Order, Checkout, Wishlist & Invoice Resources
 from main.v1.customer.order.order_resource import PlaceOrderResource
-from main.v1.customer.wishlist.wishlist import WishlistResource
-from main.v1.customer.invoice.invoice_resource import InvoiceResource
+from main.v1.customer.wishlist.wishlist import WishlistResource, WishlistBatchResource
+from main.v1.customer.invoice.invoice_resource import InvoiceResource, InvoiceJobResource
+from main.v1.customer.checkout.checkout_resource import CheckoutResource, CheckoutDetailResource, CheckoutInvoiceResource
+from main.v1.customer.checkout.reservation_resource import ReservationResource, ConfirmReservationResource
+from main.v1.customer.catalog.catalog_resource import CatalogProductsResource, CatalogSearchResource, CatalogAutocompleteResource
 
-# Service Provider Auth, Order, Notification, Product Resources
+# Service Provider Auth, Order, Notification, Product & Analytics Resources
 from main.v1.service_provider.auth.auth_resource import ProviderRegistrationResource, ProviderLoginResource
 from main.v1.service_provider.auth.profile_resource import ProviderProfileResource
 from main.v1.service_provider.order.order_resource import ProviderViewOrdersResource, ProviderUpdateOrderStatusResource
-from main.v1.service_provider.notification.notification_resource import ProviderViewNotificationsResource, ProviderCreateNotificationResource
-from main.v1.service_provider.product.product_resource import ProviderAddProductResource, ProviderViewProductsResource, ProviderUpdateProductResource, ProviderDeleteProductResource
+from main.v1.service_provider.notification.notification_resource import ProviderViewNotificationsResource, ProviderCreateNotificationResource, ProviderNotificationStreamResource
+from main.v1.service_provider.analytics.analytics_resource import ProviderSalesAnalyticsResource, ProviderSalesTimeseriesResource
+from main.v1.service_provider.product.product_resource import ProviderAddProductResource, ProviderBulkImportProductsResource, ProviderBulkUpdateProductsResource, ProviderViewProductsResource, ProviderUpdateProductResource, ProviderDeleteProductResource
 
 
 def register_routes(app):
@@ -35,8 +42,13 @@ def register_routes(app):
 
     api.add_resource(UserListResource, '/admin/dashboard/users')
     api.add_resource(UserResource, '/admin/dashboard/users/<int:user_id>')
+    api.add_resource(UserExportResource, '/admin/dashboard/users/export')
     api.add_resource(OrderListResource, '/admin/dashboard/orders')
     api.add_resource(OrderResource, '/admin/dashboard/orders/<int:order_id>')
+    api.add_resource(OrderExportResource, '/admin/dashboard/orders/export')
+    api.add_resource(MetricsResource, '/admin/dashboard/metrics')
+    api.add_resource(SalesAnalyticsResource, '/admin/dashboard/analytics/sales')
+    api.add_resource(DashboardSummaryResource, '/admin/dashboard/summary')
 
     # Customer Routes
     api.add_resource(CustomerRegistrationResource, '/customer/auth/register')
@@ -44,8 +56,18 @@ def register_routes(app):
     api.add_resource(CustomerProfileResource, '/customer/auth/profile')
 
     api.add_resource(PlaceOrderResource, '/customer/order')
+    api.add_resource(CheckoutResource, '/customer/checkout')
+    api.add_resource(CheckoutDetailResource, '/customer/checkout/<int:checkout_id>')
+    api.add_resource(CheckoutInvoiceResource, '/customer/checkout/<int:checkout_id>/invoice')
+    api.add_resource(ReservationResource, '/customer/reservations')
+    api.add_resource(ConfirmReservationResource, '/customer/reservations/confirm')
     api.add_resource(WishlistResource, '/customer/wishlist')
+    api.add_resource(WishlistBatchResource, '/customer/wishlist/batch')
     api.add_resource(InvoiceResource, "/customer/invoice/<int:order_id>")
+    api.add_resource(InvoiceJobResource, "/customer/invoice/jobs/<int:job_id>")
+    api.add_resource(CatalogProductsResource, '/customer/catalog/products')
+    api.add_resource(CatalogSearchResource, '/customer/catalog/search')
+    api.add_resource(CatalogAutocompleteResource, '/customer/catalog/autocomplete')
 
     # Service Provider Routes
     api.add_resource(ProviderRegistrationResource, "/service_provider/auth/register")
@@ -54,11 +76,16 @@ def register_routes(app):
 
     api.add_resource(ProviderViewOrdersResource, '/service_provider/orders')
     api.add_resource(ProviderUpdateOrderStatusResource, '/service_provider/orders/<int:order_id>/status')
+    api.add_resource(ProviderSalesAnalyticsResource, '/service_provider/analytics/sales')
+    api.add_resource(ProviderSalesTimeseriesResource, '/service_provider/analytics/sales/timeseries')
 
     api.add_resource(ProviderViewNotificationsResource, '/service_provider/notifications')
     api.add_resource(ProviderCreateNotificationResource, '/service_provider/notifications')
+    api.add_resource(ProviderNotificationStreamResource, '/service_provider/notifications/stream')
 
     api.add_resource(ProviderAddProductResource, '/service_provider/products')
+    api.add_resource(ProviderBulkImportProductsResource, '/service_provider/products/bulk')
+    api.add_resource(ProviderBulkUpdateProductsResource, '/service_provider/products/bulk')
     api.add_resource(ProviderViewProductsResource, '/service_provider/products')
     api.add_resource(ProviderUpdateProductResource, '/service_provider/products/<int:product_id>')
     api.add_resource(ProviderDeleteProductResource, '/service_provider/products/<int:product_id>')
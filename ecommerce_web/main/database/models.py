@@ -1,4 +1,5 @@
-from main.extension import db, bcrypt  # Import db and bcrypt from the extension module
+from main.extension import db  # Import db from the extension module
+from main.common.password_hasher import password_hasher
 from datetime import datetime
 
 # User Model with Roles
@@ -13,10 +14,18 @@ class User(db.Model):
     profile_pic = db.Column(db.String(255), nullable=True, default="profile_pics/default.png") # Default profile picture
 
     def set_password(self, password):
-        self.password_hash = bcrypt.generate_password_hash(password).decode("utf-8")
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return bcrypt.check_password_hash(self.password_hash, password)
+        """Verify a password, upgrading the stored hash if the configured work factor changed.
+
+        A rehash only modifies the instance; callers commit it after a successful login.
+        """
+        if not password_hasher.verify(self.password_hash, password):
+            return False
+        if password_hasher.needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
 
 # Product Model
 class Product(db.Model):
@@ -27,6 +36,26 @@ class Product(db.Model):
     quantity = db.Column(db.Integer, nullable=False, default=0)  # Added quantity field
     provider_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     is_deleted = db.Column(db.Boolean, default=False)  # Soft delete field
+    stock_shards = db.Column(db.Integer, nullable=False, default=0, server_default='0', index=True)  # 0: not sharded
+
+    __table_args__ = (
+        db.Index('ix_product_deleted_provider_price', 'is_deleted', 'provider_id', 'price'),  # Catalog by provider
+        db.Index('ix_product_deleted_price_id', 'is_deleted', 'price', 'id'),  # Catalog sorted by price
+        db.Index('ix_product_fulltext', 'name', 'description', mysql_prefix='FULLTEXT'),  # Product search
+        db.Index('ix_product_deleted_shards_quantity', 'is_deleted', 'stock_shards', 'quantity'),  # Low-stock summary
+    )
+
+# Stock of a hot product split across sub-rows; its total stock is Product.quantity plus every shard
+class ProductStockShard(db.Model):
+    product_id = db.Column(db.Integer, db.ForeignKey('product.id'), primary_key=True)
+    shard = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    quantity = db.Column(db.Integer, nullable=False, default=0)
+
+# Checkout Model: header of a multi-product purchase whose lines are Order rows
+class Checkout(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    customer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
 # Order Model
 class Order(db.Model):
@@ -35,6 +64,72 @@ class Order(db.Model):
     product_id = db.Column(db.Integer, db.ForeignKey('product.id'), nullable=False)
     status = db.Column(db.String(20), default='Pending')
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)  
+    quantity = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    checkout_id = db.Column(db.Integer, db.ForeignKey('checkout.id'), nullable=True, index=True)  # Set for cart lines
+    unit_price = db.Column(db.Float, nullable=True)  # Product price when the order was placed
+
+    checkout = db.relationship('Checkout', backref=db.backref('lines', order_by='Order.id'))
+
+    __table_args__ = (
+        db.Index('ix_order_created_at_id', 'created_at', 'id'),  # Keyset pagination for order listings
+        db.Index('ix_order_product_created_at', 'product_id', 'created_at'),  # Provider order dashboard
+    )
+
+# Running order counts per provider and status, spread over a few slot rows so concurrent orders don't queue on one row
+class ProviderOrderCounter(db.Model):
+    provider_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    slot = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+
+# Daily sales per product and status (provider copied in for provider-wide reads), slotted like ProviderOrderCounter
+class SalesRollupDaily(db.Model):
+    day = db.Column(db.Date, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('product.id'), primary_key=True)
+    status = db.Column(db.String(20), primary_key=True)
+    slot = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    provider_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    units = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+    __table_args__ = (
+        db.Index('ix_sales_rollup_provider_day', 'provider_id', 'day'),  # Provider analytics
+        db.Index('ix_sales_rollup_product_day', 'product_id', 'day'),  # Product analytics
+    )
+
+# Background invoice generation job
+class InvoiceJob(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey('order.id'), nullable=True, index=True)
+    checkout_id = db.Column(db.Integer, db.ForeignKey('checkout.id'), nullable=True, index=True)  # One invoice per cart
+    status = db.Column(db.String(20), nullable=False, default='pending', index=True)  # pending, ready, failed
+    file_path = db.Column(db.String(255), nullable=True)
+    error = db.Column(db.String(255), nullable=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    claimed_at = db.Column(db.DateTime, nullable=True)  # Set while a worker is rendering the invoice
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    order = db.relationship('Order', backref=db.backref('invoice_jobs', cascade='all, delete-orphan'))
+    checkout = db.relationship('Checkout', backref=db.backref('invoice_jobs', cascade='all, delete-orphan'))
+
+# Stock held for a customer until it is confirmed into a checkout, released, or expires
+class StockReservation(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    customer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    product_id = db.Column(db.Integer, db.ForeignKey('product.id'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='held')  # held, confirmed, released, expired
+    expires_at = db.Column(db.DateTime, nullable=False)
+    checkout_id = db.Column(db.Integer, db.ForeignKey('checkout.id'), nullable=True)  # Set once confirmed
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_stock_reservation_status_expires', 'status', 'expires_at'),  # Sweeper: oldest expired holds
+        db.Index('ix_stock_reservation_customer_status', 'customer_id', 'status', 'product_id'),  # A customer's holds
+        db.Index('ix_stock_reservation_product_status', 'product_id', 'status', 'quantity'),  # Units held per product
+    )
 
 class Notification(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -42,6 +137,10 @@ class Notification(db.Model):
     message = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
 
+    __table_args__ = (
+        db.Index('ix_notification_provider_id_id', 'provider_id', 'id'),  # A provider's notifications by since_id cursor
+    )
+
     def __repr__(self):
         return f"<Notification {self.id} - {self.message}>"
 
@@ -53,3 +152,7 @@ class Wishlist(db.Model):
     user = db.relationship('User', backref='wishlist')
     product = db.relationship('Product', backref='wishlist')
 
+    __table_args__ = (
+        db.Index('ux_wishlist_user_product', 'user_id', 'product_id', unique=True),  # One row per saved product
+    )
+
@@ -0,0 +1,17 @@
+from flask_restful import Resource
+from flask import request
+from main.common.sales_analytics import sales_report
+from main.common.jwt_utils import jwt_required, role_required
+
+
+class SalesAnalyticsResource(Resource):
+    @jwt_required
+    @role_required("1")
+    def get(self):
+        """Sales per day, provider or product over a date range, read from the daily rollups"""
+        try:
+            report = sales_report(request.args, request.args.get("group_by", "day"))
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        return {"status": "success", "message": "Sales fetched successfully", "data": report}, 200
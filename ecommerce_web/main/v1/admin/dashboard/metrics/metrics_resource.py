@@ -0,0 +1,22 @@
+from flask_restful import Resource
+from main.common.password_hasher import password_hasher
+from main.common.jwt_utils import jwt_required, role_required, token_cache
+from main.common.dashboard_summary import dashboard_summary
+from main.common.notification_writer import notification_writer
+
+
+class MetricsResource(Resource):
+    @jwt_required
+    @role_required("1")
+    def get(self):
+        """Runtime metrics of in-process worker pools and caches"""
+        return {
+            "status": "success",
+            "message": "Metrics fetched successfully",
+            "data": {
+                "password_hasher": password_hasher.stats(),
+                "token_cache": token_cache.stats(),
+                "dashboard_summary": dashboard_summary.stats(),
+                "notification_writer": notification_writer.stats()
+            }
+        }, 200
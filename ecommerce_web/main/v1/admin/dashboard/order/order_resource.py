@@ -1,17 +1,41 @@
 from flask_restful import Resource
 from flask import request
-from main.database.models import Order, Product
+from main.database.models import Order
 from main.extension import db
-from datetime import datetime
 from main.common.jwt_utils import jwt_required, role_required
+from main.common.pagination import parse_limit, created_at_keyset_filter, keyset_page
+from main.common.export import stream_export, EXPORT_FORMATS
+from main.common.order_service import place_order, restore_stock, order_filters, OrderPlacementError
+from main.v1.customer.invoice.invoice_generator import discard_cached_invoices
+from sqlalchemy import select
 
 
 class OrderListResource(Resource):
     @jwt_required
     @role_required("1")
     def get(self):
-        """Fetch all orders"""
-        orders = Order.query.all()
+        """Fetch orders one keyset page at a time, newest first"""
+        args = request.args
+
+        try:
+            limit = parse_limit(args.get("limit"))
+        except ValueError:
+            return {"status": "error", "message": "Limit must be a positive integer."}, 400
+
+        try:
+            query = Order.query.filter(*order_filters(args))
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        if args.get("after"):
+            try:
+                query = query.filter(created_at_keyset_filter(Order, args["after"]))
+            except ValueError:
+                return {"status": "error", "message": "Invalid cursor."}, 400
+
+        rows = query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1).all()
+        orders, next_cursor = keyset_page(rows, limit, key=lambda order: (order.created_at, order.id))
+
         orders_data = [{
             "id": order.id,
             "customer_id": order.customer_id,
@@ -20,7 +44,12 @@ class OrderListResource(Resource):
             "created_at": order.created_at.strftime('%Y-%m-%d %H:%M:%S') if order.created_at else "Not Available"
         } for order in orders]
 
-        return {"status": "success", "message": "Orders fetched successfully", "data": orders_data}, 200
+        return {
+            "status": "success",
+            "message": "Orders fetched successfully",
+            "data": orders_data,
+            "next_cursor": next_cursor
+        }, 200
 
     @jwt_required
     @role_required("1")
@@ -35,25 +64,8 @@ class OrderListResource(Resource):
         if not customer_id or not product_id:
             return {"status": "error", "message": "Customer ID and Product ID are required."}, 400
 
-        # Check product availability
-        product = Product.query.filter_by(id=product_id, is_deleted=False).first()
-        if not product:
-            return {"status": "error", "message": "Product not found or unavailable."}, 404
-        if product.quantity <= 0:
-            return {"status": "error", "message": "Product out of stock."}, 400
-
-        # Decrement product quantity and create order
-        product.quantity -= 1
-        new_order = Order(
-            customer_id=customer_id,
-            product_id=product_id,
-            status=status,
-            created_at=datetime.utcnow()
-        )
-
         try:
-            db.session.add(new_order)
-            db.session.commit()
+            new_order = place_order(customer_id=customer_id, product_id=product_id, status=status)
             return {
                 "status": "success",
                 "message": "Order created successfully",
@@ -66,6 +78,8 @@ class OrderListResource(Resource):
                 }
             }, 201
 
+        except OrderPlacementError as e:
+            return {"status": "error", "message": e.message}, e.code
         except Exception as e:
             db.session.rollback()
             return {"status": "error", "message": f"Failed to create order: {str(e)}"}, 500
@@ -94,12 +108,15 @@ class OrderResource(Resource):
         data = request.get_json(silent=True) or request.form
 
         if 'status' in data and data['status']:
+            status_changed = order.status != data['status']
             order.status = data['status']
         else:
             return {"status": "error", "message": "Status field is required."}, 400
 
         try:
             db.session.commit()
+            if status_changed:
+                discard_cached_invoices(order.customer_id, order.id)
             return {
                 "status": "success",
                 "message": "Order updated successfully",
@@ -118,15 +135,34 @@ class OrderResource(Resource):
     def delete(self, order_id):
         """Delete an order and restore product quantity"""
         order = Order.query.get_or_404(order_id)
-        product = Product.query.filter_by(id=order.product_id, is_deleted=False).first()
-
-        if product:
-            product.quantity += 1  # Restore product quantity on order deletion
 
         try:
+            customer_id = order.customer_id
+            restore_stock(order.product_id, order.quantity)  # Restore product quantity on order deletion
             db.session.delete(order)
             db.session.commit()
+            discard_cached_invoices(customer_id, order_id)
             return {"status": "success", "message": "Order deleted successfully, product quantity restored."}, 200
         except Exception as e:
             db.session.rollback()
             return {"status": "error", "message": f"Failed to delete order: {str(e)}"}, 500
+
+
+class OrderExportResource(Resource):
+    @jwt_required
+    @role_required("1")
+    def get(self):
+        """Stream all orders matching the listing filters as NDJSON or CSV"""
+        export_format = request.args.get("format", "ndjson").lower()
+        if export_format not in EXPORT_FORMATS:
+            return {"status": "error", "message": "Format must be one of: ndjson, csv."}, 400
+
+        try:
+            conditions = order_filters(request.args)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        columns = ["id", "customer_id", "product_id", "status", "created_at"]
+        stmt = select(*(getattr(Order, column) for column in columns)).where(*conditions).order_by(Order.id)
+
+        return stream_export(stmt, columns, export_format, filename="orders")
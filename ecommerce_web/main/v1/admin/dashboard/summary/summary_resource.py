@@ -0,0 +1,11 @@
+from flask_restful import Resource
+from main.common.dashboard_summary import dashboard_summary
+from main.common.jwt_utils import jwt_required, role_required
+
+
+class DashboardSummaryResource(Resource):
+    @jwt_required
+    @role_required("1")
+    def get(self):
+        """User, order and low-stock totals from a short-lived shared snapshot"""
+        return {"status": "success", "message": "Summary fetched successfully", "data": dashboard_summary.get()}, 200
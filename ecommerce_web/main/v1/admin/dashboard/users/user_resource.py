@@ -1,8 +1,11 @@
 from flask_restful import Resource
 from flask import request
 from main.database.models import User
-from main.extension import db, bcrypt
+from main.extension import db
+from main.common.password_hasher import password_hasher
 from main.common.jwt_utils import jwt_required, role_required
+from main.common.export import stream_export, EXPORT_FORMATS
+from sqlalchemy import select
 
 
 class UserListResource(Resource):
@@ -36,7 +39,7 @@ class UserListResource(Resource):
         if User.query.filter((User.username == data["username"]) | (User.email == data["email"])).first():
             return {"message": "Username or email already exists."}, 400
 
-        password_hash = bcrypt.generate_password_hash(data["password"]).decode("utf-8")
+        password_hash = password_hasher.hash(data["password"])
 
         new_user = User(
             full_name=data["full_name"],
@@ -98,7 +101,7 @@ class UserResource(Resource):
         if data.get("profile_pic"):
             user.profile_pic = data["profile_pic"]
         if data.get("password"):
-            user.password_hash = bcrypt.generate_password_hash(data["password"]).decode("utf-8")
+            user.password_hash = password_hasher.hash(data["password"])
 
         db.session.commit()
 
@@ -124,3 +127,22 @@ class UserResource(Resource):
         db.session.commit()
 
         return {"message": "User deleted successfully"}, 200
+
+
+class UserExportResource(Resource):
+    @jwt_required
+    @role_required("1")
+    def get(self):
+        export_format = request.args.get("format", "ndjson").lower()
+        if export_format not in EXPORT_FORMATS:
+            return {"message": "Format must be one of: ndjson, csv."}, 400
+
+        columns = ["id", "full_name", "username", "email", "role", "account_status", "profile_pic"]
+        stmt = select(*(getattr(User, column) for column in columns)).order_by(User.id)
+
+        if request.args.get("role"):
+            stmt = stmt.where(User.role == request.args["role"])
+        if request.args.get("account_status"):
+            stmt = stmt.where(User.account_status == request.args["account_status"])
+
+        return stream_export(stmt, columns, export_format, filename="users")
@@ -0,0 +1,137 @@
+from flask_restful import Resource
+from flask import request
+from main.database.models import Product
+from main.common.pagination import parse_limit, decode_cursor, keyset_filter, keyset_page
+from main.common.product_search import product_search
+from main.common.stock_shards import in_stock_filter, in_stock_ids
+from main.common.product_autocomplete import product_autocomplete, ensure_autocomplete_ready, MAX_SUGGESTIONS
+
+# sort name -> (keyset columns, descending)
+CATALOG_SORTS = {
+    "price_asc": (lambda: [Product.price, Product.id], False),
+    "price_desc": (lambda: [Product.price, Product.id], True),
+    "newest": (lambda: [Product.id], True)  # Product ids are assigned in creation order
+}
+
+
+class CatalogProductsResource(Resource):
+    def get(self):
+        """Browse active products with filters, sorting and keyset pagination (public)"""
+        args = request.args
+
+        sort = args.get("sort", "newest")
+        if sort not in CATALOG_SORTS:
+            return {"status": "error", "message": f"Sort must be one of: {', '.join(CATALOG_SORTS)}."}, 400
+        columns_for, descending = CATALOG_SORTS[sort]
+        columns = columns_for()
+
+        try:
+            limit = parse_limit(args.get("limit"))
+        except ValueError:
+            return {"status": "error", "message": "Limit must be a positive integer."}, 400
+
+        query = Product.query.filter(Product.is_deleted == False)  # noqa: E712
+        try:
+            if args.get("provider_id"):
+                query = query.filter(Product.provider_id == int(args["provider_id"]))
+            if args.get("min_price"):
+                query = query.filter(Product.price >= float(args["min_price"]))
+            if args.get("max_price"):
+                query = query.filter(Product.price <= float(args["max_price"]))
+        except ValueError:
+            return {"status": "error", "message": "provider_id, min_price and max_price must be numbers."}, 400
+        if args.get("in_stock", "").lower() in ("1", "true", "yes"):
+            query = query.filter(in_stock_filter())
+
+        if args.get("after"):
+            try:
+                values = decode_cursor(args["after"])
+                if len(values) != len(columns):
+                    raise ValueError
+                values = [float(values[0]), int(values[1])] if len(values) == 2 else [int(values[0])]
+            except (ValueError, TypeError):
+                return {"status": "error", "message": "Invalid cursor."}, 400
+            query = query.filter(keyset_filter(columns, values, descending))
+
+        order_by = [column.desc() if descending else column.asc() for column in columns]
+        rows = query.order_by(*order_by).limit(limit + 1).all()
+        products, next_cursor = keyset_page(
+            rows, limit, key=lambda product: [getattr(product, column.key) for column in columns]
+        )
+        stocked = in_stock_ids(products)
+
+        return {
+            "status": "success",
+            "message": "Products fetched successfully",
+            "data": [{
+                "id": product.id,
+                "name": product.name,
+                "description": product.description,
+                "price": product.price,
+                "provider_id": product.provider_id,
+                "in_stock": product.id in stocked
+            } for product in products],
+            "next_cursor": next_cursor
+        }, 200
+
+
+class CatalogSearchResource(Resource):
+    def get(self):
+        """Full-text search over product names and descriptions, ranked by relevance (public)"""
+        query = (request.args.get("q") or "").strip()
+        if not query:
+            return {"status": "error", "message": "Search query (q) is required."}, 400
+
+        try:
+            limit = parse_limit(request.args.get("limit"))
+            offset = int(request.args.get("offset") or 0)
+            if offset < 0:
+                raise ValueError
+        except ValueError:
+            return {"status": "error", "message": "Limit and offset must be non-negative integers."}, 400
+
+        ranked = product_search.search(query, limit + 1, offset)
+        has_more = len(ranked) > limit
+        ranked = ranked[:limit]
+
+        products = {
+            product.id: product
+            for product in Product.query.filter(Product.id.in_([pid for pid, _ in ranked]),
+                                                Product.is_deleted == False)  # noqa: E712
+        } if ranked else {}
+        stocked = in_stock_ids(products.values())
+
+        return {
+            "status": "success",
+            "message": "Search results fetched successfully",
+            "data": [{
+                "id": product.id,
+                "name": product.name,
+                "description": product.description,
+                "price": product.price,
+                "provider_id": product.provider_id,
+                "in_stock": product.id in stocked,
+                "score": score
+            } for product, score in ((products.get(pid), score) for pid, score in ranked) if product],
+            "next_offset": offset + limit if has_more else None
+        }, 200
+
+
+class CatalogAutocompleteResource(Resource):
+    def get(self):
+        """Suggest product names starting with a prefix, best sellers first (public)"""
+        prefix = request.args.get("q") or ""
+        try:
+            limit = parse_limit(request.args.get("limit"), default=10, maximum=MAX_SUGGESTIONS)
+        except ValueError:
+            return {"status": "error", "message": "Limit must be a positive integer."}, 400
+
+        ensure_autocomplete_ready()
+        return {
+            "status": "success",
+            "data": [{
+                "id": product_id,
+                "name": name,
+                "sales": sales
+            } for product_id, name, sales in product_autocomplete.suggest(prefix, limit)]
+        }, 200
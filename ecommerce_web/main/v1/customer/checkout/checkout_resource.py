@@ -0,0 +1,129 @@
+from flask_restful import Resource
+from flask import request, send_file, make_response
+from main.database.models import InvoiceJob, db
+from main.common.order_service import place_checkout, OrderPlacementError
+from main.v1.customer.invoice.invoice_generator import load_checkout_invoice_data, checkout_fingerprint, \
+    cached_checkout_invoice
+from main.v1.customer.invoice.invoice_worker import invoice_worker
+from main.common.jwt_utils import jwt_required, get_jwt_identity, role_required
+from sqlalchemy.exc import SQLAlchemyError
+import os
+
+MAX_CHECKOUT_LINES = 30  # Keeps the checkout invoice on a single page
+
+
+def parse_cart_items(data):
+    """Read [(product_id, quantity)] from {"items": [{"product_id": .., "quantity": ..}]}. Raises ValueError."""
+    items = data.get("items")
+    if not isinstance(items, list) or not items:
+        raise ValueError("items must be a non-empty list.")
+    if len(items) > MAX_CHECKOUT_LINES:
+        raise ValueError(f"At most {MAX_CHECKOUT_LINES} items per checkout.")
+    parsed = []
+    for item in items:
+        try:
+            product_id = int(item["product_id"])
+            quantity = int(item.get("quantity", 1))
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise ValueError("Each item needs an integer product_id and quantity.")
+        if quantity < 1:
+            raise ValueError("Quantity must be a positive integer.")
+        parsed.append((product_id, quantity))
+    return parsed
+
+
+def checkout_data(checkout, lines):
+    total = sum(product.price * order.quantity for order, product in lines)
+    return {
+        "checkout_id": checkout.id,
+        "customer_id": checkout.customer_id,
+        "created_at": checkout.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        "total": round(total, 2),
+        "lines": [{
+            "order_id": order.id,
+            "product_id": product.id,
+            "product_name": product.name,
+            "quantity": order.quantity,
+            "price": product.price,
+            "status": order.status
+        } for order, product in lines]
+    }
+
+
+class CheckoutResource(Resource):
+    @jwt_required
+    @role_required("2")  # Customer role
+    def post(self):
+        """Place every cart line in one transaction and queue a single invoice for the cart"""
+        identity = get_jwt_identity()
+        try:
+            items = parse_cart_items(request.get_json(silent=True) or {})
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        try:
+            checkout = place_checkout(customer_id=int(identity), items=items, commit=False)
+            invoice_job = InvoiceJob(checkout_id=checkout.id)
+            db.session.add(invoice_job)
+            db.session.commit()
+
+            #  Render the cart invoice in the background
+            invoice_worker.enqueue(invoice_job.id)
+
+            data = checkout_data(*load_checkout_invoice_data(checkout.id))
+            data.update({"invoice_job_id": invoice_job.id, "invoice_status": invoice_job.status})
+            return {"status": "success", "message": "Checkout completed successfully.", "data": data}, 201
+
+        except OrderPlacementError as e:
+            return {"status": "error", "message": e.message}, e.code
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return {"status": "error", "message": f"An error occurred: {str(e)}"}, 500
+
+
+class CheckoutDetailResource(Resource):
+    @jwt_required
+    @role_required("2")
+    def get(self, checkout_id):
+        identity = get_jwt_identity()
+
+        checkout, lines = load_checkout_invoice_data(checkout_id)
+        if not checkout or str(checkout.customer_id) != str(identity):
+            return {"status": "error", "message": "Checkout not found or does not belong to you."}, 404
+
+        return {"status": "success", "data": checkout_data(checkout, lines)}, 200
+
+
+class CheckoutInvoiceResource(Resource):
+    @jwt_required
+    @role_required("2")
+    def get(self, checkout_id):
+        identity = get_jwt_identity()
+
+        # Verify ownership, loading every line and product in the same query
+        checkout, lines = load_checkout_invoice_data(checkout_id)
+        if not checkout or str(checkout.customer_id) != str(identity):
+            return {"status": "error", "message": "Checkout not found or does not belong to you."}, 404
+        if not lines:
+            return {"status": "error", "message": "No orders found for this checkout."}, 404
+
+        fingerprint = checkout_fingerprint(checkout, lines)
+        if request.if_none_match.contains(fingerprint):
+            response = make_response("", 304)
+            response.set_etag(fingerprint)
+            return response
+
+        try:
+            result = cached_checkout_invoice(checkout, lines)
+            file_path = result.get("file_path")
+            if result.get("status") != "success" or not file_path or not os.path.exists(file_path):
+                return {"status": "error", "message": result.get("message", "Invoice generation failed.")}, 404
+
+            response = send_file(file_path, as_attachment=True, download_name=f"invoice_checkout_{checkout_id}.pdf",
+                                 etag=fingerprint, conditional=True)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
+        except Exception as e:
+            return {"status": "error", "message": f"An error occurred: {str(e)}"}, 500
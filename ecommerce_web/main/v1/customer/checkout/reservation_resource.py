@@ -0,0 +1,110 @@
+from flask_restful import Resource
+from flask import request, current_app
+from main.database.models import InvoiceJob, db
+from main.common.order_service import OrderPlacementError
+from main.common.reservation_service import reserve_stock, confirm_reservations, release_reservations, \
+    reservation_sweeper
+from main.v1.customer.checkout.checkout_resource import parse_cart_items, checkout_data
+from main.v1.customer.invoice.invoice_generator import load_checkout_invoice_data
+from main.v1.customer.invoice.invoice_worker import invoice_worker
+from main.common.jwt_utils import jwt_required, get_jwt_identity, role_required
+from sqlalchemy.exc import SQLAlchemyError
+
+
+def parse_reservation_ids(data):
+    """Read a list of reservation ids from {"reservation_ids": [...]}. Raises ValueError."""
+    reservation_ids = data.get("reservation_ids")
+    if not isinstance(reservation_ids, list) or not reservation_ids:
+        raise ValueError("reservation_ids must be a non-empty list.")
+    try:
+        return [int(reservation_id) for reservation_id in reservation_ids]
+    except (TypeError, ValueError):
+        raise ValueError("reservation_ids must contain integers only.")
+
+
+class ReservationResource(Resource):
+    @jwt_required
+    @role_required("2")  # Customer role
+    def post(self):
+        """Hold stock for the cart until it is confirmed, released or the TTL runs out"""
+        identity = get_jwt_identity()
+        try:
+            items = parse_cart_items(request.get_json(silent=True) or {})
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        reservation_sweeper.ensure_started()
+        try:
+            reservations = reserve_stock(int(identity), items, current_app.config["RESERVATION_TTL"])
+        except OrderPlacementError as e:
+            return {"status": "error", "message": e.message}, e.code
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return {"status": "error", "message": f"An error occurred: {str(e)}"}, 500
+
+        return {
+            "status": "success",
+            "message": "Stock reserved.",
+            "data": [{
+                "reservation_id": reservation.id,
+                "product_id": reservation.product_id,
+                "quantity": reservation.quantity,
+                "expires_at": reservation.expires_at.strftime('%Y-%m-%d %H:%M:%S')
+            } for reservation in reservations]
+        }, 201
+
+    @jwt_required
+    @role_required("2")
+    def delete(self):
+        """Release held reservations and return their stock"""
+        identity = get_jwt_identity()
+        try:
+            reservation_ids = parse_reservation_ids(request.get_json(silent=True) or {})
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        try:
+            released = release_reservations(int(identity), reservation_ids)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return {"status": "error", "message": f"An error occurred: {str(e)}"}, 500
+
+        return {
+            "status": "success",
+            "message": f"{len(released)} reservation(s) released.",
+            "data": {
+                "released": released,
+                "not_held": [reservation_id for reservation_id in reservation_ids if reservation_id not in released]
+            }
+        }, 200
+
+
+class ConfirmReservationResource(Resource):
+    @jwt_required
+    @role_required("2")
+    def post(self):
+        """Turn held reservations into a checkout with a single invoice"""
+        identity = get_jwt_identity()
+        try:
+            reservation_ids = parse_reservation_ids(request.get_json(silent=True) or {})
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        try:
+            checkout = confirm_reservations(int(identity), reservation_ids, commit=False)
+            invoice_job = InvoiceJob(checkout_id=checkout.id)
+            db.session.add(invoice_job)
+            db.session.commit()
+
+            invoice_worker.enqueue(invoice_job.id)
+
+            data = checkout_data(*load_checkout_invoice_data(checkout.id))
+            data.update({"invoice_job_id": invoice_job.id, "invoice_status": invoice_job.status})
+            return {"status": "success", "message": "Checkout completed successfully.", "data": data}, 201
+
+        except OrderPlacementError as e:
+            return {"status": "error", "message": e.message}, e.code
+
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return {"status": "error", "message": f"An error occurred: {str(e)}"}, 500
@@ -0,0 +1,149 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+from main.database.models import Order, Product, Checkout
+from main.extension import db
+from main.v1.customer.invoice.invoice_generator import cached_invoice, render_invoice, invoice_fingerprint, \
+    invoice_path, discard_cached_invoices, cached_checkout_invoice
+
+ORDER_FIELDS = ("id", "customer_id", "status", "quantity", "created_at", "unit_price")
+PRODUCT_FIELDS = ("id", "provider_id", "name", "price", "description")
+CHECKOUT_FIELDS = ("id", "customer_id", "created_at")
+
+
+def _render_row(row, force=False):
+    """Render one invoice in a pool process from plain order/product field dicts."""
+    order = SimpleNamespace(**row["order"])
+    product = SimpleNamespace(**row["product"])
+
+    if force:
+        file_path = invoice_path(order.customer_id, order.id, invoice_fingerprint(order, product))
+        result = render_invoice(order, product, file_path)
+        if result["status"] == "success":
+            discard_cached_invoices(order.customer_id, order.id, keep=file_path)
+    else:
+        result = cached_invoice(order, product)
+    return order.id, result["status"] == "success", result["message"]
+
+
+def _render_checkout(row, force=False):
+    """Render one checkout invoice in a pool process from a plain checkout dict and its line dicts."""
+    checkout = SimpleNamespace(**row["checkout"])
+    lines = [(SimpleNamespace(**line["order"]), SimpleNamespace(**line["product"])) for line in row["lines"]]
+    if not lines:
+        return checkout.id, False, "Checkout or its products not found."
+    result = cached_checkout_invoice(checkout, lines, force=force)
+    return checkout.id, result["status"] == "success", result["message"]
+
+
+def split_line(row):
+    """Turn a flat (order fields..., product fields...) row into order/product dicts."""
+    split = len(ORDER_FIELDS)
+    return {"order": dict(zip(ORDER_FIELDS, row[:split])), "product": dict(zip(PRODUCT_FIELDS, row[split:]))}
+
+
+def fetch_batch(after_id, batch_size, since=None):
+    """Fetch the next batch of orders after `after_id`, joined with their products in a single query."""
+    columns = [getattr(Order, f) for f in ORDER_FIELDS] + [getattr(Product, f) for f in PRODUCT_FIELDS]
+    query = db.session.query(*columns).join(Product, Product.id == Order.product_id) \
+        .filter(Order.id > after_id, Order.checkout_id.is_(None))  # Cart lines are invoiced per checkout
+    if since:
+        query = query.filter(Order.created_at >= since)
+
+    return [split_line(row) for row in query.order_by(Order.id).limit(batch_size).all()]
+
+
+def fetch_checkout_batch(after_id, batch_size, since=None):
+    """Fetch the next batch of checkouts after `after_id` with their lines: one query for each."""
+    query = db.session.query(*[getattr(Checkout, f) for f in CHECKOUT_FIELDS]).filter(Checkout.id > after_id)
+    if since:
+        query = query.filter(Checkout.created_at >= since)
+    checkouts = query.order_by(Checkout.id).limit(batch_size).all()
+    if not checkouts:
+        return []
+
+    columns = [getattr(Order, f) for f in ORDER_FIELDS] + [getattr(Product, f) for f in PRODUCT_FIELDS]
+    lines = {}
+    for row in db.session.query(Order.checkout_id, *columns).join(Product, Product.id == Order.product_id) \
+            .filter(Order.checkout_id.in_([checkout.id for checkout in checkouts])).order_by(Order.id):
+        lines.setdefault(row[0], []).append(split_line(row[1:]))
+    return [{"checkout": dict(zip(CHECKOUT_FIELDS, checkout)), "lines": lines.get(checkout.id, [])}
+            for checkout in checkouts]
+
+
+def backfill_options(since, force):
+    """The run options a checkpoint is tied to, in JSON-friendly form."""
+    return {"since": since.isoformat() if since else None, "force": bool(force)}
+
+
+def load_checkpoint(path, options):
+    """Resume an interrupted run, or start a new one. Raises ValueError if the checkpoint was made with other options."""
+    if path and os.path.exists(path):
+        with open(path) as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("options") != options:
+            raise ValueError(f"Checkpoint {path} belongs to a run with other options "
+                             f"({checkpoint.get('options')}); pass --restart to start over.")
+        checkpoint.setdefault("last_checkout_id", 0)
+        return checkpoint
+    return {"options": options, "last_order_id": 0, "last_checkout_id": 0, "rendered": 0, "failed": 0}
+
+
+def save_checkpoint(path, checkpoint):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+# (checkpoint cursor, batch fetcher, pool renderer, label); single orders first, then cart checkouts
+BACKFILL_PASSES = (
+    ("last_order_id", fetch_batch, _render_row, "order"),
+    ("last_checkout_id", fetch_checkout_batch, _render_checkout, "checkout"),
+)
+
+
+def backfill_invoices(since=None, batch_size=500, workers=None, checkpoint_path=None, force=False, report=print):
+    """Regenerate invoices for all orders and checkouts (optionally created since a date) across a process pool.
+
+    Order ids, then checkout ids, are walked in keyset batches; each batch is loaded with one
+    joined query (two for checkouts) and rendered in parallel. Progress is checkpointed after
+    every batch, with a cursor per pass, so an interrupted run resumes where it stopped, and
+    the checkpoint is removed once the run completes. Raises ValueError if an existing
+    checkpoint was made with a different since/force. Returns the final checkpoint dict.
+    """
+    checkpoint = load_checkpoint(checkpoint_path, backfill_options(since, force))
+    started = time.monotonic()
+    processed = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for cursor, fetch, render, label in BACKFILL_PASSES:
+            while True:
+                rows = fetch(checkpoint[cursor], batch_size, since)
+                db.session.remove()  # Don't keep a transaction open while the pool renders
+                if not rows:
+                    break
+
+                chunksize = max(1, len(rows) // ((workers or os.cpu_count() or 1) * 4))
+                for item_id, ok, message in pool.map(render, rows, [force] * len(rows), chunksize=chunksize):
+                    if ok:
+                        checkpoint["rendered"] += 1
+                    else:
+                        checkpoint["failed"] += 1
+                        report(f"{label.capitalize()} {item_id}: {message}")
+
+                processed += len(rows)
+                checkpoint[cursor] = rows[-1][label]["id"]
+                if checkpoint_path:
+                    save_checkpoint(checkpoint_path, checkpoint)
+
+                elapsed = time.monotonic() - started
+                report(f"Up to {label} {checkpoint[cursor]}: {processed} processed this run, "
+                       f"{checkpoint['rendered']} rendered, {checkpoint['failed']} failed, "
+                       f"{processed / elapsed if elapsed else 0:.1f} invoices/sec")
+
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)  # Finished: the next run starts from the first order
+    return checkpoint
@@ -1,57 +1,247 @@
+import glob
+import hashlib
+import json
 import os
+import threading
 from reportlab.lib.pagesizes import letter
 from reportlab.pdfgen import canvas
-from main.database.models import Order, Product
+from main.database.models import Order, Product, Checkout
+from main.v1.customer.invoice.invoice_template import invoice_template, INVOICE_LAYOUT
+from main.extension import db
 from datetime import datetime
 
 BASE_INVOICE_DIR = os.path.join(os.getcwd(), "main", "static", "invoices")
 os.makedirs(BASE_INVOICE_DIR, exist_ok=True)
 
+
+INVOICE_TEMPLATE_VERSION = 2  # Bump when the invoice layout changes so cached PDFs are re-rendered
+
+
+def order_unit_price(order, product):
+    """The unit price the customer paid: snapshotted at order time, the current price for older orders."""
+    return order.unit_price if order.unit_price is not None else product.price
+
+
+def invoice_fingerprint(order, product):
+    """Hash every value printed on the invoice; it changes only when the rendered PDF would."""
+    fields = [
+        INVOICE_TEMPLATE_VERSION,
+        order.id,
+        order.customer_id,
+        order.status,
+        str(order.created_at),
+        product.id,
+        product.provider_id,
+        product.name,
+        order_unit_price(order, product),
+        product.description
+    ]
+    return hashlib.sha256(json.dumps(fields, default=str).encode("utf-8")).hexdigest()
+
+
+def invoice_path(customer_id, order_id, fingerprint=None):
+    """Return the on-disk path of an order's invoice, creating the customer directory."""
+    customer_invoice_dir = os.path.join(BASE_INVOICE_DIR, f"customer_{customer_id}")
+    os.makedirs(customer_invoice_dir, exist_ok=True)
+    if fingerprint:
+        return os.path.join(customer_invoice_dir, f"invoice_{order_id}-{fingerprint[:16]}.pdf")
+    return os.path.join(customer_invoice_dir, f"invoice_{order_id}.pdf")
+
+
+def checkout_invoice_path(customer_id, checkout_id, fingerprint):
+    """Return the on-disk path of a checkout's (multi-line) invoice, creating the customer directory."""
+    customer_invoice_dir = os.path.join(BASE_INVOICE_DIR, f"customer_{customer_id}")
+    os.makedirs(customer_invoice_dir, exist_ok=True)
+    return os.path.join(customer_invoice_dir, f"checkout_{checkout_id}-{fingerprint[:16]}.pdf")
+
+
+def discard_cached_invoices(customer_id, order_id, keep=None, kind="invoice"):
+    """Delete cached invoice PDFs of an order (or of a checkout, with kind="checkout"), except `keep`."""
+    pattern = os.path.join(BASE_INVOICE_DIR, f"customer_{customer_id}", f"{kind}_{order_id}-*.pdf")
+    for path in glob.glob(pattern):
+        if path != keep:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def load_invoice_data(order_id):
+    """Fetch an order and its product with one joined query. Returns (order, product) or (None, None)."""
+    row = db.session.query(Order, Product).outerjoin(Product, Product.id == Order.product_id) \
+        .filter(Order.id == order_id).first()
+    return row if row else (None, None)
+
+
+def invoice_values(order, product):
+    """Collect the field values printed on an invoice."""
+    # Handle order date safely
+    order_date = "Not Available"
+    if hasattr(order, 'created_at') and order.created_at:
+        if isinstance(order.created_at, str):
+            try:
+                order_date = datetime.strptime(order.created_at, "%Y-%m-%d %H:%M:%S").strftime('%Y-%m-%d')
+            except ValueError:
+                order_date = "Invalid Date Format"
+        else:
+            order_date = order.created_at.strftime('%Y-%m-%d')
+
+    return {
+        "order_id": order.id,
+        "customer_id": order.customer_id,
+        "provider_id": product.provider_id,
+        "product_name": product.name,
+        "price": f"${order_unit_price(order, product):.2f}",
+        "status": order.status,
+        "description": product.description,
+        "order_date": order_date
+    }
+
+
+def render_invoice_bytes(order, product):
+    """Render an invoice into memory using the pre-built invoice template."""
+    return invoice_template.render(invoice_values(order, product))
+
+
+def render_invoice_with_canvas(order, product, output):
+    """Draw an invoice from scratch with a reportlab canvas (reference renderer for benchmarks).
+
+    `output` is a file path or a binary file-like object.
+    """
+    values = invoice_values(order, product)
+    c = canvas.Canvas(output, pagesize=letter)
+    for field, font, size, y, label in INVOICE_LAYOUT:
+        c.setFont("Helvetica-Bold" if font == "F2" else "Helvetica", size)
+        c.drawString(100, y, f"{label}{values[field]}")
+    c.save()
+
+
+def render_invoice(order, product, file_path=None, buffer=None):
+    """Render the invoice PDF for an already-loaded order and product.
+
+    Writes to `buffer` (any binary file-like object) when given, otherwise to `file_path`
+    or the order's default invoice path.
+    """
+    if buffer is not None:
+        try:
+            buffer.write(render_invoice_bytes(order, product))
+            return {"status": "success", "message": "Invoice generated successfully.", "file_path": None}
+        except Exception as e:
+            return {"status": "error", "message": f"Failed to generate invoice: {str(e)}", "file_path": None}
+
+    file_path = file_path or invoice_path(order.customer_id, order.id)
+    tmp_path = f"{file_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+    try:
+        pdf = render_invoice_bytes(order, product)
+        with open(tmp_path, "wb") as f:
+            f.write(pdf)
+        os.replace(tmp_path, file_path)  # Readers never see a half-written PDF
+
+        return {"status": "success", "message": "Invoice generated successfully.", "file_path": file_path}
+
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return {"status": "error", "message": f"Failed to generate invoice: {str(e)}", "file_path": None}
+
+
+def cached_invoice(order, product):
+    """Return the cached invoice for the order's current state, rendering it only if missing.
+
+    The result carries the fingerprint, which doubles as the invoice's strong ETag.
+    """
+    fingerprint = invoice_fingerprint(order, product)
+    file_path = invoice_path(order.customer_id, order.id, fingerprint)
+
+    if os.path.exists(file_path):
+        return {"status": "success", "message": "Invoice served from cache.", "file_path": file_path,
+                "fingerprint": fingerprint}
+
+    result = render_invoice(order, product, file_path)
+    if result["status"] == "success":
+        discard_cached_invoices(order.customer_id, order.id, keep=file_path)
+    result["fingerprint"] = fingerprint
+    return result
+
+
 def generate_invoice(order_id):
     """Generate a PDF invoice for a given order ID."""
-    order = Order.query.get(order_id)
+    order, product = load_invoice_data(order_id)
     if not order:
         return {"status": "error", "message": "Order not found.", "file_path": None}
-
-    product = Product.query.get(order.product_id)
     if not product:
         return {"status": "error", "message": "Product not found for this order.", "file_path": None}
 
-    customer_invoice_dir = os.path.join(BASE_INVOICE_DIR, f"customer_{order.customer_id}")
-    os.makedirs(customer_invoice_dir, exist_ok=True)
+    return cached_invoice(order, product)
 
-    file_name = f"invoice_{order.id}.pdf"
-    file_path = os.path.join(customer_invoice_dir, file_name)
 
-    try:
-        c = canvas.Canvas(file_path, pagesize=letter)
-
-        # Handle order date safely
-        order_date = "Not Available"
-        if hasattr(order, 'created_at') and order.created_at:
-            if isinstance(order.created_at, str):
-                try:
-                    order_date = datetime.strptime(order.created_at, "%Y-%m-%d %H:%M:%S").strftime('%Y-%m-%d')
-                except ValueError:
-                    order_date = "Invalid Date Format"
-            else:
-                order_date = order.created_at.strftime('%Y-%m-%d')
-
-        # Write invoice content
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(100, 750, f"Invoice for Order ID: {order.id}")
-        c.setFont("Helvetica", 12)
-        c.drawString(100, 730, f"Customer ID: {order.customer_id}")
-        c.drawString(100, 710, f"Provider ID: {product.provider_id}")
-        c.drawString(100, 690, f"Product: {product.name}")
-        c.drawString(100, 670, f"Price: ${product.price:.2f}")
-        c.drawString(100, 650, f"Status: {order.status}")
-        c.drawString(100, 630, f"Description: {product.description}")
-        c.drawString(100, 610, f"Date: {order_date}")
-
-        c.save()
+# Checkout invoices: one PDF listing every line of a cart
+CHECKOUT_LINE_HEIGHT = 18
+CHECKOUT_FIRST_LINE_Y = 670
+
+
+def load_checkout_invoice_data(checkout_id):
+    """Fetch a checkout and its (order, product) lines with one joined query. Returns (checkout, lines)."""
+    rows = db.session.query(Checkout, Order, Product) \
+        .outerjoin(Order, Order.checkout_id == Checkout.id) \
+        .outerjoin(Product, Product.id == Order.product_id) \
+        .filter(Checkout.id == checkout_id).order_by(Order.id).all()
+    if not rows:
+        return None, []
+    return rows[0][0], [(order, product) for _, order, product in rows if order is not None and product is not None]
+
+
+def checkout_fingerprint(checkout, lines):
+    """Hash every value printed on the checkout invoice."""
+    fields = [INVOICE_TEMPLATE_VERSION, checkout.id, checkout.customer_id, str(checkout.created_at)]
+    for order, product in lines:
+        fields += [order.id, order.status, order.quantity, product.id, product.provider_id, product.name,
+                   order_unit_price(order, product)]
+    return hashlib.sha256(json.dumps(fields, default=str).encode("utf-8")).hexdigest()
 
-        return {"status": "success", "message": "Invoice generated successfully.", "file_path": file_path}
 
+def render_checkout_invoice_bytes(checkout, lines):
+    """Render a checkout invoice (one row per line plus the total) with the pre-built template."""
+    text = [
+        ("F2", 14, 750, f"Invoice for Checkout ID: {checkout.id}"),
+        ("F1", 12, 730, f"Customer ID: {checkout.customer_id}"),
+        ("F1", 12, 710, f"Date: {checkout.created_at.strftime('%Y-%m-%d')}"),
+        ("F2", 12, 690, "Order / Product / Provider / Qty x Price = Amount / Status"),
+    ]
+    y = CHECKOUT_FIRST_LINE_Y
+    total = 0.0
+    for order, product in lines:
+        price = order_unit_price(order, product)
+        amount = price * order.quantity
+        total += amount
+        text.append(("F1", 10, y, f"#{order.id}  {product.name}  (provider {product.provider_id})  "
+                                  f"{order.quantity} x ${price:.2f} = ${amount:.2f}  {order.status}"))
+        y -= CHECKOUT_LINE_HEIGHT
+    text.append(("F2", 12, y - CHECKOUT_LINE_HEIGHT, f"Total: ${total:.2f}"))
+    return invoice_template.render_lines(text)
+
+
+def cached_checkout_invoice(checkout, lines, force=False):
+    """Checkout counterpart of cached_invoice: render only when a printed value changed (or with force)."""
+    fingerprint = checkout_fingerprint(checkout, lines)
+    file_path = checkout_invoice_path(checkout.customer_id, checkout.id, fingerprint)
+
+    if not force and os.path.exists(file_path):
+        return {"status": "success", "message": "Invoice served from cache.", "file_path": file_path,
+                "fingerprint": fingerprint}
+
+    tmp_path = f"{file_path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(render_checkout_invoice_bytes(checkout, lines))
+        os.replace(tmp_path, file_path)
     except Exception as e:
-        return {"status": "error", "message": f"Failed to generate invoice: {str(e)}", "file_path": None}
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return {"status": "error", "message": f"Failed to generate invoice: {str(e)}", "file_path": None,
+                "fingerprint": fingerprint}
+
+    discard_cached_invoices(checkout.customer_id, checkout.id, keep=file_path, kind="checkout")
+    return {"status": "success", "message": "Invoice generated successfully.", "file_path": file_path,
+            "fingerprint": fingerprint}
@@ -1,7 +1,8 @@
 from flask_restful import Resource
-from flask import send_file
-from main.v1.customer.invoice.invoice_generator import generate_invoice
-from main.database.models import Order
+from flask import send_file, request, make_response
+from main.v1.customer.invoice.invoice_generator import load_invoice_data, invoice_fingerprint, cached_invoice
+from main.database.models import Order, InvoiceJob, Checkout
+from sqlalchemy import or_
 from main.common.jwt_utils import jwt_required, get_jwt_identity, role_required
 import os
 
@@ -12,19 +13,59 @@ class InvoiceResource(Resource):
     def get(self, order_id):
         identity = get_jwt_identity()
 
-        # Verify order ownership
-        order = Order.query.filter_by(id=order_id, customer_id=identity).first()
-        if not order:
+        # Verify order ownership, loading the product in the same query
+        order, product = load_invoice_data(order_id)
+        if not order or str(order.customer_id) != str(identity):
             return {"status": "error", "message": "Order not found or does not belong to you."}, 404
+        if not product:
+            return {"status": "error", "message": "Product not found for this order."}, 404
 
-        # Generate and send invoice
+        # The fingerprint of the invoice inputs is a strong ETag: answer revalidations without touching disk
+        fingerprint = invoice_fingerprint(order, product)
+        if request.if_none_match.contains(fingerprint):
+            response = make_response("", 304)
+            response.set_etag(fingerprint)
+            return response
+
+        # Serve the cached invoice, rendering it only if the order or product changed
         try:
-            result = generate_invoice(order_id)
+            result = cached_invoice(order, product)
             file_path = result.get("file_path")
             if result.get("status") != "success" or not file_path or not os.path.exists(file_path):
                 return {"status": "error", "message": result.get("message", "Invoice generation failed.")}, 404
 
-            return send_file(file_path, as_attachment=True, download_name=f"invoice_order_{order_id}.pdf")
+            response = send_file(file_path, as_attachment=True, download_name=f"invoice_order_{order_id}.pdf",
+                                 etag=fingerprint, conditional=True)
+            response.headers["Cache-Control"] = "private, no-cache"  # Always revalidate with the ETag
+            return response
 
         except Exception as e:
             return {"status": "error", "message": f"An error occurred: {str(e)}"}, 500
+
+
+class InvoiceJobResource(Resource):
+    @jwt_required
+    @role_required("2")
+    def get(self, job_id):
+        identity = get_jwt_identity()
+
+        # Verify the job belongs to one of the customer's orders or checkouts
+        job = InvoiceJob.query.outerjoin(Order, Order.id == InvoiceJob.order_id) \
+            .outerjoin(Checkout, Checkout.id == InvoiceJob.checkout_id) \
+            .filter(InvoiceJob.id == job_id,
+                    or_(Order.customer_id == identity, Checkout.customer_id == identity)).first()
+        if not job:
+            return {"status": "error", "message": "Invoice job not found or does not belong to you."}, 404
+
+        return {
+            "status": "success",
+            "data": {
+                "job_id": job.id,
+                "order_id": job.order_id,
+                "checkout_id": job.checkout_id,
+                "invoice_status": job.status,
+                "error": job.error,
+                "created_at": job.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                "updated_at": job.updated_at.strftime('%Y-%m-%d %H:%M:%S')
+            }
+        }, 200
@@ -0,0 +1,91 @@
+from reportlab.lib.pagesizes import letter
+
+# Invoice layout: (field, font, size, y, label). Every line is drawn at x=100.
+INVOICE_LAYOUT = (
+    ("order_id", "F2", 14, 750, "Invoice for Order ID: "),
+    ("customer_id", "F1", 12, 730, "Customer ID: "),
+    ("provider_id", "F1", 12, 710, "Provider ID: "),
+    ("product_name", "F1", 12, 690, "Product: "),
+    ("price", "F1", 12, 670, "Price: "),
+    ("status", "F1", 12, 650, "Status: "),
+    ("description", "F1", 12, 630, "Description: "),
+    ("order_date", "F1", 12, 610, "Date: "),
+)
+INVOICE_FONTS = (("F1", "Helvetica"), ("F2", "Helvetica-Bold"))
+
+
+def pdf_string(text):
+    """Encode text as the body of a PDF literal string in WinAnsi (cp1252) encoding."""
+    raw = str(text).encode("cp1252", errors="replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)").replace(b"\r", b"\\r").replace(b"\n", b"\\n")
+
+
+class InvoiceTemplate:
+    """Single-page invoice PDF whose static parts are serialized once and reused for every order.
+
+    The catalog, page tree, page, font objects, the text operators and all labels are built
+    in __init__. Rendering an order only escapes the field values, splices them into the
+    content stream and writes the trailer; the object offsets before the content stream
+    never change, so the xref table is precomputed as well.
+    """
+
+    def __init__(self, layout=INVOICE_LAYOUT, pagesize=letter):
+        width, height = pagesize
+        font_refs = " ".join(f"/{name} {4 + i} 0 R" for i, (name, _) in enumerate(INVOICE_FONTS))
+        objects = [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {width:g} {height:g}] "
+             f"/Resources << /Font << {font_refs} >> /ProcSet [/PDF /Text] >> "
+             f"/Contents {4 + len(INVOICE_FONTS)} 0 R >>").encode("ascii"),
+        ] + [
+            f"<< /Type /Font /Subtype /Type1 /BaseFont /{base} /Encoding /WinAnsiEncoding >>".encode("ascii")
+            for _, base in INVOICE_FONTS
+        ]
+
+        header = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(header))
+            header += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+        self.content_number = len(objects) + 1
+        offsets.append(len(header))
+
+        self.header = bytes(header)
+        self.xref = (b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1)
+                     + b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+        self.trailer = b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n" % (len(offsets) + 1)
+
+        # Each field becomes "<label prefix>" + escaped value + ") Tj ET\n"
+        self.fields = [
+            (field, b"BT /%s %d Tf 100 %d Td (%s" % (font.encode("ascii"), size, y, pdf_string(label)))
+            for field, font, size, y, label in layout
+        ]
+
+    def render(self, values):
+        """Return the invoice PDF bytes for a dict of field values."""
+        content = b"".join(prefix + pdf_string(values[field]) + b") Tj ET\n" for field, prefix in self.fields)
+        return self.render_content(content)
+
+    def render_lines(self, lines):
+        """Return PDF bytes for free-form (font, size, y, text) lines, e.g. a multi-line checkout invoice."""
+        content = b"".join(
+            b"BT /%s %d Tf 100 %d Td (%s) Tj ET\n" % (font.encode("ascii"), size, y, pdf_string(text))
+            for font, size, y, text in lines
+        )
+        return self.render_content(content)
+
+    def render_content(self, content):
+        """Wrap a page content stream with the pre-built header, xref and trailer."""
+        out = bytearray(self.header)
+        out += b"%d 0 obj\n<< /Length %d >>\nstream\n" % (self.content_number, len(content))
+        out += content
+        out += b"endstream\nendobj\n"
+        xref_offset = len(out)
+        out += self.xref
+        out += self.trailer
+        out += b"%d\n%%%%EOF\n" % xref_offset
+        return bytes(out)
+
+
+invoice_template = InvoiceTemplate()
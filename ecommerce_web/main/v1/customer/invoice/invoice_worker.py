@@ -0,0 +1,178 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import update, or_, and_
+from main.database.models import InvoiceJob
+from main.common.periodic_task import PeriodicTask
+from main.extension import db
+from main.v1.customer.invoice.invoice_generator import (
+    load_invoice_data, cached_invoice, load_checkout_invoice_data, cached_checkout_invoice
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InvoiceWorker:
+    """Renders invoices on a background thread pool, using the invoice_job table as the queue.
+
+    Jobs are rows first and pool tasks second: a job only leaves 'pending' once a worker
+    has rendered it. The first request a process serves re-submits the jobs nobody holds,
+    and a periodic scan re-submits jobs whose claim went stale (the worker holding it died)
+    or that sat untouched for the claim timeout, so nothing stays pending for good.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.executor = None
+        self.recovery = PeriodicTask(
+            "invoice_job_recovery", lambda app: self.resubmit_stale(),
+            interval_key="INVOICE_JOB_RECOVERY_INTERVAL", default_interval=60
+        )
+        self._recovered = False
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.executor = ThreadPoolExecutor(
+            max_workers=app.config.get("INVOICE_WORKER_THREADS", 2),
+            thread_name_prefix="invoice-worker"
+        )
+        self.recovery.init_app(app)
+        app.before_request(self.recover_pending)
+        app.extensions["invoice_worker"] = self
+
+    def enqueue(self, job_id):
+        """Schedule a committed invoice job for rendering."""
+        self.recover_pending()
+        self.executor.submit(self._run, job_id)
+
+    def recover_pending(self):
+        """Re-submit jobs left pending by a previous process (once) and start the periodic stale-job scan."""
+        self.recovery.ensure_started()
+        with self._lock:
+            if self._recovered:
+                return
+            self._recovered = True
+        self.executor.submit(self._recover)
+
+    def _stale_before(self):
+        return datetime.utcnow() - timedelta(seconds=self.app.config.get("INVOICE_JOB_CLAIM_TIMEOUT", 300))
+
+    def recoverable_jobs(self, idle_only=False):
+        """Ids of pending jobs nobody is rendering: unclaimed, or claimed longer ago than the claim timeout.
+
+        With idle_only, unclaimed jobs must also be untouched for the claim timeout, so the
+        periodic scan leaves alone jobs that are simply still waiting in this process's pool.
+        """
+        stale = self._stale_before()
+        unclaimed = InvoiceJob.claimed_at.is_(None)
+        if idle_only:
+            unclaimed = and_(unclaimed, InvoiceJob.updated_at < stale)
+        return [job_id for (job_id,) in db.session.query(InvoiceJob.id)
+                .filter(InvoiceJob.status == "pending", or_(unclaimed, InvoiceJob.claimed_at < stale))
+                .order_by(InvoiceJob.id)]
+
+    def resubmit_stale(self):
+        """Periodic scan: re-submit abandoned jobs. Returns a log message, or None when there were none."""
+        job_ids = self.recoverable_jobs(idle_only=True)
+        for job_id in job_ids:
+            self.executor.submit(self._run, job_id)
+        return f"re-submitted {len(job_ids)} stale invoice job(s)" if job_ids else None
+
+    def _recover(self):
+        with self.app.app_context():
+            try:
+                job_ids = self.recoverable_jobs()
+            except Exception:
+                logger.exception("Could not load pending invoice jobs")
+                return
+            finally:
+                db.session.remove()
+
+        for job_id in job_ids:
+            self.executor.submit(self._run, job_id)
+
+    def _claim(self, job_id):
+        """Mark a pending job as taken. Returns False if another worker already holds it."""
+        now = datetime.utcnow()
+        stale = self._stale_before()
+        result = db.session.execute(
+            update(InvoiceJob)
+            .where(
+                InvoiceJob.id == job_id,
+                InvoiceJob.status == "pending",
+                or_(InvoiceJob.claimed_at.is_(None), InvoiceJob.claimed_at < stale)
+            )
+            .values(claimed_at=now, attempts=InvoiceJob.attempts + 1, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def _release(self, job_id, error):
+        """Hand a crashed job back: retry it, or fail it once it is out of attempts."""
+        try:
+            job = db.session.get(InvoiceJob, job_id)
+            if job is None or job.status != "pending":
+                return
+            job.claimed_at = None
+            job.error = error[:255]
+            if job.attempts >= self.app.config.get("INVOICE_JOB_MAX_ATTEMPTS", 3):
+                job.status = "failed"
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            logger.exception("Could not release invoice job %s", job_id)
+            return  # The periodic scan picks it up once the claim is stale
+
+        if job.status == "pending":
+            self.executor.submit(self._run, job_id)
+
+    def _run(self, job_id):
+        with self.app.app_context():
+            claimed = False
+            try:
+                claimed = self._claim(job_id)
+                if not claimed:
+                    return
+
+                job = db.session.get(InvoiceJob, job_id)
+                if job.checkout_id is not None:
+                    checkout, lines = load_checkout_invoice_data(job.checkout_id)
+                    found = checkout is not None and bool(lines)
+                    result = cached_checkout_invoice(checkout, lines) if found else \
+                        {"status": "error", "message": "Checkout or its products not found.", "file_path": None}
+                else:
+                    order, product = load_invoice_data(job.order_id)
+                    found = order is not None and product is not None
+                    result = cached_invoice(order, product) if found else \
+                        {"status": "error", "message": "Order or product not found.", "file_path": None}
+
+                if result["status"] == "success":
+                    job.status = "ready"
+                    job.file_path = result["file_path"]
+                    job.error = None
+                elif not found or job.attempts >= self.app.config.get("INVOICE_JOB_MAX_ATTEMPTS", 3):
+                    job.status = "failed"
+                    job.error = result["message"][:255]
+                else:
+                    job.claimed_at = None  # Release for another attempt
+                    job.error = result["message"][:255]
+                db.session.commit()
+
+                if job.status == "pending":
+                    self.executor.submit(self._run, job_id)
+
+            except Exception as e:
+                db.session.rollback()
+                logger.exception("Invoice job %s crashed", job_id)
+                if claimed:
+                    self._release(job_id, f"Rendering crashed: {e}")
+            finally:
+                db.session.remove()
+
+
+invoice_worker = InvoiceWorker()
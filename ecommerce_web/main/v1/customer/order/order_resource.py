@@ -1,8 +1,8 @@
 from flask_restful import Resource
 from flask import request
-from main.database.models import Order, Product, db
-from datetime import datetime
-from main.v1.customer.invoice.invoice_generator import generate_invoice
+from main.database.models import InvoiceJob, db
+from main.common.order_service import place_order, OrderPlacementError
+from main.v1.customer.invoice.invoice_worker import invoice_worker
 from main.common.jwt_utils import jwt_required, get_jwt_identity, role_required
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -23,32 +23,15 @@ class PlaceOrderResource(Resource):
         if not product_id:
             return {"status": "error", "message": "Product ID is required."}, 400
 
-        # Check product availability and soft delete
-        product = Product.query.filter_by(id=product_id, is_deleted=False).first()
-        if not product:
-            return {"status": "error", "message": "Product not found or unavailable."}, 404
-
-        if product.quantity <= 0:
-            return {"status": "error", "message": "Product out of stock."}, 400
-
         try:
-            #  Create new order
-            new_order = Order(
-                customer_id=int(identity),
-                product_id=product_id,
-                created_at=datetime.utcnow()
-            )
-
-            #  Decrement product quantity
-            product.quantity -= 1
-
-            #  Commit transaction
-            db.session.add(new_order)
+            #  Atomically decrement stock and create the order with its invoice job
+            new_order = place_order(customer_id=int(identity), product_id=product_id, commit=False)
+            invoice_job = InvoiceJob(order_id=new_order.id)
+            db.session.add(invoice_job)
             db.session.commit()
 
-            #  Generate invoice
-            invoice_result = generate_invoice(new_order.id)
-            invoice_path = invoice_result.get("file_path") if invoice_result.get("status") == "success" else "Invoice generation failed."
+            #  Render the invoice in the background
+            invoice_worker.enqueue(invoice_job.id)
 
             return {
                 "status": "success",
@@ -59,10 +42,14 @@ class PlaceOrderResource(Resource):
                     "product_id": new_order.product_id,
                     "status": new_order.status,
                     "created_at": new_order.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                    "invoice_path": invoice_path
+                    "invoice_job_id": invoice_job.id,
+                    "invoice_status": invoice_job.status
                 }
             }, 201
 
+        except OrderPlacementError as e:
+            return {"status": "error", "message": e.message}, e.code
+
         except SQLAlchemyError as e:
             db.session.rollback()  #  Rollback in case of error
             return {"status": "error", "message": f"An error occurred: {str(e)}"}, 500
@@ -1,8 +1,43 @@
 from flask_restful import Resource
 from flask import request
+from sqlalchemy.exc import IntegrityError
 from main.database.models import Wishlist, Product
 from main.extension import db
 from main.common.jwt_utils import jwt_required, get_jwt_identity, role_required
+from main.common.pagination import parse_limit, decode_cursor, keyset_filter, keyset_page
+from main.common.sql_utils import insert_ignore
+
+MAX_BATCH_SIZE = 500
+
+
+def parse_product_ids(data):
+    """Read a de-duplicated list of product ids from {"product_ids": [...]}. Raises ValueError."""
+    product_ids = data.get("product_ids")
+    if not isinstance(product_ids, list) or not product_ids:
+        raise ValueError("product_ids must be a non-empty list.")
+    if len(product_ids) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} product ids per request.")
+    try:
+        return list(dict.fromkeys(int(product_id) for product_id in product_ids))
+    except (TypeError, ValueError):
+        raise ValueError("product_ids must contain integers only.")
+
+
+def insert_wishlist_items(user_id, product_ids):
+    """Save products to a user's wishlist, skipping ones already there. Returns the ids actually inserted.
+
+    One multi-row INSERT normally does it; if its row count shows a concurrent request saved
+    some of the same products first, the batch is redone row by row to learn which were ours.
+    """
+    result = db.session.execute(insert_ignore(Wishlist.__table__)
+                                .values([{"user_id": user_id, "product_id": product_id} for product_id in product_ids]))
+    if result.rowcount == len(product_ids):
+        return product_ids
+
+    db.session.rollback()
+    stmt = insert_ignore(Wishlist.__table__)
+    return [product_id for product_id in product_ids
+            if db.session.execute(stmt.values(user_id=user_id, product_id=product_id)).rowcount == 1]
 
 
 class WishlistResource(Resource):
@@ -10,20 +45,41 @@ class WishlistResource(Resource):
     @role_required("2")  # Role-based access control for customers
     def get(self):
         user_id = get_jwt_identity()
-        wishlist_items = Wishlist.query.filter_by(user_id=user_id).all()
-
-        if not wishlist_items:
+        try:
+            limit = parse_limit(request.args.get("limit"))
+        except ValueError:
+            return {"status": "error", "message": "Limit must be a positive integer."}, 400
+
+        # One joined query per page, newest additions first; deleted products are left out
+        query = db.session.query(Wishlist.id, Product.id, Product.name, Product.price, Product.description) \
+            .join(Product, Product.id == Wishlist.product_id) \
+            .filter(Wishlist.user_id == user_id, Product.is_deleted == False)  # noqa: E712
+        if request.args.get("after"):
+            try:
+                values = decode_cursor(request.args["after"])
+                if len(values) != 1:
+                    raise ValueError
+                item_id = int(values[0])
+            except (ValueError, TypeError):
+                return {"status": "error", "message": "Invalid cursor."}, 400
+            query = query.filter(keyset_filter([Wishlist.id], [item_id], descending=True))
+
+        rows = query.order_by(Wishlist.id.desc()).limit(limit + 1).all()
+        wishlist_items, next_cursor = keyset_page(rows, limit, key=lambda row: [row[0]])
+
+        if not wishlist_items and not request.args.get("after"):
             return {"status": "error", "message": "No items found in your wishlist."}, 404
 
         return {
             "status": "success",
             "message": "Wishlist fetched successfully",
             "data": [{
-                "product_id": item.product.id,
-                "product_name": item.product.name,
-                "price": item.product.price,
-                "description": item.product.description
-            } for item in wishlist_items]
+                "product_id": product_id,
+                "product_name": name,
+                "price": price,
+                "description": description
+            } for _, product_id, name, price, description in wishlist_items],
+            "next_cursor": next_cursor
         }, 200
 
     @jwt_required
@@ -42,20 +98,18 @@ class WishlistResource(Resource):
             return {"status": "error", "message": "Product ID is required"}, 400
 
         # Check if the product exists
-        product = Product.query.get(product_id)
-        if not product:
+        product = db.session.get(Product, product_id)
+        if not product or product.is_deleted:
             return {"status": "error", "message": "Product not found."}, 404
 
-        # Check if product already in wishlist
-        existing_item = Wishlist.query.filter_by(user_id=user_id, product_id=product_id).first()
-        if existing_item:
+        # Add product to wishlist; the unique index rejects duplicates
+        db.session.add(Wishlist(user_id=user_id, product_id=product.id))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
             return {"status": "error", "message": "Product already exists in your wishlist."}, 400
 
-        # Add product to wishlist
-        new_wishlist_item = Wishlist(user_id=user_id, product_id=product_id)
-        db.session.add(new_wishlist_item)
-        db.session.commit()
-
         return {"status": "success", "message": "Product added to wishlist."}, 201
 
     @jwt_required
@@ -82,3 +136,67 @@ class WishlistResource(Resource):
         db.session.commit()
 
         return {"status": "success", "message": "Product removed from wishlist."}, 200
+
+
+class WishlistBatchResource(Resource):
+    @jwt_required
+    @role_required("2")
+    def post(self):
+        """Add many products to the wishlist in one statement"""
+        user_id = int(get_jwt_identity())
+        try:
+            product_ids = parse_product_ids(request.get_json(silent=True) or {})
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        # Active products among the ids, and whether each is already saved, in one query
+        rows = db.session.query(Product.id, Wishlist.id) \
+            .outerjoin(Wishlist, (Wishlist.product_id == Product.id) & (Wishlist.user_id == user_id)) \
+            .filter(Product.id.in_(product_ids), Product.is_deleted == False).all()  # noqa: E712
+        saved = {product_id for product_id, item_id in rows if item_id is not None}
+        found = {product_id for product_id, _ in rows}
+        to_add = [product_id for product_id in product_ids if product_id in found and product_id not in saved]
+
+        added = []
+        if to_add:
+            # A concurrent add of the same product is skipped by the unique index instead of failing the batch
+            added = insert_wishlist_items(user_id, to_add)
+            db.session.commit()
+        added_set = set(added)
+
+        return {
+            "status": "success",
+            "message": f"{len(added)} product(s) added to wishlist.",
+            "data": {
+                "added": added,
+                "duplicates": [product_id for product_id in product_ids
+                               if product_id in saved or (product_id in to_add and product_id not in added_set)],
+                "missing": [product_id for product_id in product_ids if product_id not in found]
+            }
+        }, 200
+
+    @jwt_required
+    @role_required("2")
+    def delete(self):
+        """Remove many products from the wishlist in one statement"""
+        user_id = int(get_jwt_identity())
+        try:
+            product_ids = parse_product_ids(request.get_json(silent=True) or {})
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        saved = {product_id for (product_id,) in db.session.query(Wishlist.product_id)
+                 .filter(Wishlist.user_id == user_id, Wishlist.product_id.in_(product_ids))}
+        if saved:
+            db.session.execute(db.delete(Wishlist).where(Wishlist.user_id == user_id,
+                                                         Wishlist.product_id.in_(saved)))
+            db.session.commit()
+
+        return {
+            "status": "success",
+            "message": f"{len(saved)} product(s) removed from wishlist.",
+            "data": {
+                "removed": [product_id for product_id in product_ids if product_id in saved],
+                "missing": [product_id for product_id in product_ids if product_id not in saved]
+            }
+        }, 200
@@ -0,0 +1,38 @@
+from flask_restful import Resource
+from flask import request
+from main.common.sales_analytics import sales_report
+from main.common.sales_timeseries import sales_timeseries
+from main.common.jwt_utils import jwt_required, get_jwt_identity, role_required
+
+PROVIDER_SALES_GROUPS = ("day", "product")
+
+
+class ProviderSalesAnalyticsResource(Resource):
+    @jwt_required
+    @role_required("3")
+    def get(self):
+        """The provider's sales per day or product over a date range, read from the daily rollups"""
+        provider_id = get_jwt_identity()
+        group_by = request.args.get("group_by", "day")
+        if group_by not in PROVIDER_SALES_GROUPS:
+            return {"status": "error", "message": f"group_by must be one of: {', '.join(PROVIDER_SALES_GROUPS)}."}, 400
+
+        try:
+            report = sales_report(request.args, group_by, provider_id=provider_id)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        return {"status": "success", "message": "Sales fetched successfully", "data": report}, 200
+
+
+class ProviderSalesTimeseriesResource(Resource):
+    @jwt_required
+    @role_required("3")
+    def get(self):
+        """The provider's sales bucketed by hour, day or week, with moving average and cumulative revenue"""
+        try:
+            series = sales_timeseries(get_jwt_identity(), request.args)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        return {"status": "success", "message": "Sales series fetched successfully", "data": series}, 200
@@ -71,6 +71,10 @@ class ProviderLoginResource(Resource):
         if not user or not user.check_password(data.get("password")) or user.role != "3":
             return {"code": 401, "message": "Invalid credentials", "status": 0}, 401
 
+        # Persist a hash upgraded to the current work factor
+        if db.session.is_modified(user):
+            db.session.commit()
+
         access_token = generate_token(identity=str(user.id), role=user.role, expires_in=3600)
 
         return {
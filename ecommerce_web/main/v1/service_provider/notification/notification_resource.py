@@ -1,7 +1,17 @@
+import json
+import queue
+import time
 from flask_restful import Resource
-from flask import request
+from flask import request, current_app, Response, stream_with_context
 from main.database.models import Notification, db
 from main.common.jwt_utils import jwt_required, get_jwt_identity, role_required
+from main.common.pagination import parse_limit
+from main.common.notification_hub import (
+    notification_hub, notification_data, notifications_since, latest_notifications, POLL_OVERLAP
+)
+
+CATCH_UP_BATCH = 200  # Rows read per query when a stream replays what it missed
+STREAM_RETRY_MS = 3000  # Reconnect delay suggested to EventSource clients
 
 
 def parse_request_data():
@@ -11,26 +21,123 @@ def parse_request_data():
     return {k: v.strip() if isinstance(v, str) else v for k, v in request.form.items()}
 
 
+def parse_since_id(value):
+    """Parse a since_id cursor (0 when absent). Raises ValueError."""
+    since_id = int(str(value).strip()) if value not in (None, "") else 0
+    if since_id < 0:
+        raise ValueError
+    return since_id
+
+
 class ProviderViewNotificationsResource(Resource):
     @jwt_required
     @role_required("3")
     def get(self):
+        """The provider's newest notifications, or with since_id the ones after it, oldest first.
+
+        Both return next_since_id, the cursor to poll with for what comes next.
+        """
         provider_id = get_jwt_identity()
-        notifications = Notification.query.filter_by(provider_id=provider_id).all()
+        try:
+            since_id = parse_since_id(request.args.get("since_id"))
+            limit = parse_limit(request.args.get("limit"))
+        except ValueError:
+            return {"status": "error", "message": "since_id and limit must be non-negative integers."}, 400
 
-        if not notifications:
-            return {"status": "error", "message": "No notifications found."}, 404
+        if request.args.get("since_id") in (None, ""):
+            notifications = latest_notifications(provider_id, limit)
+            if not notifications:
+                return {"status": "error", "message": "No notifications found."}, 404
+        else:
+            notifications = notifications_since(provider_id, since_id, limit)
 
         return {
             "status": "success",
-            "notifications": [{
-                "id": notification.id,
-                "message": notification.message,
-                "created_at": notification.created_at.strftime("%Y-%m-%d %H:%M:%S")
-            } for notification in notifications]
+            "notifications": [notification_data(notification) for notification in notifications],
+            "next_since_id": notifications[-1].id if notifications else since_id
         }, 200
 
 
+def sse_event(cursor, item):
+    return f"id: {cursor}\nevent: notification\ndata: {json.dumps(item, separators=(',', ':'))}\n\n"
+
+
+class ProviderNotificationStreamResource(Resource):
+    @jwt_required
+    @role_required("3")
+    def get(self):
+        """Push the provider's new notifications as Server-Sent Events.
+
+        With since_id (or the Last-Event-ID header an EventSource sends on reconnect) the
+        stream first replays what was missed from the database, then forwards rows from the
+        in-process hub. Streams close after NOTIFICATION_STREAM_MAX_SECONDS so workers are
+        recycled; clients reconnect with the last event id and lose nothing.
+        """
+        provider_id = int(get_jwt_identity())
+        cursor_arg = request.args.get("since_id", request.headers.get("Last-Event-ID"))
+        try:
+            since_id = parse_since_id(cursor_arg)
+        except ValueError:
+            return {"status": "error", "message": "since_id must be a non-negative integer."}, 400
+
+        config = current_app.config
+        max_seconds = config.get("NOTIFICATION_STREAM_MAX_SECONDS", 300)
+        heartbeat = config.get("NOTIFICATION_STREAM_HEARTBEAT", 15)
+        subscription = notification_hub.subscribe(provider_id)  # Before the replay, so nothing falls in between
+
+        def events():
+            cursor = since_id
+            sent = set()  # Ids sent within the hub's overlap window, to drop replay/hub duplicates
+
+            def send(item):
+                nonlocal cursor, sent
+                if item["id"] in sent:
+                    return None
+                sent.add(item["id"])
+                cursor = max(cursor, item["id"])
+                sent = {notification_id for notification_id in sent if notification_id > cursor - POLL_OVERLAP}
+                return sse_event(cursor, item)
+
+            def replay():
+                while True:
+                    items = [notification_data(n) for n in notifications_since(provider_id, cursor, CATCH_UP_BATCH)]
+                    db.session.remove()  # Hand the connection back before streaming
+                    for item in items:
+                        event = send(item)
+                        if event:
+                            yield event
+                    if len(items) < CATCH_UP_BATCH:
+                        return
+
+            try:
+                yield f"retry: {STREAM_RETRY_MS}\n\n"
+                if cursor_arg not in (None, ""):
+                    yield from replay()
+                else:
+                    db.session.remove()
+
+                deadline = time.monotonic() + max_seconds
+                while time.monotonic() < deadline:
+                    if subscription.lagging:  # Fell behind the hub: drop the queue and re-read by cursor
+                        subscription.lagging = False
+                        while not subscription.queue.empty():
+                            subscription.queue.get_nowait()
+                        yield from replay()
+                    try:
+                        item = subscription.queue.get(timeout=min(heartbeat, max(deadline - time.monotonic(), 0)))
+                    except queue.Empty:
+                        yield ": keep-alive\n\n"
+                        continue
+                    event = send(item)
+                    if event:
+                        yield event
+            finally:
+                notification_hub.unsubscribe(subscription)
+
+        return Response(stream_with_context(events()), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
 class ProviderCreateNotificationResource(Resource):
     @jwt_required
     @role_required("3")
@@ -2,7 +2,11 @@ from flask_restful import Resource
 from flask import request
 from main.database.models import Order, Product, db
 from datetime import datetime
+from main.v1.customer.invoice.invoice_generator import discard_cached_invoices
 from main.common.jwt_utils import jwt_required, get_jwt_identity, role_required
+from main.common.pagination import parse_limit, created_at_keyset_filter, keyset_page
+from main.common.order_service import order_filters
+from main.common.order_counters import provider_order_totals
 
 
 def parse_request_data():
@@ -16,10 +20,36 @@ class ProviderViewOrdersResource(Resource):
     @jwt_required
     @role_required("3")
     def get(self):
+        """Orders for the provider's products one keyset page at a time, newest first.
+
+        Filters: status, product_id, date_from, date_to. Totals come from the maintained
+        per-provider counters, not a COUNT(*) over the orders.
+        """
         provider_id = get_jwt_identity()
-        orders = Order.query.join(Product).filter(Product.provider_id == provider_id).all()
+        args = request.args
+
+        try:
+            limit = parse_limit(args.get("limit"))
+        except ValueError:
+            return {"status": "error", "message": "Limit must be a positive integer."}, 400
 
-        if not orders:
+        try:
+            query = Order.query.join(Product, Product.id == Order.product_id) \
+                .filter(Product.provider_id == provider_id, *order_filters(args))
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
+
+        if args.get("after"):
+            try:
+                query = query.filter(created_at_keyset_filter(Order, args["after"]))
+            except ValueError:
+                return {"status": "error", "message": "Invalid cursor."}, 400
+
+        rows = query.order_by(Order.created_at.desc(), Order.id.desc()).limit(limit + 1).all()
+        orders, next_cursor = keyset_page(rows, limit, key=lambda order: (order.created_at, order.id))
+
+        totals = provider_order_totals(provider_id)
+        if not orders and not args.get("after") and not totals["all"]:
             return {"status": "error", "message": "No orders found for your products."}, 404
 
         return {
@@ -28,9 +58,12 @@ class ProviderViewOrdersResource(Resource):
                 "id": order.id,
                 "customer_id": order.customer_id,
                 "product_id": order.product_id,
+                "quantity": order.quantity,
                 "status": order.status,
                 "created_at": order.created_at.strftime('%Y-%m-%d %H:%M:%S') if order.created_at else "Not Available"
-            } for order in orders]
+            } for order in orders],
+            "next_cursor": next_cursor,
+            "totals": totals
         }, 200
 
 
@@ -65,12 +98,17 @@ class ProviderUpdateOrderStatusResource(Resource):
             }, 400
 
         # Update status and timestamp
+        status_changed = order.status != status_value
         order.status = status_value
         if not order.created_at:
             order.created_at = datetime.utcnow()
 
         db.session.commit()
 
+        # The cached invoice prints the status, so drop it only when the status really changed
+        if status_changed:
+            discard_cached_invoices(order.customer_id, order.id)
+
         return {
             "status": "success",
             "message": "Order status updated successfully",
@@ -2,6 +2,18 @@ from flask_restful import Resource
 from flask import request
 from main.database.models import Product, db
 from main.common.jwt_utils import jwt_required, get_jwt_identity, role_required
+from main.common.stream_parsers import iter_csv_rows, iter_json_array
+from main.common.model_events import publish_product_changes, ProductChange
+from main.common.reservation_service import reserved_units
+from main.common.stock_shards import stock_levels, clear_shards, total_stock, take_across_shards
+from sqlalchemy import insert, update, func
+from sqlalchemy.exc import SQLAlchemyError
+import time
+
+IMPORT_BATCH_SIZE = 1000  # Rows per executemany INSERT and commit
+BULK_UPDATE_ID_CHUNK = 5000  # Product IDs per UPDATE ... WHERE id IN (...) statement
+BULK_OPERATIONS = ("set_price", "price_percent", "stock_delta")
+MAX_REPORTED_ERRORS = 1000
 
 
 def parse_request_data():
@@ -11,6 +23,36 @@ def parse_request_data():
     return {k: v.strip() if isinstance(v, str) else v for k, v in request.form.items()}
 
 
+def clean_product_fields(data):
+    """Validate and normalize new-product fields. Raises ValueError with a client-facing message."""
+    # Validate essential fields
+    if not data.get("name") or data.get("price") is None or data.get("quantity") is None:
+        raise ValueError("Product name, price, and quantity are required")
+
+    # Validate quantity
+    try:
+        quantity = int(str(data["quantity"]).strip())  # Strip whitespace before conversion
+        if quantity < 0:
+            raise ValueError
+    except (ValueError, TypeError):
+        raise ValueError("Quantity must be a non-negative integer")
+
+    # Validate price
+    try:
+        price = float(str(data["price"]).strip())  # Strip whitespace before conversion
+        if price < 0:
+            raise ValueError
+    except (ValueError, TypeError):
+        raise ValueError("Price must be a non-negative number")
+
+    return {
+        "name": data["name"],
+        "description": data.get("description"),
+        "price": price,
+        "quantity": quantity
+    }
+
+
 class ProviderAddProductResource(Resource):
     @jwt_required
     @role_required("3")
@@ -18,25 +60,10 @@ class ProviderAddProductResource(Resource):
         provider_id = get_jwt_identity()
         data = parse_request_data()  # Safe parsing with whitespace handling
 
-        # Validate essential fields
-        if not data.get("name") or data.get("price") is None or data.get("quantity") is None:
-            return {"status": "error", "message": "Product name, price, and quantity are required"}, 400
-
-        # Validate quantity
         try:
-            data["quantity"] = int(str(data["quantity"]).strip())  # Strip whitespace before conversion
-            if data["quantity"] < 0:
-                raise ValueError
-        except (ValueError, TypeError):
-            return {"status": "error", "message": "Quantity must be a non-negative integer"}, 400
-
-        # Validate price
-        try:
-            data["price"] = float(str(data["price"]).strip())  # Strip whitespace before conversion
-            if data["price"] < 0:
-                raise ValueError
-        except (ValueError, TypeError):
-            return {"status": "error", "message": "Price must be a non-negative number"}, 400
+            data = clean_product_fields(data)
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
 
         # Create product
         new_product = Product(
@@ -63,6 +90,220 @@ class ProviderAddProductResource(Resource):
         }, 201
 
 
+class ProviderBulkImportProductsResource(Resource):
+    @jwt_required
+    @role_required("3")
+    def post(self):
+        """Import products from a streamed CSV file or JSON array, validating each row like the single add"""
+        provider_id = get_jwt_identity()
+        content_type = request.content_type or ""
+
+        if "application/json" in content_type:
+            rows = iter_json_array(request.stream)
+        elif "text/csv" in content_type:
+            rows = iter_csv_rows(request.stream)
+        else:
+            return {"status": "error", "message": "Content-Type must be application/json or text/csv"}, 415
+
+        started = time.perf_counter()
+        # New rows are read back per batch: with RETURNING where the dialect has it (not MySQL),
+        # otherwise as the provider's rows past the last id this import has seen
+        returning = db.engine.dialect.insert_executemany_returning
+        last_seen_id = None if returning else \
+            db.session.query(func.max(Product.id)).filter(Product.provider_id == provider_id).scalar() or 0
+        inserted = 0
+        total = 0
+        errors = []
+        batch = []  # (row number, values)
+
+        def report(row_number, message):
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({"row": row_number, "message": message})
+
+        def flush():
+            nonlocal inserted, last_seen_id
+            try:
+                stmt = insert(Product)
+                if returning:
+                    stmt = stmt.returning(Product.id, Product.name, Product.description)
+                result = db.session.execute(stmt, [values for _, values in batch])
+                new_rows = result.all() if returning else None
+                db.session.commit()
+                inserted += len(batch)
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                message = f"Batch insert failed: {str(e.__cause__ or e).splitlines()[0]}"
+                for row_number, _ in batch:
+                    report(row_number, message)
+                batch.clear()
+                return
+            batch.clear()
+
+            if new_rows is None:
+                new_rows = db.session.query(Product.id, Product.name, Product.description) \
+                    .filter(Product.provider_id == provider_id, Product.id > last_seen_id).order_by(Product.id).all()
+                if new_rows:
+                    last_seen_id = new_rows[-1].id
+            # Core inserts bypass ORM events, so announce each committed batch to search and autocomplete
+            publish_product_changes([ProductChange(product_id, name, description, False)
+                                     for product_id, name, description in new_rows])
+
+        try:
+            for total, row in enumerate(rows, start=1):
+                if not isinstance(row, dict):
+                    report(total, "Row must be an object")
+                    continue
+                try:
+                    values = clean_product_fields(row)
+                except ValueError as e:
+                    report(total, str(e))
+                    continue
+                values["provider_id"] = provider_id
+                batch.append((total, values))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    flush()
+        except (ValueError, UnicodeDecodeError) as e:
+            report(total + 1, f"Could not parse upload: {str(e)}")
+        if batch:
+            flush()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "status": "success" if inserted else "error",
+            "message": f"Imported {inserted} of {total} products",
+            "data": {
+                "received": total,
+                "inserted": inserted,
+                "failed": total - inserted,
+                "errors": errors,
+                "errors_truncated": total - inserted > len(errors),
+                "elapsed_seconds": round(elapsed, 3),
+                "rows_per_second": round(total / elapsed, 1) if elapsed else None
+            }
+        }, 200 if inserted else 400
+
+
+def bulk_product_filters(criteria):
+    """Build filter conditions from a bulk-update filter object. Raises ValueError on bad input.
+
+    Quantity bounds apply to total stock, so sharded products are matched on their shard sums.
+    """
+    if not isinstance(criteria, dict):
+        raise ValueError("Filter must be an object")
+
+    bounds = {
+        "min_price": lambda v: Product.price >= float(v),
+        "max_price": lambda v: Product.price <= float(v),
+        "min_quantity": lambda v: total_stock() >= int(v),
+        "max_quantity": lambda v: total_stock() <= int(v)
+    }
+    unknown = set(criteria) - set(bounds)
+    if unknown:
+        raise ValueError(f"Unsupported filter fields: {', '.join(sorted(unknown))}")
+    try:
+        return [bounds[key](value) for key, value in criteria.items() if value is not None]
+    except (ValueError, TypeError):
+        raise ValueError("Filter values must be numbers")
+
+
+class ProviderBulkUpdateProductsResource(Resource):
+    @jwt_required
+    @role_required("3")
+    def put(self):
+        """Reprice or restock many of the provider's products with set-based UPDATE statements"""
+        provider_id = get_jwt_identity()
+        data = request.get_json(silent=True) or {}
+
+        operation = data.get("operation")
+        if operation not in BULK_OPERATIONS:
+            return {"status": "error", "message": f"Operation must be one of: {', '.join(BULK_OPERATIONS)}"}, 400
+
+        # Validate the operation value with the same rules as the single update
+        try:
+            if operation == "stock_delta":
+                value = int(str(data.get("value")).strip())
+            else:
+                value = float(str(data.get("value")).strip())
+        except (ValueError, TypeError):
+            return {"status": "error", "message": "Value must be a number"}, 400
+        if operation == "set_price" and value < 0:
+            return {"status": "error", "message": "Price must be a non-negative number"}, 400
+        if operation == "price_percent" and value < -100:
+            return {"status": "error", "message": "Percentage change cannot be below -100"}, 400
+
+        # Target either an explicit ID list or a filter, always scoped to the provider's live products
+        product_ids = data.get("product_ids")
+        if (product_ids is None) == (data.get("filter") is None):
+            return {"status": "error", "message": "Provide exactly one of product_ids or filter"}, 400
+        conditions = [Product.provider_id == provider_id, Product.is_deleted == False]  # noqa: E712
+        if product_ids is None:
+            try:
+                conditions += bulk_product_filters(data["filter"])
+            except ValueError as e:
+                return {"status": "error", "message": str(e)}, 400
+        else:
+            try:
+                if not isinstance(product_ids, list):
+                    raise TypeError
+                product_ids = sorted({int(pid) for pid in product_ids})
+            except (ValueError, TypeError):
+                return {"status": "error", "message": "product_ids must be a list of integers"}, 400
+
+        sharded_ids = []
+        if operation == "set_price":
+            values = {"price": value}
+        elif operation == "price_percent":
+            values = {"price": func.round(Product.price * (1 + value / 100.0), 2)}
+        else:
+            values = {"quantity": Product.quantity + value}
+            if value < 0:
+                # Sharded products hold their stock on shard rows, so they are taken one by one below
+                sharded_ids = [pid for (pid,) in db.session.query(Product.id)
+                               .filter(*conditions, Product.stock_shards > 0).order_by(Product.id)]
+                if product_ids is not None:
+                    wanted = set(product_ids)
+                    sharded_ids = [pid for pid in sharded_ids if pid in wanted]
+                conditions += [Product.stock_shards == 0, Product.quantity + value >= 0]  # Never drive stock negative
+
+        def run_update(extra_conditions):
+            result = db.session.execute(
+                update(Product).where(*conditions, *extra_conditions).values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount
+
+        started = time.perf_counter()
+        try:
+            if product_ids is None:
+                affected = run_update([])
+            else:
+                affected = sum(
+                    run_update([Product.id.in_(product_ids[i:i + BULK_UPDATE_ID_CHUNK])])
+                    for i in range(0, len(product_ids), BULK_UPDATE_ID_CHUNK)
+                )
+            affected += sum(1 for pid in sharded_ids if take_across_shards(pid, -value))
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            return {"status": "error", "message": f"Bulk update failed: {str(e)}"}, 500
+
+        response = {
+            "operation": operation,
+            "value": value,
+            "affected": affected,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
+        if product_ids is not None:
+            response["requested"] = len(product_ids)
+            response["not_updated"] = len(product_ids) - affected
+
+        return {
+            "status": "success",
+            "message": f"{affected} products updated",
+            "data": response
+        }, 200
+
+
 class ProviderViewProductsResource(Resource):
     @jwt_required
     @role_required("3")
@@ -73,6 +314,11 @@ class ProviderViewProductsResource(Resource):
         if not products:
             return {"status": "error", "message": "No products found."}, 404
 
+        # quantity is sellable stock (shards included); units held by open reservations come from one grouped index read
+        product_ids = [product.id for product in products]
+        levels = stock_levels([product.id for product in products if product.stock_shards])
+        reserved = reserved_units(product_ids)
+
         return {
             "status": "success",
             "products": [{
@@ -80,7 +326,8 @@ class ProviderViewProductsResource(Resource):
                 "name": product.name,
                 "description": product.description,
                 "price": product.price,
-                "quantity": product.quantity
+                "quantity": levels.get(product.id, product.quantity),
+                "reserved": int(reserved.get(product.id, 0))
             } for product in products]
         }, 200
 
@@ -118,6 +365,8 @@ class ProviderUpdateProductResource(Resource):
                     raise ValueError
             except (ValueError, TypeError):
                 return {"status": "error", "message": "Quantity must be a non-negative integer"}, 400
+            if product.stock_shards:
+                clear_shards(product.id)  # The new total lands on the base row; the rebalancer spreads it again
 
         db.session.commit()
 
@@ -0,0 +1,48 @@
+import os
+import tempfile
+
+import pytest
+
+# Config reads the environment at import time, so point it at a scratch database first.
+# Set TEST_DATABASE_URI to run the suite against MySQL instead of a temporary SQLite file.
+_db_file = os.path.join(tempfile.mkdtemp(prefix="ecommerce-tests-"), "test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["SQLALCHEMY_DATABASE_URI"] = os.environ.get("TEST_DATABASE_URI", f"sqlite:///{_db_file}")
+
+from main import create_app  # noqa: E402
+from main.extension import db  # noqa: E402
+from main.database.models import User  # noqa: E402
+from main.common.jwt_utils import generate_token  # noqa: E402
+from main.common.notification_writer import notification_writer  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    with app.app_context():
+        db.create_all()
+        yield app
+        notification_writer.flush()  # Queued order events must not be written after the tables are gone
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    def make(username, role):
+        user = User(full_name=username, username=username, email=f"{username}@example.com", role=role)
+        user.password_hash = "unused"
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make
+
+
+def auth_header(user):
+    return {"Authorization": "Bearer " + generate_token(str(user.id), user.role)}
@@ -0,0 +1,34 @@
+from main.extension import db
+from main.database.models import Product
+from main.common.order_service import place_order, place_checkout
+from main.v1.customer.invoice.invoice_generator import (
+    load_invoice_data, invoice_fingerprint, render_invoice_bytes,
+    load_checkout_invoice_data, checkout_fingerprint, render_checkout_invoice_bytes
+)
+
+
+def test_repricing_a_product_leaves_invoices_unchanged(app, make_user):
+    customer = make_user("customer", "2")
+    provider = make_user("provider", "3")
+    shoe = Product(name="Shoe", price=20, quantity=10, provider_id=provider.id)
+    sock = Product(name="Sock", price=5, quantity=10, provider_id=provider.id)
+    db.session.add_all([shoe, sock])
+    db.session.commit()
+
+    order_id = place_order(customer.id, shoe.id).id
+    checkout_id = place_checkout(customer.id, [(shoe.id, 1), (sock.id, 2)]).id
+
+    def snapshot():
+        db.session.expire_all()
+        order, product = load_invoice_data(order_id)
+        checkout, lines = load_checkout_invoice_data(checkout_id)
+        return (invoice_fingerprint(order, product), render_invoice_bytes(order, product),
+                checkout_fingerprint(checkout, lines), render_checkout_invoice_bytes(checkout, lines))
+
+    before = snapshot()
+    assert b"Total: $30.00" in before[3]
+
+    shoe.price, sock.price = 99, 1
+    db.session.commit()
+
+    assert snapshot() == before
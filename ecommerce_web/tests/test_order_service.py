@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from main.extension import db
+from main.database.models import Order, Product
+from main.common.order_service import place_order, OrderPlacementError
+
+INITIAL_STOCK = 200
+ATTEMPTS = 400  # Twice the stock, so half the orders must be refused
+THREADS = 16
+MIN_ORDERS_PER_SECOND = 20  # Conservative floor; a single SQLite file serializes every writer
+
+
+def test_concurrent_orders_never_oversell(app, make_user):
+    customer = make_user("customer", "2")
+    provider = make_user("provider", "3")
+    product = Product(name="Hot item", price=10, quantity=INITIAL_STOCK, provider_id=provider.id)
+    db.session.add(product)
+    db.session.commit()
+    customer_id, product_id = customer.id, product.id
+
+    outcomes = []
+    lock = threading.Lock()
+
+    def worker(count):
+        for _ in range(count):
+            with app.app_context():
+                try:
+                    place_order(customer_id, product_id)
+                    outcome = "placed"
+                except OrderPlacementError as e:
+                    outcome = "sold out" if e.code == 400 else e.message
+                except Exception as e:  # e.g. a lock timeout; kept so the assertion shows it
+                    db.session.rollback()
+                    outcome = repr(e)
+                finally:
+                    db.session.remove()
+                with lock:
+                    outcomes.append(outcome)
+
+    threads = [threading.Thread(target=worker, args=(ATTEMPTS // THREADS,)) for _ in range(THREADS)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    db.session.expire_all()
+    assert [outcome for outcome in outcomes if outcome not in ("placed", "sold out")] == []
+    assert outcomes.count("placed") == INITIAL_STOCK
+    assert outcomes.count("sold out") == ATTEMPTS - INITIAL_STOCK
+    assert Order.query.filter_by(product_id=product_id).count() == INITIAL_STOCK
+    assert db.session.get(Product, product_id).quantity == 0
+    assert ATTEMPTS / elapsed >= MIN_ORDERS_PER_SECOND
+
+
+def test_place_order_reports_missing_product(app, make_user):
+    customer = make_user("customer", "2")
+    with pytest.raises(OrderPlacementError) as excinfo:
+        place_order(customer.id, 12345)
+    assert excinfo.value.code == 404
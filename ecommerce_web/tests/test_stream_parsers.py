@@ -0,0 +1,43 @@
+import io
+import json
+
+import pytest
+
+from main.common import stream_parsers
+from main.common.stream_parsers import iter_json_array
+
+
+def parse(body):
+    return list(iter_json_array(io.BytesIO(body.encode("utf-8"))))
+
+
+@pytest.mark.parametrize("body, expected", [
+    ("[]", []),
+    (" [ ] ", []),
+    ('[{"a": 1}]', [{"a": 1}]),
+    ('[ {"a": 1} ,\n {"a": 2} ]', [{"a": 1}, {"a": 2}]),
+    ("[1, 2.5, -3]", [1, 2.5, -3]),
+])
+def test_parses_json_arrays(body, expected):
+    assert parse(body) == expected
+
+
+@pytest.mark.parametrize("body", [
+    '{"a": 1}',
+    '[{"a": 1},,{"a": 2}]',
+    '[{"a": 1} {"a": 2}]',
+    '[{"a": 1},]',
+    '[,{"a": 1}]',
+    '[{"a": 1}',
+    '[{"a": 1},',
+])
+def test_rejects_malformed_arrays(body):
+    with pytest.raises(ValueError):
+        parse(body)
+
+
+def test_elements_split_across_chunks(monkeypatch):
+    monkeypatch.setattr(stream_parsers, "READ_CHUNK_SIZE", 7)
+    rows = [{"name": f"product {i}", "price": i * 1.5, "quantity": 12345} for i in range(50)]
+    assert parse(json.dumps(rows)) == rows
+    assert parse("[" + ", ".join(str(n) for n in range(1000, 1100)) + "]") == list(range(1000, 1100))
@@ -0,0 +1,81 @@
+import threading
+
+from sqlalchemy import event
+
+from main.extension import db
+from main.database.models import Product, Wishlist
+from main.v1.customer.wishlist.wishlist import insert_wishlist_items
+from tests.conftest import auth_header
+
+
+def fill_wishlist(user, provider, size, deleted=()):
+    """Wishlist `size` new products for a user; positions listed in `deleted` are soft-deleted."""
+    products = [Product(name=f"{user.username} item {i}", price=i + 1, quantity=1, provider_id=provider.id,
+                        is_deleted=i in deleted) for i in range(size)]
+    db.session.add_all(products)
+    db.session.flush()
+    db.session.add_all([Wishlist(user_id=user.id, product_id=product.id) for product in products])
+    db.session.commit()
+    return products
+
+
+def count_statements(client, url, headers):
+    """GET url and count the SQL statements it ran (the test client serves it on this thread)."""
+    statements = []
+    request_thread = threading.get_ident()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == request_thread:  # Skip background workers sharing the engine
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", count)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", count)
+    return response, len(statements)
+
+
+def test_wishlist_query_count_does_not_grow_with_size(app, client, make_user):
+    provider = make_user("provider", "3")
+    small, large = make_user("small", "2"), make_user("large", "2")
+    fill_wishlist(small, provider, 5)
+    fill_wishlist(large, provider, 100)
+
+    counts = {}
+    for user, size in ((small, 5), (large, 100)):
+        headers = auth_header(user)
+        client.get("/api/v1/customer/wishlist?limit=100", headers=headers)  # Warm the token cache
+        response, counts[size] = count_statements(client, "/api/v1/customer/wishlist?limit=100", headers)
+        assert response.status_code == 200
+        assert len(response.get_json()["data"]) == size
+
+    assert counts[5] == counts[100]
+
+
+def test_wishlist_leaves_out_deleted_products(app, client, make_user):
+    provider = make_user("provider", "3")
+    customer = make_user("customer", "2")
+    products = fill_wishlist(customer, provider, 6, deleted={1, 4})
+
+    response = client.get("/api/v1/customer/wishlist", headers=auth_header(customer))
+
+    listed = [item["product_id"] for item in response.get_json()["data"]]
+    assert sorted(listed) == sorted(product.id for product in products if not product.is_deleted)
+
+
+def test_batch_insert_reports_only_rows_it_inserted(app, make_user):
+    provider = make_user("provider", "3")
+    customer = make_user("customer", "2")
+    products = fill_wishlist(customer, provider, 1)
+    extra = [Product(name=f"extra {i}", price=1, quantity=1, provider_id=provider.id) for i in range(3)]
+    db.session.add_all(extra)
+    db.session.commit()
+    ids = [extra[0].id, products[0].id, extra[1].id, extra[2].id]  # products[0] was saved "concurrently"
+
+    added = insert_wishlist_items(customer.id, ids)
+    db.session.commit()
+
+    assert added == [extra[0].id, extra[1].id, extra[2].id]
+    assert Wishlist.query.filter_by(user_id=customer.id).count() == 4
+    assert insert_wishlist_items(customer.id, [extra[0].id]) == []